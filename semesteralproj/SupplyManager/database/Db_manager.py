@@ -1,228 +1,705 @@
 import mysql.connector
+from mysql.connector import pooling
 import sys
 import time
 import hashlib
+import threading
+from contextlib import contextmanager
+from itertools import islice
+
+from .backends import DB_ERRORS, get_backend
+from .columnar_export import ColumnarExporter
+from .export import EXPORTS, write_csv
+from .ledger import Ledger, make_entry
+from .migrations import migrate
+from .month_window import month_start, month_window, shift_month
+from .query_stats import QueryStats
+from .query_cache import QueryCache, is_cacheable, tables_in
+from .stock_history import StockHistory
 
 
 class DatabaseManager:
     def __init__(self, config):
         self.config = config
+        self.backend = get_backend(config)  # config["backend"]: "mysql" (default) or "sqlite"
         self.conn = None
         self.cursor = None
+        self.pool = None
         self.connected = False
+        self._lock = threading.RLock()
+        self._local = threading.local()  # per-thread transaction state
+        self.query_stats = QueryStats(slow_query_ms=config.get("slow_query_ms"))
+        cache_size = int(config.get("query_cache_size") or 0)
+        self.query_cache = QueryCache(
+            cache_size,
+            ttl=float(config.get("query_cache_ttl") or 5.0),
+            tables=config.get("query_cache_tables"),
+        ) if cache_size > 0 else None
+        self.ledger = Ledger(
+            self,
+            flush_rows=int(config.get("ledger_flush_rows") or 100),
+            flush_ms=float(config.get("ledger_flush_ms") or 500),
+        )
+        self.history = StockHistory(self)
         self.connect()
 
     # -----------------------------------------------------
-    # CONNECT TO MYSQL
+    # CONNECT
     # -----------------------------------------------------
     def connect(self):
+        """
+        Open the shared connection, or a connection pool when
+        config["pool_size"] > 0 and the backend supports pooling.
+        """
+        pool_size = int(self.config.get("pool_size") or 0)
         try:
-            print("Trying to connect to MySQL...")
-            self.conn = mysql.connector.connect(
-                host=self.config.get("host", "localhost"),
-                user=self.config.get("user", "root"),
-                password=self.config.get("password", ""),
-                database=self.config.get("database"),
-                autocommit=True,
-                connection_timeout=5
-            )
-            self.cursor = self.conn.cursor(dictionary=True)
+            print(f"Trying to connect to {self.backend.label}...")
+            self.pool = self.backend.create_pool(pool_size) if pool_size > 0 else None
+            if self.pool is not None:
+                self.conn = None
+                self.cursor = None
+            else:
+                self.conn = self.backend.connect()
+                self.cursor = self.conn.cursor(dictionary=True, buffered=True)
             self.connected = True
             print("[OK] Database connected successfully.")
-        except mysql.connector.Error as err:
+        except DB_ERRORS as err:
             self.conn = None
             self.cursor = None
+            self.pool = None
             self.connected = False
-            print(f"[ERROR] MySQL connection error: {err}")
+            print(f"[ERROR] {self.backend.label} connection error: {err}")
         except Exception as e:
             self.conn = None
             self.cursor = None
+            self.pool = None
             self.connected = False
             print(f"[ERROR] Unexpected database error: {e}")
 
     def ensure_connection(self):
         """Reconnect if connection is lost."""
-        if self.conn is None or not self.connected:
+        if not self.connected or (self.pool is None and self.conn is None):
             print("[WARNING] Lost database connection. Reconnecting...")
             self.connect()
 
+    # -----------------------------------------------------
+    # CONNECTION CHECKOUT
+    # -----------------------------------------------------
+    def _borrow(self):
+        """Take a connection from the pool, waiting up to pool_timeout seconds."""
+        deadline = time.monotonic() + float(self.config.get("pool_timeout", 5))
+        while True:
+            try:
+                return self.pool.get_connection()
+            except mysql.connector.errors.PoolError:
+                if time.monotonic() >= deadline:
+                    raise
+                time.sleep(0.01)
+
+    def _in_transaction(self):
+        return getattr(self._local, "conn", None) is not None
+
+    def _raises(self, raise_errors):
+        """Whether a failed read raises: the call's flag, else the thread's raising_errors() mode."""
+        if raise_errors is None:
+            raise_errors = getattr(self._local, "raise_errors", False)
+        return raise_errors or self._in_transaction()
+
+    @contextmanager
+    def raising_errors(self):
+        """
+        Make every fetch this thread runs inside the block raise on failure
+        instead of returning []/None, without opening a transaction:
+
+            with db.raising_errors():
+                rows = supply.get_inventory_at("2025-01")
+        """
+        previous = getattr(self._local, "raise_errors", False)
+        self._local.raise_errors = True
+        try:
+            yield self
+        finally:
+            self._local.raise_errors = previous
+
+    @contextmanager
+    def _checkout(self):
+        """
+        Yield (connection, cursor) for one statement.
+        Inside transaction() the thread's pinned connection is reused.
+        Pooled mode borrows a connection per call and hands it back afterwards,
+        single-connection mode serializes callers on the shared cursor.
+        """
+        if self._in_transaction():
+            yield self._local.conn, self._local.cursor
+            return
+
+        if self.pool is None:
+            with self._lock:
+                yield self.conn, self.cursor
+            return
+
+        conn = self._borrow()
+        cursor = conn.cursor(dictionary=True, buffered=True)
+        try:
+            yield conn, cursor
+        finally:
+            try:
+                cursor.close()
+            finally:
+                conn.close()  # returns the connection to the pool
+
+    @contextmanager
+    def _stream_checkout(self):
+        """
+        Yield a connection reserved for one streamed result set.
+        An unbuffered MySQL result blocks its connection until fully read,
+        so it never runs on the shared MySQL connection.
+        """
+        if self.pool is not None:
+            conn, close_when_done = self._borrow(), True
+        else:
+            conn, close_when_done = self.backend.stream_connection(self.conn)
+        try:
+            yield conn
+        finally:
+            if close_when_done:
+                conn.close()
+
+    # -----------------------------------------------------
+    # TRANSACTIONS
+    # -----------------------------------------------------
+    @contextmanager
+    def transaction(self):
+        """
+        Group several writes into one commit:
+
+            with db.transaction():
+                db.execute_query(...)
+                db.execute_query(...)
+
+        Every query the thread runs inside the block uses the same connection
+        with autocommit off. The block commits once at the end; any error rolls
+        it back and is re-raised. Nested blocks join the outer one.
+        """
+        if self._in_transaction():
+            yield self
+            return
+
+        self.ensure_connection()
+        if self.pool is None:
+            self._lock.acquire()
+            conn, cursor = self.conn, self.cursor
+        else:
+            conn = self._borrow()
+            cursor = conn.cursor(dictionary=True, buffered=True)
+
+        self._local.conn, self._local.cursor = conn, cursor
+        self._local.written = set()
+        try:
+            conn.start_transaction()
+            yield self
+            conn.commit()
+        except BaseException:
+            try:
+                conn.rollback()
+            except DB_ERRORS:
+                pass
+            raise
+        finally:
+            self._local.conn = self._local.cursor = None
+            # Other threads may have cached pre-commit rows meanwhile
+            self._invalidate_tables(self._local.written)
+            if self.pool is None:
+                self._lock.release()
+            else:
+                try:
+                    cursor.close()
+                finally:
+                    conn.close()
+
     # -----------------------------------------------------
     # CREATE TABLES
     # -----------------------------------------------------
     def create_tables(self):
+        """
+        Create or upgrade every table through the versioned migrations
+        in database/migrations.py. Nothing is re-run when the schema is current.
+        """
         self.ensure_connection()
         if not self.connected:
             print("[WARNING] Cannot create tables — not connected.")
             return False
 
-        try:
-            # SUPPLIES TABLE
-            create_supplies_table = """
-            CREATE TABLE IF NOT EXISTS supplies (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                sku VARCHAR(20),
-                name VARCHAR(255) NOT NULL,
-                category VARCHAR(255),
-                supplier VARCHAR(255),
-                quantity INT DEFAULT 0,
-                min_quantity INT DEFAULT 5,
-                threshold INT DEFAULT 10,
-                price DECIMAL(10,2) DEFAULT 0.00,
-                last_updated DATETIME,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-            """
-            self.cursor.execute(create_supplies_table)
-
-            # TRANSACTIONS TABLE
-            create_transactions_table = """
-            CREATE TABLE IF NOT EXISTS transactions (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                item_id INT,
-                type ENUM('IN','OUT'),
-                qty INT,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-            """
-            self.cursor.execute(create_transactions_table)
-
-            # MONTHLY REPORT TABLE
-            create_monthly_report = """
-            CREATE TABLE IF NOT EXISTS monthly_reports (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                month_year VARCHAR(7),   -- format 2025-01
-                item_id INT,
-                total_in INT DEFAULT 0,
-                total_out INT DEFAULT 0,
-                current_stock INT DEFAULT 0,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-            """
-            self.cursor.execute(create_monthly_report)
-
-            # STOCK RECONCILIATION TABLE
-            create_reconciliation_table = """
-            CREATE TABLE IF NOT EXISTS stock_reconciliation (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                month_year VARCHAR(7),
-                item_id INT,
-                recorded_qty INT DEFAULT 0,
-                actual_qty INT DEFAULT 0,
-                variance INT DEFAULT 0,
-                reconciled_by VARCHAR(255),
-                notes TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-            """
-            self.cursor.execute(create_reconciliation_table)
-
-            # STOCK REQUESTS TABLE (if not exists)
-            create_stock_requests_table = """
-            CREATE TABLE IF NOT EXISTS stock_requests (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                item_id INT,
-                quantity INT,
-                requested_by INT,
-                status VARCHAR(50),
-                notes TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-            """
-            self.cursor.execute(create_stock_requests_table)
-
-            print("[OK] Tables created: supplies, transactions, monthly_reports, stock_reconciliation, stock_requests")
-            return True
-
-        except mysql.connector.Error as err:
-            print(f"[ERROR] Failed to create tables: {err}")
-            return False
+        return migrate(self)
 
     # -----------------------------------------------------
     # BASIC DB OPERATIONS
+    # Inside transaction() errors are raised instead of printed, so the
+    # whole block rolls back.
     # -----------------------------------------------------
     def execute_query(self, query, params=None):
+        return self.execute_count(query, params) is not None
+
+    def execute_count(self, query, params=None):
+        """
+        Like execute_query, but returns the number of rows the statement
+        changed (None on failure), for conditional updates.
+        """
         self.ensure_connection()
         try:
-            self.cursor.execute(query, params or ())
-            self.conn.commit()
-            return True
-        except mysql.connector.Error as err:
+            with self._checkout() as (conn, cursor):
+                started = time.perf_counter()
+                cursor.execute(query, params or ())
+                if not self._in_transaction():
+                    conn.commit()
+                count = max(cursor.rowcount or 0, 0)
+                self._record(query, started, count)
+            self._invalidate(query)
+            return count
+        except DB_ERRORS as err:
+            if self._in_transaction():
+                raise
             print(f"[ERROR] Query execution failed: {err}")
-            return False
+            return None
 
-    def fetch_query(self, query, params=None):
+    def fetch_query(self, query, params=None, use_cache=True, raise_errors=None):
+        """
+        use_cache=False always reads the DB (for revalidating other caches).
+        raise_errors=True raises a failed read instead of returning [], for
+        callers that must not mistake it for an empty result.
+        """
+        raise_errors = self._raises(raise_errors)
+        if not use_cache:
+            return [dict(row) for row in self._fetch_query_uncached(query, params, raise_errors)]
+        cached = self._cached(query, params,
+                              lambda q, p: self._fetch_query_uncached(q, p, raise_errors))
+        return [dict(row) for row in cached]
+
+    def _fetch_query_uncached(self, query, params=None, raise_errors=False):
         self.ensure_connection()
         try:
-            self.cursor.execute(query, params or ())
-            return self.cursor.fetchall()
-        except mysql.connector.Error as err:
+            with self._checkout() as (conn, cursor):
+                started = time.perf_counter()
+                cursor.execute(query, params or ())
+                rows = cursor.fetchall()
+                self._record(query, started, len(rows))
+                return rows
+        except DB_ERRORS as err:
+            if raise_errors:
+                raise
             print(f"[ERROR] Fetch failed: {err}")
             return []
 
-    def fetch_one(self, query, params=None):
+    def fetch_one(self, query, params=None, use_cache=True, raise_errors=None):
+        raise_errors = self._raises(raise_errors)
+        if not use_cache:
+            row = self._fetch_one_uncached(query, params, raise_errors)
+            return dict(row) if row else row
+        cached = self._cached(query, params,
+                              lambda q, p: self._fetch_one_uncached(q, p, raise_errors))
+        return dict(cached) if cached else cached
+
+    def _fetch_one_uncached(self, query, params=None, raise_errors=False):
         self.ensure_connection()
         try:
-            self.cursor.execute(query, params or ())
-            return self.cursor.fetchone()
-        except mysql.connector.Error as err:
+            with self._checkout() as (conn, cursor):
+                started = time.perf_counter()
+                cursor.execute(query, params or ())
+                row = cursor.fetchone()
+                self._record(query, started, 1 if row else 0)
+                return row
+        except DB_ERRORS as err:
+            if raise_errors:
+                raise
             print(f"❌ Fetch-one failed: {err}")
             return None
 
+    def iter_query(self, query, params=None, chunk_size=1000, raise_errors=False):
+        """
+        Generator over the rows of a large SELECT.
+        Rows are pulled from an unbuffered cursor chunk_size at a time, so
+        memory stays bounded however many rows the query returns.
+        A failure ends the stream early; raise_errors=True raises it instead,
+        for callers that must not mistake it for the end of the rows.
+        """
+        self.ensure_connection()
+        try:
+            with self._stream_checkout() as conn:
+                cursor = conn.cursor(dictionary=True)
+                exhausted = False
+                try:
+                    cursor.execute(query, params or ())
+                    while True:
+                        rows = cursor.fetchmany(chunk_size)
+                        if not rows:
+                            exhausted = True
+                            break
+                        yield from rows
+                finally:
+                    # The caller may stop early: drain what the server already
+                    # sent so the connection can be reused.
+                    if not exhausted:
+                        try:
+                            while cursor.fetchmany(chunk_size):
+                                pass
+                        except DB_ERRORS:
+                            pass
+                    cursor.close()
+        except DB_ERRORS as err:
+            if raise_errors:
+                raise
+            print(f"[ERROR] Streaming fetch failed: {err}")
+
+    def execute_many(self, query, seq_params, chunk_size=500):
+        """
+        Run one statement for many parameter rows.
+        INSERT ... VALUES statements go out as multi-row inserts of up to
+        chunk_size rows per round trip, and the whole batch commits once
+        (or joins the caller's transaction() block).
+        """
+        self.ensure_connection()
+        try:
+            with self.transaction(), self._checkout() as (conn, cursor):
+                rows = iter(seq_params)
+                while True:
+                    chunk = list(islice(rows, chunk_size))
+                    if not chunk:
+                        break
+                    started = time.perf_counter()
+                    cursor.executemany(query, chunk)
+                    self._record(query, started, len(chunk))
+            self._invalidate(query)
+            return True
+        except DB_ERRORS as err:
+            if self._in_transaction():
+                raise
+            print(f"[ERROR] Batch execution failed: {err}")
+            return False
+
+    # -----------------------------------------------------
+    # QUERY RESULT CACHE
+    # Enabled with config["query_cache_size"] > 0 (max cached results).
+    # Writes made through this manager drop every cached result that read
+    # the written table. Changes made by other clients are only seen once
+    # an entry expires (config["query_cache_ttl"], seconds), so
+    # config["query_cache_tables"] should list only tables that tolerate
+    # that delay.
+    # -----------------------------------------------------
+    def _cached(self, query, params, load):
+        cache = self.query_cache
+        if cache is None or self._in_transaction() or not is_cacheable(query):
+            return load(query, params)
+        if not cache.allows(tables_in(query)):
+            return load(query, params)
+
+        key = cache.key(query, params)
+        hit, value = cache.get(key)
+        if hit:
+            return value
+
+        snapshot = value
+        result = load(query, params)
+        # Failed reads come back as []/None too, but those are cheap to retry
+        if result:
+            if isinstance(result, list):
+                result = [dict(row) for row in result]
+            else:
+                result = dict(result)
+            cache.put(key, result, tables_in(query), snapshot)
+        return result
+
+    def _invalidate(self, query):
+        tables = tables_in(query)
+        if self._in_transaction():
+            self._local.written |= tables
+        self._invalidate_tables(tables)
+
+    def _invalidate_tables(self, tables):
+        if self.query_cache is not None and tables:
+            self.query_cache.invalidate(tables)
+
+    def clear_cache(self):
+        if self.query_cache is not None:
+            self.query_cache.clear()
+
+    # -----------------------------------------------------
+    # QUERY STATISTICS
+    # -----------------------------------------------------
+    def _record(self, query, started, rows):
+        self.query_stats.record(query, (time.perf_counter() - started) * 1000.0, rows)
+
+    def stats(self, reset=False):
+        """
+        Per-statement-fingerprint calls, latency percentiles and rows,
+        slowest total first. reset=True clears the counters after reading.
+        """
+        result = self.query_stats.snapshot()
+        if reset:
+            self.query_stats.reset()
+        return result
+
     # -----------------------------------------------------
     # COMPATIBILITY ALIASES (Fixes SupplyManager Errors)
     # -----------------------------------------------------
-    def fetch_all(self, query, params=None):
+    def fetch_all(self, query, params=None, use_cache=True, raise_errors=None):
         """Alias for fetch_query (required by SupplyManager)."""
-        return self.fetch_query(query, params)
+        return self.fetch_query(query, params, use_cache, raise_errors)
 
     def execute(self, query, params=None):
         """Alias for execute_query (required by SupplyManager)."""
         return self.execute_query(query, params)
 
+    # -----------------------------------------------------
+    # USERS
+    # -----------------------------------------------------
+    def add_user(self, username, password, role="Staff"):
+        return self.execute_query(
+            "INSERT INTO users (username, password, role) VALUES (%s, %s, %s)",
+            (username, password, role)
+        )
+
+    # -----------------------------------------------------
+    # TRANSACTION LEDGER (database/ledger.py)
+    # -----------------------------------------------------
+    def log_transaction(self, supply_id, action, qty, prev=None, new=None, note="",
+                        timestamp=None, immediate=False):
+        """
+        Record one stock movement. By default it is buffered and written with
+        the next ledger batch; immediate=True writes it now, inside the
+        caller's transaction() when there is one.
+        """
+        if immediate:
+            self.ledger.write([make_entry(supply_id, action, qty, prev, new, note, timestamp)])
+            return True
+        return self.ledger.append(supply_id, action, qty, prev, new, note, timestamp)
+
+    def get_logs(self, item_id=None, after_id=None, limit=100):
+        return self.ledger.get_logs(item_id=item_id, after_id=after_id, limit=limit)
+
+    def flush_ledger(self):
+        return self.ledger.flush()
+
     # -----------------------------------------------------
     # MONTHLY REPORT FUNCTIONS
     # -----------------------------------------------------
     def generate_monthly_report(self, month_year):
         """
         month_year → '2025-01'
+        Every ledger write already keeps monthly_reports and
+        daily_item_movements current; this rebuilds one month of both from
+        the transactions table (repair / backfill).
         """
         print(f"📊 Generating monthly report for {month_year}...")
+        self.ledger.flush()
 
-        query = """
-        SELECT 
+        # One set-based statement: the aggregation and the insert both run
+        # server side, so the cost no longer depends on the number of items.
+        # Re-running a month overwrites its rows (unique month_year, item_id).
+        window_sql, window_params = month_window("timestamp", month_year)
+        query = f"""
+        INSERT INTO monthly_reports (month_year, item_id, total_in, total_out)
+        SELECT
+            %s,
             item_id,
-            SUM(CASE WHEN type='IN' THEN qty ELSE 0 END) AS total_in,
-            SUM(CASE WHEN type='OUT' THEN qty ELSE 0 END) AS total_out
+            SUM(CASE WHEN type='IN' THEN qty ELSE 0 END),
+            SUM(CASE WHEN type='OUT' THEN qty ELSE 0 END)
         FROM transactions
-        WHERE DATE_FORMAT(timestamp,'%Y-%m') = %s
+        WHERE {window_sql}
         GROUP BY item_id
+        ON DUPLICATE KEY UPDATE
+            total_in = VALUES(total_in),
+            total_out = VALUES(total_out)
         """
 
-        result = self.fetch_query(query, (month_year,))
+        daily_query = f"""
+        INSERT INTO daily_item_movements (month_year, day, item_id, qty_in, qty_out)
+        SELECT
+            %s,
+            DATE_FORMAT(timestamp, '%d'),
+            item_id,
+            SUM(CASE WHEN type='IN' THEN qty ELSE 0 END),
+            SUM(CASE WHEN type='OUT' THEN qty ELSE 0 END)
+        FROM transactions
+        WHERE {window_sql}
+        GROUP BY DATE_FORMAT(timestamp, '%d'), item_id
+        ON DUPLICATE KEY UPDATE
+            qty_in = VALUES(qty_in),
+            qty_out = VALUES(qty_out)
+        """
 
-        for row in result:
-            insert_q = """
-            INSERT INTO monthly_reports (month_year, item_id, total_in, total_out)
-            VALUES (%s, %s, %s, %s)
-            """
-            self.execute_query(insert_q, (
-                month_year,
-                row["item_id"],
-                row["total_in"],
-                row["total_out"]
-            ))
+        if not (self.execute_query(query, (month_year, *window_params))
+                and self.execute_query(daily_query, (month_year, *window_params))):
+            print(f"[ERROR] Monthly report for {month_year} failed.")
+            return False
 
         print(f"[OK] Monthly report for {month_year} generated.")
         return True
 
     def get_month_report(self, month_year):
+        # Index range read on (month_year, item_id); buffered movements go in first
+        self.ledger.flush()
         query = "SELECT * FROM monthly_reports WHERE month_year=%s"
         return self.fetch_query(query, (month_year,))
 
+    def get_monthly_reports(self, start_month=None, end_month=None):
+        """monthly_reports rows for start_month..end_month ('YYYY-MM', both inclusive)."""
+        self.ledger.flush()
+        clauses, params = [], []
+        if start_month:
+            clauses.append("month_year >= %s")
+            params.append(start_month)
+        if end_month:
+            clauses.append("month_year <= %s")
+            params.append(end_month)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self.fetch_query(
+            f"SELECT * FROM monthly_reports {where} ORDER BY month_year, item_id", params
+        )
+
+    def get_monthly_trend(self, end_month, months=12):
+        """
+        Month-end stock for the `months` months ending at end_month, oldest
+        first: [{month_year, label, total_items, total_value}], one row per
+        month even when nothing moved. Starts from end_month's stock and walks
+        back through the monthly_reports rollups (IN - OUT per item), so the
+        whole window is one range read on (month_year, item_id).
+        Values use today's prices (the last price for deleted items).
+        Deleting an item logs its remaining stock as an OUT, so walking back
+        past the deletion brings the item back into the earlier months.
+        """
+        start_month = shift_month(end_month, -(months - 1))
+        stock = self.month_end_stock(end_month)
+        prices = {int(r["id"]): float(r["price"] or 0)
+                  for r in self.fetch_query("SELECT supply_id AS id, price FROM supply_tombstones")}
+        prices.update({int(r["id"]): float(r["price"] or 0)
+                       for r in self.fetch_query("SELECT id, price FROM supplies")})
+        net = {}
+        for r in self.fetch_query("""
+            SELECT month_year, item_id, total_in, total_out
+            FROM monthly_reports
+            WHERE month_year > %s AND month_year <= %s
+        """, (start_month, end_month)):
+            net.setdefault(r["month_year"], {})[int(r["item_id"])] = (
+                int(r["total_in"] or 0) - int(r["total_out"] or 0)
+            )
+
+        points = []
+        month = end_month
+        for _ in range(months):
+            points.append({
+                "month_year": month,
+                "label": month_start(month).strftime("%b %Y"),
+                "total_items": sum(stock.values()),
+                "total_value": sum(qty * prices.get(item_id, 0.0) for item_id, qty in stock.items()),
+            })
+            # Undo this month's movements to get the previous month end
+            for item_id, moved in net.get(month, {}).items():
+                stock[item_id] = stock.get(item_id, 0) - moved
+            month = shift_month(month, -1)
+        return points[::-1]
+
+    def get_daily_movements(self, month_year, item_id=None, category=None):
+        """
+        One row per day with movement in month_year: day (1-31), qty_in,
+        qty_out, net_qty. Optionally for one item or one category only.
+        Reads daily_item_movements, so at most ~31 rows per item are summed.
+        """
+        self.ledger.flush()
+        join, clauses, params = "", ["d.month_year = %s"], [month_year]
+        if item_id is not None:
+            clauses.append("d.item_id = %s")
+            params.append(item_id)
+        if category:
+            join = "JOIN supplies s ON s.id = d.item_id"
+            clauses.append("s.category = %s")
+            params.append(category)
+        return self.fetch_query(f"""
+            SELECT d.day,
+                   SUM(d.qty_in) AS qty_in,
+                   SUM(d.qty_out) AS qty_out,
+                   SUM(d.qty_in) - SUM(d.qty_out) AS net_qty
+            FROM daily_item_movements d {join}
+            WHERE {' AND '.join(clauses)}
+            GROUP BY d.day
+            ORDER BY d.day
+        """, params)
+
+    def get_day_movements(self, date):
+        """Per-item movement on one day ('YYYY-MM-DD'), biggest movers first."""
+        self.ledger.flush()
+        return self.fetch_query("""
+            SELECT d.item_id, s.name, s.category, d.qty_in, d.qty_out,
+                   d.qty_in - d.qty_out AS net_qty
+            FROM daily_item_movements d
+            LEFT JOIN supplies s ON s.id = d.item_id
+            WHERE d.month_year = %s AND d.day = %s
+            ORDER BY d.qty_in + d.qty_out DESC, d.item_id
+        """, (date[:7], int(date[8:10])))
+
+    # -----------------------------------------------------
+    # STOCK HISTORY (database/stock_history.py)
+    # -----------------------------------------------------
+    def stock_at(self, when):
+        """{item_id: quantity} at a past moment, from the nearest month-end snapshot."""
+        return self.history.stock_at(when)
+
+    def month_end_stock(self, month_year):
+        return self.history.month_end_stock(month_year)
+
+    def capture_stock_snapshots(self):
+        """Snapshot every closed month that has none yet (cheap when up to date)."""
+        return self.history.ensure_snapshots()
+
+    # -----------------------------------------------------
+    # EXPORT (database/export.py, database/columnar_export.py)
+    # -----------------------------------------------------
+    def export_csv(self, kind, target, start=None, end=None, chunk_size=1000):
+        """
+        Stream one export as CSV to a path or an open text file.
+        kind → 'ledger' (start/end: timestamps, end exclusive), 'inventory',
+        'monthly_reports' or 'daily_movements' (start/end: 'YYYY-MM', inclusive).
+        Rows are written as iter_query() fetches them, chunk_size at a time,
+        so memory stays flat however long the range.
+        Returns the number of rows written, or None on failure (a failed
+        read included); a target path is then left as it was.
+        """
+        build = EXPORTS.get(kind)
+        if build is None:
+            print(f"[ERROR] Unknown export '{kind}'.")
+            return None
+        self.ledger.flush()
+        columns, query, params = build(start, end)
+        try:
+            rows = self.iter_query(query, params, chunk_size, raise_errors=True)
+            return write_csv(rows, columns, target)
+        except (OSError, *DB_ERRORS) as e:
+            print(f"[ERROR] Export of {kind} failed: {e}")
+            return None
+
+    def export_columnar(self, directory, tables=None, through_month=None, fmt=None):
+        """
+        Append month partitions of transactions, monthly_reports,
+        stock_reconciliation and stock_snapshots under directory, as
+        Parquet (pyarrow), .npz (numpy) or CSV, whichever is available
+        unless fmt says. Only months after the newest exported one are
+        written. Returns {table: [months written]}, or None on failure;
+        the months written before a failure are kept and the next run
+        continues from the failed one.
+        """
+        try:
+            return ColumnarExporter(self, directory, fmt).export(tables, through_month)
+        except (OSError, ValueError, *DB_ERRORS) as e:
+            print(f"[ERROR] Columnar export failed: {e}")
+            return None
+
     # -----------------------------------------------------
     # CLOSE CONNECTION
     # -----------------------------------------------------
     def close(self):
+        ledger = getattr(self, "ledger", None)
+        if ledger is not None and self.connected:
+            ledger.close()
+
         if self.cursor:
             try: 
                 self.cursor.close()
@@ -235,4 +712,11 @@ class DatabaseManager:
             except:
                 pass
 
+        if self.pool:
+            try:
+                self.pool._remove_connections()
+            except:
+                pass
+            self.pool = None
+
         print("🔒 Database connection closed.")
@@ -0,0 +1,226 @@
+import re
+import sqlite3
+import datetime
+import decimal
+
+import mysql.connector
+from mysql.connector import pooling
+
+
+# Errors DatabaseManager treats as "query failed" for every backend
+DB_ERRORS = (mysql.connector.Error, sqlite3.Error)
+
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+# -----------------------------------------------------
+# MYSQL
+# -----------------------------------------------------
+class MySQLBackend:
+    label = "MySQL"
+
+    def __init__(self, config):
+        self.config = config
+
+    def connection_args(self):
+        return {
+            "host": self.config.get("host", "localhost"),
+            "user": self.config.get("user", "root"),
+            "password": self.config.get("password", ""),
+            "database": self.config.get("database"),
+            "autocommit": True,
+            "connection_timeout": 5,
+        }
+
+    def connect(self):
+        return mysql.connector.connect(**self.connection_args())
+
+    def create_pool(self, size):
+        # No COM_RESET_CONNECTION round trip on every checkout: the app sets
+        # no session state, and transaction() always ends in commit/rollback.
+        return pooling.MySQLConnectionPool(
+            pool_name=self.config.get("pool_name", "supply_pool"),
+            pool_size=size,
+            pool_reset_session=False,
+            **self.connection_args()
+        )
+
+    def stream_connection(self, shared_conn):
+        """
+        Connection for an unbuffered result set → (conn, close_when_done).
+        An unread MySQL result blocks its connection, so streams get their own.
+        """
+        return self.connect(), True
+
+
+# -----------------------------------------------------
+# SQLITE
+# Local stand-in / single-node mode. The connection below mimics the
+# parts of mysql.connector that DatabaseManager uses, and translate_sqlite()
+# rewrites the MySQL-isms used across the app into SQLite.
+# -----------------------------------------------------
+_MYSQL_DATE_CODES = {
+    "%Y": "%Y", "%y": "%y", "%m": "%m", "%d": "%d", "%H": "%H",
+    "%i": "%M", "%s": "%S", "%S": "%S", "%b": "%b", "%M": "%B",
+    "%a": "%a", "%W": "%A", "%j": "%j", "%p": "%p", "%T": "%H:%M:%S",
+    "%%": "%%",
+}
+
+
+def _to_datetime(value):
+    if value is None or isinstance(value, datetime.datetime):
+        return value
+    if isinstance(value, datetime.date):
+        return datetime.datetime(value.year, value.month, value.day)
+    try:
+        return datetime.datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+
+def _date_format(value, mysql_format):
+    """SQLite implementation of MySQL DATE_FORMAT()."""
+    dt = _to_datetime(value)
+    if dt is None or mysql_format is None:
+        return None
+    py_format = re.sub(r"%.", lambda m: _MYSQL_DATE_CODES.get(m.group(0), m.group(0)), mysql_format)
+    return dt.strftime(py_format)
+
+
+def _now():
+    return datetime.datetime.now().strftime(DATETIME_FORMAT)
+
+
+def _dict_row(cursor, row):
+    return {col[0]: value for col, value in zip(cursor.description, row)}
+
+
+# Literal-aware replacement of %s placeholders with ?
+_PLACEHOLDER = re.compile(r"('(?:[^'\\]|\\.)*')|%s")
+
+_DIALECT_RULES = [
+    (re.compile(r"\bINT\s+AUTO_INCREMENT\s+PRIMARY\s+KEY\b", re.I), "INTEGER PRIMARY KEY AUTOINCREMENT"),
+    (re.compile(r"\bENUM\s*\([^)]*\)", re.I), "TEXT"),
+    (re.compile(r"\bON\s+UPDATE\s+CURRENT_TIMESTAMP\b", re.I), ""),
+    (re.compile(r"\bDEFAULT\s+CURRENT_TIMESTAMP\b", re.I), "DEFAULT (datetime('now', 'localtime'))"),
+    (re.compile(r"\bINSERT\s+IGNORE\b", re.I), "INSERT OR IGNORE"),
+    (re.compile(r"\bFOR\s+UPDATE\b", re.I), ""),
+]
+
+_UPSERT = re.compile(r"\bON\s+DUPLICATE\s+KEY\s+UPDATE\b", re.I)
+_INSERTED_VALUE = re.compile(r"\bVALUES\s*\(\s*(\w+)\s*\)", re.I)
+
+
+def translate_sqlite(sql):
+    """Rewrite a MySQL statement written for this app into SQLite syntax."""
+    for pattern, replacement in _DIALECT_RULES:
+        sql = pattern.sub(replacement, sql)
+    # ON DUPLICATE KEY UPDATE col = VALUES(col)
+    #   → ON CONFLICT DO UPDATE SET col = excluded.col
+    parts = _UPSERT.split(sql, maxsplit=1)
+    if len(parts) == 2:
+        sql = parts[0] + "ON CONFLICT DO UPDATE SET" + _INSERTED_VALUE.sub(r"excluded.\1", parts[1])
+    return _PLACEHOLDER.sub(lambda m: m.group(1) or "?", sql)
+
+
+class SQLiteCursor:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def execute(self, query, params=()):
+        self._cursor.execute(translate_sqlite(query), tuple(params or ()))
+
+    def executemany(self, query, seq_params):
+        self._cursor.executemany(translate_sqlite(query), [tuple(p) for p in seq_params])
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def fetchmany(self, size):
+        return self._cursor.fetchmany(size)
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    def close(self):
+        self._cursor.close()
+
+
+class SQLiteConnection:
+    def __init__(self, conn):
+        self._conn = conn
+
+    def cursor(self, dictionary=True, buffered=False):
+        return SQLiteCursor(self._conn.cursor())
+
+    def start_transaction(self):
+        self._conn.execute("BEGIN")
+
+    def commit(self):
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+    def is_connected(self):
+        return True
+
+    def close(self):
+        self._conn.close()
+
+
+class SQLiteBackend:
+    label = "SQLite"
+
+    def __init__(self, config):
+        self.config = config
+
+    def connect(self):
+        conn = sqlite3.connect(
+            self.config.get("database") or ":memory:",
+            isolation_level=None,        # autocommit, like the MySQL connection
+            check_same_thread=False,     # DatabaseManager serializes access itself
+            detect_types=sqlite3.PARSE_DECLTYPES,
+        )
+        conn.row_factory = _dict_row
+        conn.create_function("NOW", 0, _now)
+        conn.create_function("DATE_FORMAT", 2, _date_format)
+        conn.create_function("GREATEST", -1, max)
+        conn.create_function("LEAST", -1, min)
+        return SQLiteConnection(conn)
+
+    def create_pool(self, size):
+        # One connection is all SQLite needs (and all :memory: allows)
+        return None
+
+    def stream_connection(self, shared_conn):
+        # SQLite cursors don't block each other on one connection
+        return shared_conn, False
+
+
+sqlite3.register_adapter(datetime.datetime, lambda dt: dt.strftime(DATETIME_FORMAT))
+sqlite3.register_adapter(decimal.Decimal, float)
+sqlite3.register_converter("DATETIME", lambda raw: _to_datetime(raw.decode()) or raw.decode())
+sqlite3.register_converter("TIMESTAMP", lambda raw: _to_datetime(raw.decode()) or raw.decode())
+
+
+BACKENDS = {
+    "mysql": MySQLBackend,
+    "sqlite": SQLiteBackend,
+}
+
+
+def get_backend(config):
+    """Backend named by config["backend"] (default "mysql")."""
+    name = (config.get("backend") or "mysql").lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown database backend: {name}")
+    return BACKENDS[name](config)
@@ -0,0 +1,178 @@
+import os
+import pathlib
+from datetime import date
+
+from .export import write_csv
+from .month_window import month_bounds, shift_month
+
+try:
+    import pyarrow as pa  # optional: Parquet partitions
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+try:
+    import numpy as np  # optional: .npz partitions when pyarrow is missing
+except ImportError:
+    np = None
+
+
+# -----------------------------------------------------
+# TABLES
+# table → (month column, [(column, kind)]). Kinds: int, nint (nullable int),
+# float, str, datetime. transactions is partitioned by the month of its
+# timestamp, the others by their month_year key.
+# -----------------------------------------------------
+TABLES = {
+    "transactions": ("timestamp", [
+        ("id", "int"), ("timestamp", "datetime"), ("item_id", "int"), ("type", "str"),
+        ("qty", "int"), ("prev_qty", "nint"), ("new_qty", "nint"), ("note", "str"),
+    ]),
+    "monthly_reports": ("month_year", [
+        ("month_year", "str"), ("item_id", "int"), ("total_in", "int"),
+        ("total_out", "int"), ("current_stock", "nint"),
+    ]),
+    "stock_reconciliation": ("month_year", [
+        ("month_year", "str"), ("item_id", "int"), ("recorded_qty", "int"),
+        ("actual_qty", "int"), ("variance", "int"), ("reconciled_by", "str"), ("notes", "str"),
+    ]),
+    "stock_snapshots": ("month_year", [
+        ("month_year", "str"), ("item_id", "int"), ("quantity", "int"),
+    ]),
+}
+
+
+def default_format():
+    """'parquet' with pyarrow, else 'npz' with numpy, else 'csv'."""
+    if pq is not None:
+        return "parquet"
+    if np is not None:
+        return "npz"
+    return "csv"
+
+
+def partition_dir(directory, table, month_year):
+    """Hive-style layout, <dir>/<table>/month=YYYY-MM/, which pyarrow.dataset reads as a column."""
+    return pathlib.Path(directory) / table / f"month={month_year}"
+
+
+def exported_months(directory, table):
+    """Months of `table` that already have a partition on disk, oldest first."""
+    root = pathlib.Path(directory) / table
+    if not root.is_dir():
+        return []
+    return sorted(
+        p.name.split("=", 1)[1] for p in root.iterdir()
+        if p.is_dir() and p.name.startswith("month=") and any(p.glob("part.*"))
+    )
+
+
+class ColumnarExporter:
+    """
+    Month-partitioned columnar copies of the ledger and report tables for
+    analytics. Each run only appends the closed months after the newest
+    partition already on disk; the open month is left until it closes.
+    A reader can then load just the months and columns it needs. Delete a
+    month's folder to have it exported again.
+    """
+
+    def __init__(self, db, directory, fmt=None):
+        self.db = db
+        self.directory = pathlib.Path(directory)
+        self.fmt = fmt or default_format()
+        if self.fmt == "parquet" and pq is None:
+            raise ValueError("Parquet export needs pyarrow")
+        if self.fmt == "npz" and np is None:
+            raise ValueError(".npz export needs numpy")
+
+    def export(self, tables=None, through_month=None):
+        """
+        Write every missing month up to through_month (default: last closed
+        month) for each table. Returns {table: [months written]}.
+        A failed read raises and stops the run at that month, so it is
+        retried next time instead of being taken for an empty month.
+        """
+        through_month = through_month or shift_month(date.today().strftime("%Y-%m"), -1)
+        self.db.ledger.flush()
+        written = {}
+        for table in tables or TABLES:
+            month_column, columns = TABLES[table]
+            done = exported_months(self.directory, table)
+            month = shift_month(done[-1], 1) if done else self._first_month(table, month_column)
+            written[table] = []
+            while month and month <= through_month:
+                if self._export_month(table, month_column, columns, month):
+                    written[table].append(month)
+                month = shift_month(month, 1)
+        return written
+
+    def _first_month(self, table, month_column):
+        row = self.db.fetch_one(f"SELECT MIN({month_column}) AS first_month FROM {table}",
+                                use_cache=False, raise_errors=True)
+        first = row.get("first_month") if row else None
+        return str(first)[:7] if first else None
+
+    def _export_month(self, table, month_column, columns, month_year):
+        """One month of one table as a partition; False when the month has no rows."""
+        if month_column == "month_year":
+            where, params = "month_year = %s", [month_year]
+        else:
+            start, end = month_bounds(month_year)
+            where, params = f"{month_column} >= %s AND {month_column} < %s", [start, end]
+        names = [name for name, _ in columns]
+        rows = self.db.iter_query(
+            f"SELECT {', '.join(names)} FROM {table} WHERE {where} ORDER BY {', '.join(names[:2])}",
+            params, raise_errors=True
+        )
+
+        values = {name: [] for name in names}
+        for row in rows:
+            for name in names:
+                values[name].append(row.get(name))
+        if not values[names[0]]:
+            return False
+
+        folder = partition_dir(self.directory, table, month_year)
+        folder.mkdir(parents=True, exist_ok=True)
+        path = folder / f"part.{self.fmt}"
+        tmp = folder / f".part.{self.fmt}.tmp"
+        if self.fmt == "parquet":
+            pq.write_table(_arrow_table(columns, values), str(tmp))
+        elif self.fmt == "npz":
+            with open(tmp, "wb") as f:
+                np.savez_compressed(f, **{name: _numpy_column(kind, values[name]) for name, kind in columns})
+        else:
+            count = len(values[names[0]])
+            write_csv(({n: values[n][i] for n in names} for i in range(count)), names, str(tmp))
+        os.replace(tmp, path)  # a partition is either complete or absent
+        return True
+
+
+def _iso(value):
+    return str(value).replace(" ", "T")[:19] if value is not None else None
+
+
+def _arrow_table(columns, values):
+    types = {"int": pa.int64(), "nint": pa.int64(), "float": pa.float64(),
+             "str": pa.string(), "datetime": pa.timestamp("s")}
+    arrays = {}
+    for name, kind in columns:
+        data = values[name]
+        if kind == "datetime":
+            arrays[name] = pa.array([_iso(v) for v in data], pa.string()).cast(types[kind])
+        elif kind == "str":
+            arrays[name] = pa.array([None if v is None else str(v) for v in data], types[kind])
+        else:
+            arrays[name] = pa.array(data, types[kind])
+    return pa.table(arrays)
+
+
+def _numpy_column(kind, data):
+    """Plain dtypes only, so np.load() works without allow_pickle."""
+    if kind == "int":
+        return np.array([int(v or 0) for v in data], dtype=np.int64)
+    if kind in ("nint", "float"):
+        return np.array([np.nan if v is None else float(v) for v in data], dtype=np.float64)
+    if kind == "datetime":
+        return np.array([_iso(v) or "NaT" for v in data], dtype="datetime64[s]")
+    return np.array(["" if v is None else str(v) for v in data], dtype=str)
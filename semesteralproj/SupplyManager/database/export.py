@@ -0,0 +1,127 @@
+import os
+import csv
+
+from .month_window import month_bounds
+
+
+# -----------------------------------------------------
+# EXPORT QUERIES
+# Each builder returns (columns, sql, params). Ranges are read through an
+# index, in index order, so rows can stream straight out.
+# -----------------------------------------------------
+def _between(column, start, end, clauses, params, end_op="<"):
+    if start:
+        clauses.append(f"{column} >= %s")
+        params.append(start)
+    if end:
+        clauses.append(f"{column} {end_op} %s")
+        params.append(end)
+
+
+def _where(clauses):
+    return f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+
+def ledger_query(start=None, end=None):
+    """Ledger rows with start <= timestamp < end ('YYYY-MM-DD[ HH:MM:SS]')."""
+    columns = ["id", "timestamp", "item_id", "type", "qty", "prev_qty", "new_qty", "note"]
+    clauses, params = [], []
+    _between("timestamp", start, end, clauses, params)
+    sql = f"""
+        SELECT {', '.join(columns)} FROM transactions
+        {_where(clauses)}
+        ORDER BY timestamp, id
+    """
+    return columns, sql, params
+
+
+def inventory_query(start=None, end=None):
+    """Current supplies; the range arguments are ignored."""
+    columns = ["id", "sku", "name", "category", "supplier", "quantity",
+               "min_quantity", "price", "last_updated"]
+    sql = f"SELECT {', '.join(columns)} FROM supplies ORDER BY id"
+    return columns, sql, []
+
+
+def monthly_reports_query(start=None, end=None):
+    """monthly_reports rows for months start..end ('YYYY-MM', both inclusive), with month-end stock."""
+    columns = ["month_year", "item_id", "name", "sku", "category",
+               "total_in", "total_out", "closing_stock"]
+    clauses, params = [], []
+    _between("r.month_year", start, end, clauses, params, end_op="<=")
+    sql = f"""
+        SELECT r.month_year, r.item_id, s.name, s.sku, s.category,
+               r.total_in, r.total_out, sn.quantity AS closing_stock
+        FROM monthly_reports r
+        LEFT JOIN supplies s ON s.id = r.item_id
+        LEFT JOIN stock_snapshots sn ON sn.month_year = r.month_year AND sn.item_id = r.item_id
+        {_where(clauses)}
+        ORDER BY r.month_year, r.item_id
+    """
+    return columns, sql, params
+
+
+def daily_movements_query(start=None, end=None):
+    """daily_item_movements rows for months start..end ('YYYY-MM', both inclusive)."""
+    columns = ["month_year", "day", "item_id", "name", "qty_in", "qty_out"]
+    clauses, params = [], []
+    _between("d.month_year", start, end, clauses, params, end_op="<=")
+    sql = f"""
+        SELECT d.month_year, d.day, d.item_id, s.name, d.qty_in, d.qty_out
+        FROM daily_item_movements d
+        LEFT JOIN supplies s ON s.id = d.item_id
+        {_where(clauses)}
+        ORDER BY d.month_year, d.day, d.item_id
+    """
+    return columns, sql, params
+
+
+EXPORTS = {
+    "ledger": ledger_query,
+    "inventory": inventory_query,
+    "monthly_reports": monthly_reports_query,
+    "daily_movements": daily_movements_query,
+}
+
+
+def month_range(kind, month_year):
+    """(start, end) arguments selecting one month for an export kind."""
+    if kind == "ledger":
+        return month_bounds(month_year)
+    if kind in ("monthly_reports", "daily_movements"):
+        return month_year, month_year
+    return None, None
+
+
+def write_csv(rows, columns, target):
+    """
+    Write dict rows under a header of `columns` to a path or an open text
+    file, one row at a time as the iterable produces them.
+    Returns the number of data rows written. Errors from the rows or the
+    file are raised; a path is written through a temporary file, so it is
+    left untouched unless every row made it.
+    """
+    if hasattr(target, "write"):
+        return _write_rows(rows, columns, target)
+    tmp = f"{target}.tmp"
+    try:
+        with open(tmp, "w", newline="", encoding="utf-8") as f:
+            count = _write_rows(rows, columns, f)
+        os.replace(tmp, target)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    return count
+
+
+def _write_rows(rows, columns, f):
+    writer = csv.DictWriter(f, fieldnames=columns, extrasaction="ignore")
+    writer.writeheader()
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    return count
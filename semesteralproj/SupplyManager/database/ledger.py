@@ -0,0 +1,181 @@
+import threading
+from datetime import datetime
+
+
+INSERT_ENTRY = """
+INSERT INTO transactions (item_id, type, qty, prev_qty, new_qty, note, timestamp)
+VALUES (%s, %s, %s, %s, %s, %s, %s)
+"""
+
+# Per (month, item) IN/OUT counters, bumped with every ledger write
+MONTHLY_ROLLUP = """
+INSERT INTO monthly_reports (month_year, item_id, total_in, total_out)
+VALUES (%s, %s, %s, %s)
+ON DUPLICATE KEY UPDATE
+    total_in = total_in + VALUES(total_in),
+    total_out = total_out + VALUES(total_out)
+"""
+
+# Per (month, day, item) IN/OUT counters for the daily movement chart
+DAILY_ROLLUP = """
+INSERT INTO daily_item_movements (month_year, day, item_id, qty_in, qty_out)
+VALUES (%s, %s, %s, %s, %s)
+ON DUPLICATE KEY UPDATE
+    qty_in = qty_in + VALUES(qty_in),
+    qty_out = qty_out + VALUES(qty_out)
+"""
+
+
+def movement_type(action, qty, prev=None, new=None):
+    """'IN' / 'OUT' for a ledger row; other action names go by the stock change."""
+    action = str(action or "").strip().upper()
+    if action in ("IN", "OUT"):
+        return action
+    if prev is not None and new is not None:
+        return "IN" if new >= prev else "OUT"
+    return "IN" if qty >= 0 else "OUT"
+
+
+def make_entry(item_id, action, qty, prev=None, new=None, note="", timestamp=None):
+    """One transactions row, in INSERT_ENTRY column order."""
+    qty = int(qty)
+    return (
+        item_id,
+        movement_type(action, qty, prev, new),
+        abs(qty),
+        prev,
+        new,
+        note or None,
+        str(timestamp or datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+    )
+
+
+def monthly_totals(entries):
+    """[(month_year, item_id, total_in, total_out)] summed over ledger entries."""
+    totals = {}
+    for item_id, kind, qty, _prev, _new, _note, timestamp in entries:
+        key = (timestamp[:7], item_id)
+        counts = totals.setdefault(key, [0, 0])
+        counts[0 if kind == "IN" else 1] += qty
+    return [(month, item_id, t_in, t_out) for (month, item_id), (t_in, t_out) in totals.items()]
+
+
+def daily_totals(entries):
+    """[(month_year, day, item_id, qty_in, qty_out)] summed over ledger entries."""
+    totals = {}
+    for item_id, kind, qty, _prev, _new, _note, timestamp in entries:
+        key = (timestamp[:7], int(timestamp[8:10]), item_id)
+        counts = totals.setdefault(key, [0, 0])
+        counts[0 if kind == "IN" else 1] += qty
+    return [(month, day, item_id, q_in, q_out) for (month, day, item_id), (q_in, q_out) in totals.items()]
+
+
+class Ledger:
+    """
+    Stock movement log on the transactions table.
+    append() only buffers; the buffer goes out as one multi-row insert when
+    it holds flush_rows entries or its oldest entry is flush_ms old, so
+    logging a movement costs no round trip of its own.
+    """
+
+    def __init__(self, db, flush_rows=100, flush_ms=500):
+        self.db = db
+        self.flush_rows = flush_rows
+        self.flush_ms = flush_ms
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # keeps batches in append order
+        self._timer = None
+
+    def append(self, item_id, action, qty, prev=None, new=None, note="", timestamp=None):
+        row = make_entry(item_id, action, qty, prev, new, note, timestamp)
+        with self._lock:
+            self._buffer.append(row)
+            full = len(self._buffer) >= self.flush_rows
+            # Also when full: a flush inside a transaction() leaves the rows here
+            self._arm_timer()
+        if full:
+            self.flush()
+        return True
+
+    def _arm_timer(self):
+        # Caller holds self._lock
+        if self._timer is None:
+            self._timer = threading.Timer(self.flush_ms / 1000.0, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def pending(self):
+        with self._lock:
+            return len(self._buffer)
+
+    def flush(self):
+        """
+        Write out everything buffered. Failed rows stay buffered for the next flush.
+        Inside a caller's transaction() this does nothing: rows other threads
+        buffered must not commit or roll back with the caller's work. The
+        timer (or the next flush outside a transaction) writes them.
+        """
+        with self._lock:
+            if not self._buffer:
+                return True
+        if self.db._in_transaction():
+            return True
+
+        rows = []
+        try:
+            # Lock order is the DB transaction (the shared connection's lock in
+            # single-connection mode) first, then _flush_lock, like every writer
+            with self.db.transaction():
+                with self._flush_lock:
+                    with self._lock:
+                        rows, self._buffer = self._buffer, []
+                        if self._timer is not None:
+                            self._timer.cancel()
+                            self._timer = None
+                    if rows:
+                        self.write(rows)
+            return True
+        except Exception as e:
+            if rows:
+                with self._lock:
+                    self._buffer[:0] = rows
+                    self._arm_timer()  # retry even if nothing else is appended
+            print(f"[ERROR] Ledger flush of {len(rows)} row(s) failed; keeping them buffered: {e}")
+            return False
+
+    def write(self, entries):
+        """
+        Insert make_entry() rows and bump their monthly and daily rollups
+        in one transaction (or the caller's). Errors are raised.
+        """
+        with self.db.transaction():
+            self.db.execute_many(INSERT_ENTRY, entries)
+            self.db.execute_many(MONTHLY_ROLLUP, monthly_totals(entries))
+            self.db.execute_many(DAILY_ROLLUP, daily_totals(entries))
+
+    def get_logs(self, item_id=None, after_id=None, limit=100):
+        """
+        One page of ledger rows in id order. Pass the last id of a page as
+        after_id to get the next one (keyset pagination, no OFFSET scan).
+        """
+        self.flush()
+        clauses, params = [], []
+        if item_id is not None:
+            clauses.append("item_id = %s")
+            params.append(item_id)
+        if after_id is not None:
+            clauses.append("id > %s")
+            params.append(after_id)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        params.append(int(limit))
+        return self.db.fetch_query(
+            f"SELECT * FROM transactions {where} ORDER BY id ASC LIMIT %s", params
+        )
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
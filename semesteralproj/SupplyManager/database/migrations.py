@@ -0,0 +1,275 @@
+VERSION_TABLE = "schema_version"
+
+CREATE_VERSION_TABLE = f"""
+CREATE TABLE IF NOT EXISTS {VERSION_TABLE} (
+    version INT PRIMARY KEY,
+    description VARCHAR(255),
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+
+def _keep_latest(table, *key_columns):
+    """Delete duplicate rows per key (keeping the newest id) so a unique index can be added."""
+    keys = ", ".join(key_columns)
+    return f"""
+    DELETE FROM {table}
+    WHERE id NOT IN (
+        SELECT keep_id FROM (
+            SELECT MAX(id) AS keep_id FROM {table} GROUP BY {keys}
+        ) AS keep_rows
+    )
+    """
+
+
+# -----------------------------------------------------
+# MIGRATIONS
+# (version, description, statements) — append only, never edit an applied one.
+# Each migration ends with at most one non-idempotent statement, so a failed
+# run can simply be retried from the version that failed.
+# -----------------------------------------------------
+MIGRATIONS = [
+    (1, "base tables", [
+        """
+        CREATE TABLE IF NOT EXISTS supplies (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            sku VARCHAR(20),
+            name VARCHAR(255) NOT NULL,
+            category VARCHAR(255),
+            supplier VARCHAR(255),
+            quantity INT DEFAULT 0,
+            min_quantity INT DEFAULT 5,
+            threshold INT DEFAULT 10,
+            price DECIMAL(10,2) DEFAULT 0.00,
+            last_updated DATETIME,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS transactions (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            item_id INT,
+            type ENUM('IN','OUT'),
+            qty INT,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS monthly_reports (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            month_year VARCHAR(7),
+            item_id INT,
+            total_in INT DEFAULT 0,
+            total_out INT DEFAULT 0,
+            current_stock INT DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS stock_reconciliation (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            month_year VARCHAR(7),
+            item_id INT,
+            recorded_qty INT DEFAULT 0,
+            actual_qty INT DEFAULT 0,
+            variance INT DEFAULT 0,
+            reconciled_by VARCHAR(255),
+            notes TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS stock_requests (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            item_id INT,
+            requested_by INT,
+            quantity_requested INT,
+            reason TEXT,
+            status VARCHAR(50) DEFAULT 'pending',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at DATETIME
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS users (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            username VARCHAR(100) NOT NULL,
+            password VARCHAR(255) NOT NULL,
+            role VARCHAR(50) DEFAULT 'Staff',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+    ]),
+    (2, "index transactions(item_id, timestamp)", [
+        "CREATE INDEX idx_transactions_item_time ON transactions (item_id, timestamp)",
+    ]),
+    (3, "unique stock_reconciliation(month_year, item_id)", [
+        _keep_latest("stock_reconciliation", "month_year", "item_id"),
+        "CREATE UNIQUE INDEX uq_reconciliation_month_item ON stock_reconciliation (month_year, item_id)",
+    ]),
+    (4, "unique monthly_reports(month_year, item_id)", [
+        _keep_latest("monthly_reports", "month_year", "item_id"),
+        "CREATE UNIQUE INDEX uq_monthly_reports_month_item ON monthly_reports (month_year, item_id)",
+    ]),
+    (5, "index stock_requests(requested_by, created_at)", [
+        "CREATE INDEX idx_stock_requests_user_created ON stock_requests (requested_by, created_at)",
+    ]),
+    (6, "index supplies(last_updated)", [
+        "CREATE INDEX idx_supplies_last_updated ON supplies (last_updated)",
+    ]),
+    (7, "index supplies(name)", [
+        "CREATE INDEX idx_supplies_name ON supplies (name)",
+    ]),
+    (8, "index users(username)", [
+        "CREATE INDEX idx_users_username ON users (username)",
+    ]),
+    (9, "supplies.version row version for optimistic updates", [
+        "ALTER TABLE supplies ADD COLUMN version INT NOT NULL DEFAULT 0",
+    ]),
+    (10, "transactions.note", [
+        "ALTER TABLE transactions ADD COLUMN note VARCHAR(255)",
+    ]),
+    (11, "transactions.prev_qty", [
+        "ALTER TABLE transactions ADD COLUMN prev_qty INT",
+    ]),
+    (12, "transactions.new_qty", [
+        "ALTER TABLE transactions ADD COLUMN new_qty INT",
+    ]),
+    (13, "index transactions(item_id, id) for ledger paging", [
+        "CREATE INDEX idx_transactions_item_id ON transactions (item_id, id)",
+    ]),
+    (14, "supply_tombstones for delta sync", [
+        """
+        CREATE TABLE IF NOT EXISTS supply_tombstones (
+            supply_id INT PRIMARY KEY,
+            deleted_at DATETIME NOT NULL
+        )
+        """,
+        "CREATE INDEX idx_supply_tombstones_deleted ON supply_tombstones (deleted_at)",
+    ]),
+    (15, "index supplies(category)", [
+        "CREATE INDEX idx_supplies_category ON supplies (category)",
+    ]),
+    (16, "index supplies(sku)", [
+        "CREATE INDEX idx_supplies_sku ON supplies (sku)",
+    ]),
+    (17, "backfill monthly_reports from the ledger", [
+        # From here on every ledger write bumps these counters
+        """
+        INSERT INTO monthly_reports (month_year, item_id, total_in, total_out)
+        SELECT
+            DATE_FORMAT(timestamp, '%Y-%m'),
+            item_id,
+            SUM(CASE WHEN type='IN' THEN qty ELSE 0 END),
+            SUM(CASE WHEN type='OUT' THEN qty ELSE 0 END)
+        FROM transactions
+        WHERE timestamp IS NOT NULL
+        GROUP BY DATE_FORMAT(timestamp, '%Y-%m'), item_id
+        ON DUPLICATE KEY UPDATE
+            total_in = VALUES(total_in),
+            total_out = VALUES(total_out)
+        """,
+    ]),
+    (18, "daily_item_movements rollup table", [
+        """
+        CREATE TABLE IF NOT EXISTS daily_item_movements (
+            month_year VARCHAR(7) NOT NULL,
+            day INT NOT NULL,
+            item_id INT NOT NULL,
+            qty_in INT DEFAULT 0,
+            qty_out INT DEFAULT 0,
+            PRIMARY KEY (month_year, day, item_id)
+        )
+        """,
+    ]),
+    (19, "backfill daily_item_movements from the ledger", [
+        # From here on every ledger write bumps these counters
+        """
+        INSERT INTO daily_item_movements (month_year, day, item_id, qty_in, qty_out)
+        SELECT
+            DATE_FORMAT(timestamp, '%Y-%m'),
+            DATE_FORMAT(timestamp, '%d'),
+            item_id,
+            SUM(CASE WHEN type='IN' THEN qty ELSE 0 END),
+            SUM(CASE WHEN type='OUT' THEN qty ELSE 0 END)
+        FROM transactions
+        WHERE timestamp IS NOT NULL
+        GROUP BY DATE_FORMAT(timestamp, '%Y-%m'), DATE_FORMAT(timestamp, '%d'), item_id
+        ON DUPLICATE KEY UPDATE
+            qty_in = VALUES(qty_in),
+            qty_out = VALUES(qty_out)
+        """,
+    ]),
+    (20, "stock_snapshots month-end stock levels", [
+        """
+        CREATE TABLE IF NOT EXISTS stock_snapshots (
+            month_year VARCHAR(7) NOT NULL,
+            item_id INT NOT NULL,
+            quantity INT NOT NULL DEFAULT 0,
+            PRIMARY KEY (month_year, item_id)
+        )
+        """,
+    ]),
+    (21, "index transactions(timestamp) for stock replay", [
+        "CREATE INDEX idx_transactions_timestamp ON transactions (timestamp)",
+    ]),
+    (22, "index supplies(supplier) for prefix search", [
+        "CREATE INDEX idx_supplies_supplier ON supplies (supplier)",
+    ]),
+    (23, "supply_tombstones keep the deleted row for past-month reports", [
+        "ALTER TABLE supply_tombstones ADD COLUMN sku VARCHAR(20)",
+        "ALTER TABLE supply_tombstones ADD COLUMN name VARCHAR(255)",
+        "ALTER TABLE supply_tombstones ADD COLUMN category VARCHAR(255)",
+        "ALTER TABLE supply_tombstones ADD COLUMN supplier VARCHAR(255)",
+        "ALTER TABLE supply_tombstones ADD COLUMN min_quantity INT",
+        "ALTER TABLE supply_tombstones ADD COLUMN price DECIMAL(10,2)",
+        "ALTER TABLE supply_tombstones ADD COLUMN created_at DATETIME",
+    ]),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def schema_version(db):
+    row = db.fetch_one(f"SELECT MAX(version) AS version FROM {VERSION_TABLE}")
+    return int(row["version"] or 0) if row else 0
+
+
+def migrate(db):
+    """
+    Bring the schema up to LATEST_VERSION.
+    Only the migrations newer than the recorded version run, so a current
+    schema costs one metadata check and one SELECT at startup.
+    """
+    if not db.execute_query(CREATE_VERSION_TABLE):
+        return False
+
+    current = schema_version(db)
+    if current >= LATEST_VERSION:
+        print(f"[OK] Schema is current (version {current}).")
+        return True
+
+    for version, description, statements in MIGRATIONS:
+        if version <= current:
+            continue
+        print(f"Applying migration {version}: {description}...")
+        # The version row commits together with the migration's statements,
+        # so a failed step is retried as a whole on the next start. (MySQL
+        # commits DDL on its own; data-only steps and SQLite stay atomic.)
+        try:
+            with db.transaction():
+                for statement in statements:
+                    if not db.execute_query(statement):
+                        raise RuntimeError("statement failed")
+                if not db.execute_query(
+                    f"INSERT INTO {VERSION_TABLE} (version, description) VALUES (%s, %s)",
+                    (version, description)
+                ):
+                    raise RuntimeError("could not record the schema version")
+        except Exception as e:
+            print(f"[ERROR] Migration {version} failed ({e}); schema left at version {current}.")
+            return False
+        current = version
+
+    print(f"[OK] Schema migrated to version {current}.")
+    return True
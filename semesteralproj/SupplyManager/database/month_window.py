@@ -0,0 +1,35 @@
+import datetime
+
+
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def month_start(month_year):
+    """'2025-01' -> datetime(2025, 1, 1)"""
+    return datetime.datetime.strptime(month_year, "%Y-%m")
+
+
+def shift_month(month_year, months):
+    """Move a 'YYYY-MM' key by a number of months, e.g. ('2025-01', -1) -> '2024-12'."""
+    start = month_start(month_year)
+    index = start.year * 12 + (start.month - 1) + months
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+def month_bounds(month_year):
+    """
+    Half-open window [start, next_month) for a 'YYYY-MM' key,
+    as strings the DB can compare against DATETIME columns.
+    """
+    start = month_start(month_year)
+    end = month_start(shift_month(month_year, 1))
+    return start.strftime(DATETIME_FORMAT), end.strftime(DATETIME_FORMAT)
+
+
+def month_window(column, month_year):
+    """
+    Range predicate for one month on a datetime column.
+    Returns (sql, params) → ("col >= %s AND col < %s", (start, end)),
+    which MySQL can answer with an index range scan.
+    """
+    return f"{column} >= %s AND {column} < %s", month_bounds(month_year)
@@ -0,0 +1,90 @@
+import re
+import time
+import threading
+from collections import OrderedDict
+
+
+_TABLE_REF = re.compile(r"\b(?:FROM|JOIN|INTO|UPDATE|TABLE)\s+`?(\w+)", re.I)
+_UNCACHEABLE = re.compile(r"\b(?:NOW|RAND|UUID|CURDATE|CURRENT_DATE|CURRENT_TIMESTAMP)\b", re.I)
+
+
+def tables_in(query):
+    """Lower-cased names of the tables a statement reads or writes."""
+    return {name.lower() for name in _TABLE_REF.findall(query)}
+
+
+def is_cacheable(query):
+    """Only plain, deterministic SELECTs are cached."""
+    return query.lstrip().upper().startswith("SELECT") and not _UNCACHEABLE.search(query)
+
+
+class QueryCache:
+    """
+    Bounded LRU of read results keyed by (normalized SQL, params).
+    Each entry remembers the tables it read; a write to any of those
+    tables made through this process drops it. Writes from other clients
+    are never seen, so entries also expire after ttl seconds; `tables`,
+    when given, limits caching to reads of those tables only.
+    """
+
+    def __init__(self, max_entries=256, ttl=5.0, tables=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.tables = {t.lower() for t in tables} if tables is not None else None
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()   # key -> (value, tables, expires_at)
+        self._generations = {}          # table -> bumped on every invalidation
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(query, params):
+        return " ".join(query.split()), tuple(params or ())
+
+    def allows(self, tables):
+        """True when every table a read touches may be cached."""
+        return self.tables is None or (bool(tables) and tables <= self.tables)
+
+    def get(self, key):
+        """(True, value) on a hit, (False, generation snapshot) on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, entry[0]
+            if entry is not None:
+                del self._entries[key]  # expired
+            self.misses += 1
+            return False, dict(self._generations)
+
+    def put(self, key, value, tables, snapshot):
+        """
+        Store a result read while the generations were `snapshot`.
+        If one of its tables was written meanwhile the result may be stale,
+        so it is not stored.
+        """
+        with self._lock:
+            if any(self._generations.get(t, 0) != snapshot.get(t, 0) for t in tables):
+                return
+            self._entries[key] = (value, tables, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, tables):
+        tables = set(tables)
+        if not tables:
+            return
+        with self._lock:
+            for table in tables:
+                self._generations[table] = self._generations.get(table, 0) + 1
+            stale = [k for k, (_, deps, _) in self._entries.items() if deps & tables]
+            for k in stale:
+                del self._entries[k]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            for table in self._generations:
+                self._generations[table] += 1
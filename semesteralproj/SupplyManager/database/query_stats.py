@@ -0,0 +1,88 @@
+import re
+import threading
+from collections import deque
+
+
+_LITERALS = re.compile(r"'(?:[^'\\]|\\.)*'|\b\d+(?:\.\d+)?\b")
+
+
+def fingerprint(query):
+    """
+    Normalize a statement so calls that differ only in values group together:
+    literals and %s placeholders become ?, whitespace is collapsed.
+    """
+    sql = _LITERALS.sub("?", query).replace("%s", "?")
+    return " ".join(sql.split())
+
+
+def _percentile(sorted_samples, q):
+    if not sorted_samples:
+        return 0.0
+    return sorted_samples[int(round(q * (len(sorted_samples) - 1)))]
+
+
+class _Entry:
+    __slots__ = ("calls", "total_ms", "max_ms", "rows", "slow", "samples")
+
+    def __init__(self, sample_size):
+        self.calls = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+        self.slow = 0
+        self.samples = deque(maxlen=sample_size)  # recent latencies for percentiles
+
+
+class QueryStats:
+    """
+    Per-fingerprint call counts, latency (total / p50 / p95 / p99 / max) and
+    rows, plus a slow-query log for statements over slow_query_ms.
+    """
+
+    def __init__(self, slow_query_ms=None, sample_size=1000):
+        self.slow_query_ms = slow_query_ms
+        self.sample_size = sample_size
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def record(self, query, elapsed_ms, rows=0):
+        key = fingerprint(query)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Entry(self.sample_size)
+            entry.calls += 1
+            entry.total_ms += elapsed_ms
+            entry.max_ms = max(entry.max_ms, elapsed_ms)
+            entry.rows += rows
+            entry.samples.append(elapsed_ms)
+            slow = self.slow_query_ms is not None and elapsed_ms >= self.slow_query_ms
+            if slow:
+                entry.slow += 1
+        if slow:
+            print(f"[SLOW QUERY] {elapsed_ms:.1f} ms, {rows} row(s): {key}")
+
+    def snapshot(self):
+        """List of per-fingerprint stats, most total time first."""
+        with self._lock:
+            items = [(key, entry, sorted(entry.samples)) for key, entry in self._entries.items()]
+        result = []
+        for key, entry, samples in items:
+            result.append({
+                "query": key,
+                "calls": entry.calls,
+                "total_ms": round(entry.total_ms, 3),
+                "avg_ms": round(entry.total_ms / entry.calls, 3),
+                "p50_ms": round(_percentile(samples, 0.50), 3),
+                "p95_ms": round(_percentile(samples, 0.95), 3),
+                "p99_ms": round(_percentile(samples, 0.99), 3),
+                "max_ms": round(entry.max_ms, 3),
+                "rows": entry.rows,
+                "slow": entry.slow,
+            })
+        result.sort(key=lambda r: r["total_ms"], reverse=True)
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,157 @@
+from datetime import datetime
+
+from .month_window import DATETIME_FORMAT, month_bounds, shift_month
+
+
+NET_QTY = "SUM(CASE WHEN type='IN' THEN qty ELSE -qty END)"
+
+# Every item as of now: live rows, plus items deleted at or after the
+# parameter with no stock left (their deletion logged the rest as OUT)
+ITEMS = """
+    SELECT id AS item_id, quantity, created_at FROM supplies
+    UNION ALL
+    SELECT supply_id, 0, created_at FROM supply_tombstones WHERE deleted_at >= %s
+"""
+
+# Stock at the end of a month = today's quantity minus everything that moved since
+CAPTURE_SNAPSHOT = f"""
+INSERT INTO stock_snapshots (month_year, item_id, quantity)
+SELECT %s, i.item_id, i.quantity - COALESCE(m.net_qty, 0)
+FROM ({ITEMS}) i
+LEFT JOIN (
+    SELECT item_id, {NET_QTY} AS net_qty
+    FROM transactions
+    WHERE timestamp >= %s
+    GROUP BY item_id
+) m ON m.item_id = i.item_id
+WHERE i.created_at IS NULL OR i.created_at < %s
+ON DUPLICATE KEY UPDATE
+    quantity = VALUES(quantity)
+"""
+
+
+def _timestamp(when):
+    if isinstance(when, datetime):
+        return when.strftime(DATETIME_FORMAT)
+    return str(when)
+
+
+class StockHistory:
+    """
+    Point-in-time stock levels.
+    stock_snapshots holds every item's quantity at each month end. stock_at(T)
+    starts from the snapshot nearest to T and replays only the transactions
+    between the two, so at most about a month of ledger is read however long
+    the history gets.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self._checked = None  # last closed month known to have a snapshot
+
+    def capture(self, month_year):
+        """(Re)write the snapshot for the end of month_year. Returns success."""
+        _, end = month_bounds(month_year)
+        self.db.ledger.flush()
+        return self.db.execute_query(CAPTURE_SNAPSHOT, (month_year, end, end, end))
+
+    def ensure_snapshots(self, now=None):
+        """
+        Capture every closed month after the newest snapshot. The first run
+        only captures last month; older months are replayed back from it.
+        """
+        last_closed = shift_month((now or datetime.now()).strftime("%Y-%m"), -1)
+        if self._checked == last_closed:
+            return True
+
+        row = self.db.fetch_one("SELECT MAX(month_year) AS month_year FROM stock_snapshots")
+        latest = row.get("month_year") if row else None
+        month = shift_month(latest, 1) if latest else last_closed
+        while month <= last_closed:
+            if not self.capture(month):
+                print(f"[ERROR] Stock snapshot for {month} failed.")
+                return False
+            month = shift_month(month, 1)
+        self._checked = last_closed
+        return True
+
+    def stock_at(self, when):
+        """
+        {item_id: quantity} at a moment (datetime or 'YYYY-MM-DD HH:MM:SS').
+        Items created after it are left out; deleted items still show up
+        for the months they existed in.
+        """
+        when = _timestamp(when)
+        self.ensure_snapshots()
+        self.db.ledger.flush()
+
+        # Newest snapshot at or before `when`: replay forward from it
+        row = self.db.fetch_one(
+            "SELECT MAX(month_year) AS month_year FROM stock_snapshots WHERE month_year < %s",
+            (when[:7],)
+        )
+        if row and row.get("month_year"):
+            _, start = month_bounds(row["month_year"])
+            stock = self._snapshot(row["month_year"])
+            if start < when:
+                for item_id, net in self._net_movements(start, when).items():
+                    stock[item_id] = stock.get(item_id, 0) + net
+            return stock
+
+        # Otherwise replay backward from the oldest snapshot, or from live stock
+        row = self.db.fetch_one("SELECT MIN(month_year) AS month_year FROM stock_snapshots")
+        if row and row.get("month_year"):
+            _, end = month_bounds(row["month_year"])
+            # Items deleted between `when` and the snapshot are not in it
+            rows = self.db.fetch_query("""
+                SELECT sn.item_id, sn.quantity
+                FROM stock_snapshots sn
+                LEFT JOIN supplies s ON s.id = sn.item_id
+                LEFT JOIN supply_tombstones t ON t.supply_id = sn.item_id
+                WHERE sn.month_year = %s
+                  AND (COALESCE(s.created_at, t.created_at) IS NULL
+                       OR COALESCE(s.created_at, t.created_at) < %s)
+                UNION ALL
+                SELECT supply_id, 0 FROM supply_tombstones
+                WHERE deleted_at >= %s AND deleted_at < %s
+                  AND (created_at IS NULL OR created_at < %s)
+            """, (row["month_year"], when, when, end, when))
+            net = self._net_movements(when, end)
+        else:
+            rows = self.db.fetch_query(f"""
+                SELECT item_id, quantity FROM ({ITEMS}) i
+                WHERE i.created_at IS NULL OR i.created_at < %s
+            """, (when, when))
+            net = self._net_movements(when)
+        return {
+            int(r["item_id"]): int(r["quantity"] or 0) - net.get(int(r["item_id"]), 0)
+            for r in rows or []
+        }
+
+    def month_end_stock(self, month_year, now=None):
+        """{item_id: quantity} at the end of month_year; the open month is today's stock."""
+        _, end = month_bounds(month_year)
+        if end > _timestamp(now or datetime.now()):
+            rows = self.db.fetch_query("SELECT id AS item_id, quantity FROM supplies")
+            return {int(r["item_id"]): int(r["quantity"] or 0) for r in rows or []}
+        return self.stock_at(end)
+
+    def _snapshot(self, month_year):
+        rows = self.db.fetch_query(
+            "SELECT item_id, quantity FROM stock_snapshots WHERE month_year = %s", (month_year,)
+        )
+        return {int(r["item_id"]): int(r["quantity"] or 0) for r in rows or []}
+
+    def _net_movements(self, start, end=None):
+        """{item_id: IN - OUT} for transactions in [start, end)."""
+        clauses, params = ["timestamp >= %s"], [start]
+        if end is not None:
+            clauses.append("timestamp < %s")
+            params.append(end)
+        rows = self.db.fetch_query(f"""
+            SELECT item_id, {NET_QTY} AS net_qty
+            FROM transactions
+            WHERE {' AND '.join(clauses)}
+            GROUP BY item_id
+        """, params)
+        return {int(r["item_id"]): int(r["net_qty"] or 0) for r in rows or []}
@@ -19,10 +19,18 @@ from PyQt6.QtWidgets import QApplication
 
 # ---------- DATABASE CONFIG ----------
 db_config = {
+    "backend": "mysql",  # or "sqlite" with "database": "supply.db" (no server needed)
     "host": "localhost",
     "user": "root",
     "password": "",
-    "database": "supply_db"
+    "database": "supply_db",
+    "pool_size": 5,  # 0 = one shared connection
+    "slow_query_ms": 200,  # print statements slower than this
+    # Cached SELECT results (0 = off). Other clients' writes only show up once an
+    # entry expires, so enable it per table: "query_cache_tables": ["supplies"]
+    "query_cache_size": 0,
+    "query_cache_ttl": 5,  # seconds
+    "report_cache_dir": os.path.join(current_dir, "report_cache"),  # closed-month reports
 }
 
 try:
@@ -30,13 +38,16 @@ try:
     print("Initializing DatabaseManager...")
     db_manager = DatabaseManager(db_config)
     if not db_manager.connected:
-        print("[ERROR] Database connection failed. Check MySQL service.")
+        print("[ERROR] Database connection failed. Check the database service.")
         sys.exit(1)
     print("[OK] Database connected successfully.")
 
-    # Create tables if not existing
+    # Create/upgrade tables (skipped when the schema is current)
     db_manager.create_tables()
 
+    # Month-end stock snapshots for any month closed since the last run
+    db_manager.capture_stock_snapshots()
+
     # Ensure default admin exists
     existing_admin = db_manager.fetch_one(
         "SELECT * FROM users WHERE username=%s",
@@ -54,7 +65,7 @@ try:
 
     # Initialize SupplyManager
     print("Initializing SupplyManager...")
-    supply_manager = SupplyManager(db_manager)
+    supply_manager = SupplyManager(db_manager, use_catalog=True)
 
     # -----------------------------
     # OPEN LOGIN PAGE FIRST
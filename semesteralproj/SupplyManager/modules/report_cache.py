@@ -0,0 +1,135 @@
+import os
+import json
+import pathlib
+import threading
+from datetime import date
+
+
+def current_month():
+    return date.today().strftime("%Y-%m")
+
+
+class ReportCache:
+    """
+    Report data per 'YYYY-MM', built by load(month_year) into a JSON-safe dict.
+    Closed months no longer change, so they are kept in memory and, when a
+    directory is given, as one JSON file each. The open month is only kept
+    in memory until invalidate() drops it after a write.
+    load() must raise when it cannot read the data: the error then reaches
+    the caller of get() and nothing is cached for that month.
+    Only one load per month runs at a time: get() waits for one already in
+    flight and reuses its result.
+    Bump `version` whenever the shape of load()'s result changes.
+    """
+
+    def __init__(self, load, directory=None, version=1, today=current_month):
+        self.load = load
+        self.directory = pathlib.Path(directory) if directory else None
+        self.version = version
+        self.today = today
+        self._memory = {}
+        self._loading = {}  # month -> Event set when its load ends
+        self._generation = {}  # month -> invalidate() count
+        self._lock = threading.Lock()
+
+    def is_closed(self, month_year):
+        return month_year < self.today()
+
+    def cached(self, month_year):
+        with self._lock:
+            return month_year in self._memory
+
+    def get(self, month_year):
+        """Cached data for a month; loads (and stores) it on a miss."""
+        while True:
+            with self._lock:
+                if month_year in self._memory:
+                    return self._memory[month_year]
+                in_flight = self._loading.get(month_year)
+                if in_flight is None:
+                    done = self._loading[month_year] = threading.Event()
+                    generation = self._generation.get(month_year, 0)
+                    break
+            # Another thread is loading it; if that load fails or goes stale
+            # the month is still missing and this thread loads it itself
+            in_flight.wait()
+
+        try:
+            data = self._read(month_year) if self.is_closed(month_year) else None
+            if data is None:
+                data = self.load(month_year)
+                fresh = True
+            else:
+                fresh = False
+            with self._lock:
+                # invalidate() during the load: the data may predate the write
+                current = self._generation.get(month_year, 0) == generation
+                if current:
+                    self._memory[month_year] = data
+            if current and fresh and self.is_closed(month_year):
+                self._write(month_year, data)
+            return data
+        finally:
+            with self._lock:
+                del self._loading[month_year]
+            done.set()
+
+    def prefetch(self, months):
+        """Load the given months on a background thread; already cached ones are skipped."""
+        with self._lock:
+            todo = [m for m in months
+                    if m <= self.today() and m not in self._memory and m not in self._loading]
+        if not todo:
+            return None
+
+        def run():
+            for month_year in todo:
+                try:
+                    self.get(month_year)
+                except Exception as e:
+                    print(f"[WARNING] Prefetch of report {month_year} failed: {e}")
+
+        worker = threading.Thread(target=run, daemon=True)
+        worker.start()
+        return worker
+
+    def invalidate(self, month_year=None):
+        """
+        Forget one month (default: the open one) so the next get() reloads it.
+        A load already running for it finishes but its result is not kept.
+        """
+        month_year = month_year or self.today()
+        with self._lock:
+            self._memory.pop(month_year, None)
+            self._generation[month_year] = self._generation.get(month_year, 0) + 1
+
+    # -----------------------------------------------------
+    # DISK
+    # -----------------------------------------------------
+    def _path(self, month_year):
+        return self.directory / f"report-{month_year}.v{self.version}.json"
+
+    def _read(self, month_year):
+        if self.directory is None:
+            return None
+        try:
+            with open(self._path(month_year), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"[WARNING] Ignoring unreadable report cache for {month_year}: {e}")
+            return None
+
+    def _write(self, month_year, data):
+        if self.directory is None:
+            return
+        path = self._path(month_year)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, path)  # readers never see a half-written file
+        except OSError as e:
+            print(f"[WARNING] Could not save report cache for {month_year}: {e}")
@@ -0,0 +1,15 @@
+from PyQt6.QtCore import QObject, pyqtSignal
+
+
+class SupplyEvents(QObject):
+    """
+    Change notifications emitted by SupplyManager after a write commits.
+    created / updated carry the supply row (dict), deleted carries its id.
+    reset means many rows changed at once (bulk APIs): reload everything.
+    Signals emitted from a worker thread are delivered on the receiver's thread.
+    """
+
+    created = pyqtSignal(dict)
+    updated = pyqtSignal(dict)
+    deleted = pyqtSignal(int)
+    reset = pyqtSignal()
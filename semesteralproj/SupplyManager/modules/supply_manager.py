@@ -1,8 +1,381 @@
+import time
+import threading
+from array import array
 from datetime import datetime
 
+try:
+    import numpy as np  # optional: vectorized SupplySnapshot math
+except ImportError:
+    np = None
+
+try:
+    from ..database.ledger import make_entry
+    from ..database.month_window import month_bounds, month_window
+except ImportError:
+    from database.ledger import make_entry
+    from database.month_window import month_bounds, month_window
+
+try:
+    from .supply_events import SupplyEvents
+except ImportError:
+    from modules.supply_events import SupplyEvents
+
+
+INSERT_SUPPLY = """
+    INSERT INTO supplies (sku, name, category, supplier, quantity, min_quantity, price, last_updated)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+"""
+
+
+# Run before the DELETE: the tombstone keeps the row's details, so months
+# in which the item still existed can show it after it is gone.
+TOMBSTONE = """
+    INSERT INTO supply_tombstones
+        (supply_id, deleted_at, sku, name, category, supplier, min_quantity, price, created_at)
+    SELECT id, %s, sku, name, category, supplier, min_quantity, price, created_at
+    FROM supplies WHERE id IN ({ids})
+    ON DUPLICATE KEY UPDATE
+        deleted_at = VALUES(deleted_at), sku = VALUES(sku), name = VALUES(name),
+        category = VALUES(category), supplier = VALUES(supplier),
+        min_quantity = VALUES(min_quantity), price = VALUES(price), created_at = VALUES(created_at)
+"""
+
+
+SELECT_ALL = "SELECT * FROM supplies ORDER BY id ASC"
+
+
+# Columns query_supplies() may sort by
+SORT_COLUMNS = ("id", "name", "sku", "category", "quantity", "price", "last_updated")
+
+
+def _now():
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _insert_params(name, category, supplier, quantity, price, sku=None, min_quantity=5, now=None):
+    if not name:
+        raise ValueError("name is required")
+    if not sku:
+        sku = f"{name[:3].upper()}-{int(quantity):04d}"
+    return (sku, name, category, supplier, int(quantity), int(min_quantity), float(price), now or _now())
+
+
+def _like_prefix(text):
+    """LIKE pattern (ESCAPE '!') for values starting with text; % and _ in text match literally."""
+    return text.replace("!", "!!").replace("%", "!%").replace("_", "!_") + "%"
+
+
+def _norm(text):
+    """Key used by the catalog's name / SKU / category indexes."""
+    return str(text).strip().casefold() if text is not None else ""
+
+
+class SupplyCatalog:
+    """
+    In-process copy of the supplies table with hash indexes by id,
+    normalized name, SKU and category, so lookups don't touch the DB.
+    Rows are held as Supply records; lookups hand out dict copies.
+    `watermark` is the newest last_updated seen; rows changed at or after
+    it are what a refresh has to fetch.
+    """
+
+    def __init__(self):
+        self.by_id = {}         # id -> Supply
+        self.by_name = {}       # normalized name -> {ids}
+        self.by_sku = {}        # normalized sku -> {ids}
+        self.by_category = {}   # normalized category -> {ids}
+        self.watermark = None
+        self.loaded = False
+        self.checked_at = 0.0
+        self._snapshot = None   # SupplySnapshot of by_id, until the next change
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _index_add(index, key, supply_id):
+        if key:
+            index.setdefault(key, set()).add(supply_id)
+
+    @staticmethod
+    def _index_remove(index, key, supply_id):
+        ids = index.get(key)
+        if ids:
+            ids.discard(supply_id)
+            if not ids:
+                del index[key]
+
+    def load(self, rows):
+        with self._lock:
+            self.by_id.clear()
+            self.by_name.clear()
+            self.by_sku.clear()
+            self.by_category.clear()
+            self.watermark = None
+            self._snapshot = None
+            for row in rows:
+                self.put(row)
+            self.loaded = True
+            self.checked_at = time.monotonic()
+
+    def put(self, row):
+        with self._lock:
+            supply = Supply.from_row(row)
+            supply_id = supply.id
+            self.remove(supply_id)
+            self.by_id[supply_id] = supply
+            self._snapshot = None
+            self._index_add(self.by_name, _norm(supply.name), supply_id)
+            self._index_add(self.by_sku, _norm(supply.sku), supply_id)
+            self._index_add(self.by_category, _norm(supply.category), supply_id)
+            stamp = supply.last_updated
+            if stamp is not None and (self.watermark is None or str(stamp) > str(self.watermark)):
+                self.watermark = stamp
+
+    def remove(self, supply_id):
+        with self._lock:
+            supply = self.by_id.pop(supply_id, None)
+            if supply is None:
+                return
+            self._snapshot = None
+            self._index_remove(self.by_name, _norm(supply.name), supply_id)
+            self._index_remove(self.by_sku, _norm(supply.sku), supply_id)
+            self._index_remove(self.by_category, _norm(supply.category), supply_id)
+
+    def _first(self, index, key):
+        ids = index.get(_norm(key))
+        return self.by_id[min(ids)].to_dict() if ids else None
+
+    def get(self, supply_id):
+        with self._lock:
+            supply = self.by_id.get(supply_id)
+            return supply.to_dict() if supply else None
+
+    def find_name(self, name):
+        with self._lock:
+            return self._first(self.by_name, name)
+
+    def find_sku(self, sku):
+        with self._lock:
+            return self._first(self.by_sku, sku)
+
+    def in_category(self, category):
+        with self._lock:
+            ids = self.by_category.get(_norm(category), ())
+            return [self.by_id[i].to_dict() for i in sorted(ids)]
+
+    def all(self):
+        with self._lock:
+            return [self.by_id[i].to_dict() for i in sorted(self.by_id)]
+
+    def snapshot(self):
+        """SupplySnapshot of every row, built from the records once per change."""
+        with self._lock:
+            if self._snapshot is None:
+                self._snapshot = SupplySnapshot(self.by_id[i] for i in sorted(self.by_id))
+            return self._snapshot
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def versions(self):
+        """Sum of the row versions, compared with the table's by refresh_catalog()."""
+        with self._lock:
+            return sum(supply.version for supply in self.by_id.values())
+
+
+class Supply:
+    """One supplies row as a slotted record (no per-row __dict__)."""
+
+    __slots__ = ("id", "sku", "name", "category", "supplier", "quantity",
+                 "min_quantity", "threshold", "price", "last_updated", "created_at", "version")
+
+    # Column order of tuple rows, as in SupplyManager._to_dict
+    _TUPLE_ORDER = ("id", "sku", "name", "category", "supplier", "quantity",
+                    "min_quantity", "price", "last_updated", "created_at")
+
+    def __init__(self, id, sku=None, name="", category=None, supplier=None, quantity=0,
+                 min_quantity=5, price=0.0, last_updated=None, created_at=None, version=0,
+                 threshold=10):
+        self.id = id
+        self.sku = sku
+        self.name = name
+        self.category = category
+        self.supplier = supplier
+        self.quantity = int(quantity or 0)
+        self.min_quantity = int(min_quantity if min_quantity is not None else 5)
+        self.threshold = int(threshold if threshold is not None else 10)
+        self.price = float(price or 0.0)
+        self.last_updated = last_updated
+        self.created_at = created_at
+        self.version = int(version or 0)
+
+    @classmethod
+    def from_row(cls, row):
+        if isinstance(row, cls):
+            return row
+        if not isinstance(row, dict):
+            row = dict(zip(cls._TUPLE_ORDER, row))
+        return cls(**{field: row[field] for field in cls.__slots__ if field in row})
+
+    @property
+    def value(self):
+        return self.quantity * self.price
+
+    @property
+    def low_stock(self):
+        return self.quantity <= self.min_quantity
+
+    def get(self, key, default=None):
+        """dict-style access, so code written for row dicts keeps working"""
+        return getattr(self, key, default) if key in self.__slots__ else default
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in self.__slots__}
+
+    def __repr__(self):
+        return f"Supply(id={self.id!r}, name={self.name!r}, quantity={self.quantity})"
+
+
+class SupplySnapshot:
+    """
+    Columnar copy of the supply fields that cards and charts aggregate:
+    quantity / min_quantity / price live in typed arrays (8 bytes a value),
+    categories are stored once and referenced by code. With NumPy installed
+    the aggregations are vectorized over the same buffers, otherwise they
+    are plain loops over the arrays.
+    """
+
+    def __init__(self, rows=()):
+        self.ids = array("q")
+        self.names = []
+        self.quantity = array("q")
+        self.min_quantity = array("q")
+        self.price = array("d")
+        self.category_codes = array("l")
+        self.categories = []    # code -> category name
+        codes = {}
+        for row in rows:
+            supply = Supply.from_row(row)
+            self.ids.append(int(supply.id))
+            self.names.append(supply.name)
+            self.quantity.append(supply.quantity)
+            self.min_quantity.append(supply.min_quantity)
+            self.price.append(supply.price)
+            code = codes.get(supply.category)
+            if code is None:
+                code = codes[supply.category] = len(self.categories)
+                self.categories.append(supply.category)
+            self.category_codes.append(code)
+
+    def __len__(self):
+        return len(self.ids)
+
+    @staticmethod
+    def _np(column):
+        return np.frombuffer(column, dtype=np.float64 if column.typecode == "d" else np.int64)
+
+    def _vectorized(self):
+        return np is not None and len(self) > 0
+
+    def values(self):
+        """quantity * price per row"""
+        if self._vectorized():
+            return self._np(self.quantity) * self._np(self.price)
+        return array("d", (q * p for q, p in zip(self.quantity, self.price)))
+
+    def total_items(self):
+        if self._vectorized():
+            return int(self._np(self.quantity).sum())
+        return sum(self.quantity)
+
+    def total_value(self):
+        if self._vectorized():
+            return float(self.values().sum())
+        return float(sum(self.values()))
+
+    def low_stock_mask(self):
+        if self._vectorized():
+            return self._np(self.quantity) <= self._np(self.min_quantity)
+        return [q <= m for q, m in zip(self.quantity, self.min_quantity)]
+
+    def low_stock_count(self):
+        mask = self.low_stock_mask()
+        return int(mask.sum()) if self._vectorized() else sum(mask)
+
+    def category_sums(self, column="quantity"):
+        """{category: total} of "quantity" or "value" per category, in first-seen order"""
+        weights = self.values() if column == "value" else self.quantity
+        if self._vectorized():
+            codes = np.frombuffer(self.category_codes, dtype=np.dtype(f"i{self.category_codes.itemsize}"))
+            weights = weights if column == "value" else self._np(weights)
+            totals = np.bincount(codes, weights=weights, minlength=len(self.categories))
+            cast = float if column == "value" else int
+            return {cat: cast(totals[code]) for code, cat in enumerate(self.categories)}
+        totals = [0] * len(self.categories)
+        for code, weight in zip(self.category_codes, weights):
+            totals[code] += weight
+        return dict(zip(self.categories, totals))
+
+
 class SupplyManager:
-    def __init__(self, db):
+    def __init__(self, db, use_catalog=False, catalog_ttl=5.0):
+        """
+        use_catalog=True serves supply lookups from an in-memory SupplyCatalog,
+        re-checked against the DB at most every catalog_ttl seconds.
+        Pages subscribe to self.events (SupplyEvents) to patch single rows.
+        """
         self.db = db
+        self.catalog = SupplyCatalog() if use_catalog else None
+        self.catalog_ttl = catalog_ttl
+        self.events = SupplyEvents()
+
+    # -----------------------------------------------------
+    # CATALOG
+    # -----------------------------------------------------
+    def refresh_catalog(self, force=False):
+        """
+        Bring the catalog up to date: a full load the first time (or when
+        forced), afterwards only the delta from get_supplies_since(watermark).
+        Every write bumps version, so a row count or version sum that differs
+        from the table's means a change the delta missed (a delete without a
+        tombstone, a write that kept last_updated) → full reload.
+        These reads bypass the query result cache.
+        """
+        catalog = self.catalog
+        if catalog is None:
+            return
+        if force or not catalog.loaded:
+            catalog.load(self.db.fetch_all(SELECT_ALL, use_cache=False) or [])
+            return
+
+        if catalog.watermark is not None:
+            delta = self.get_supplies_since(catalog.watermark, use_cache=False)
+            for row in delta["changed"]:
+                catalog.put(row)
+            for supply_id in delta["deleted"]:
+                catalog.remove(supply_id)
+
+        table = self.db.fetch_one("""
+            SELECT COUNT(*) AS n, COALESCE(SUM(version), 0) AS versions,
+                   MAX(last_updated) AS newest
+            FROM supplies
+        """, use_cache=False)
+        if table is not None and (
+            int(table["n"]) != len(catalog)
+            or int(table["versions"]) != catalog.versions()
+            or (table["newest"] is not None and str(table["newest"]) > str(catalog.watermark))
+        ):
+            catalog.load(self.db.fetch_all(SELECT_ALL, use_cache=False) or [])
+        else:
+            catalog.checked_at = time.monotonic()
+
+    def _catalog(self):
+        """The catalog, revalidated if older than catalog_ttl, or None when disabled."""
+        catalog = self.catalog
+        if catalog is None:
+            return None
+        if not catalog.loaded or time.monotonic() - catalog.checked_at >= self.catalog_ttl:
+            self.refresh_catalog()
+        return catalog
 
     # -----------------------------------------------------
     # SUPPLIES
@@ -26,47 +399,563 @@ class SupplyManager:
         }
 
     def get_supplies(self):
+        catalog = self._catalog()
+        if catalog is not None:
+            return catalog.all()
         rows = self.db.fetch_all("SELECT * FROM supplies ORDER BY id ASC")
         return rows  # Already dict format from DatabaseManager
 
+    def get_supplies_since(self, watermark=None, use_cache=True):
+        """
+        What changed since `watermark` (a last_updated value from an earlier call):
+        {"changed": rows with last_updated >= watermark,
+         "deleted": ids deleted since then (from supply_tombstones),
+         "watermark": value to pass next time}.
+        No watermark returns every row. Rows stamped in the same second as
+        the watermark come back again, so applying a delta twice is harmless.
+        """
+        if watermark is None:
+            changed = self.db.fetch_all(SELECT_ALL, use_cache=use_cache) or []
+            deleted = []
+        else:
+            watermark = str(watermark)
+            changed = self.db.fetch_all(
+                "SELECT * FROM supplies WHERE last_updated >= %s ORDER BY id ASC", (watermark,),
+                use_cache=use_cache
+            ) or []
+            deleted = self.db.fetch_all(
+                "SELECT supply_id, deleted_at FROM supply_tombstones WHERE deleted_at >= %s",
+                (watermark,), use_cache=use_cache
+            ) or []
+
+        stamps = [str(row["last_updated"]) for row in changed if row.get("last_updated") is not None]
+        stamps += [str(row["deleted_at"]) for row in deleted]
+        if watermark is not None:
+            stamps.append(watermark)
+        return {
+            "changed": changed,
+            "deleted": [int(row["supply_id"]) for row in deleted],
+            "watermark": max(stamps) if stamps else None,
+        }
+
+    # -----------------------------------------------------
+    # LISTING (server-side filter / sort / page)
+    # -----------------------------------------------------
+    def query_supplies(self, text=None, category=None, low_stock_only=False, sort="id",
+                       descending=False, offset=0, after=None, limit=100):
+        """
+        One page of supplies, filtered and sorted by the DB.
+          text            prefix of name, SKU or supplier (case-insensitive)
+          category        exact category
+          low_stock_only  quantity <= min_quantity
+          sort            one of SORT_COLUMNS (ties broken by id)
+          after           keyset cursor: "next_after" of the previous page
+          offset          plain OFFSET paging, used when after is None
+        Returns {"rows": [...], "next_after": cursor or None, "next_offset": int or None};
+        both next values are None on the last page.
+        Keyset paging expects a sort column without NULLs (id, name, quantity, price).
+        """
+        if sort not in SORT_COLUMNS:
+            raise ValueError(f"Cannot sort supplies by {sort!r}")
+        direction, compare = ("DESC", "<") if descending else ("ASC", ">")
+
+        clauses, params = [], []
+        text = (text or "").strip()
+        if text:
+            # Prefix patterns can range-scan the name / sku / supplier indexes
+            pattern = _like_prefix(text)
+            clauses.append("(name LIKE %s ESCAPE '!' OR sku LIKE %s ESCAPE '!' OR supplier LIKE %s ESCAPE '!')")
+            params += [pattern, pattern, pattern]
+        if category:
+            clauses.append("category = %s")
+            params.append(category)
+        if low_stock_only:
+            clauses.append("quantity <= min_quantity")
+        if after is not None:
+            last_value, last_id = after
+            if sort == "id":
+                clauses.append(f"id {compare} %s")
+                params.append(last_id)
+            else:
+                clauses.append(f"({sort} {compare} %s OR ({sort} = %s AND id {compare} %s))")
+                params += [last_value, last_value, last_id]
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        order = "id " + direction if sort == "id" else f"{sort} {direction}, id {direction}"
+        # One extra row tells whether another page exists
+        query = f"SELECT * FROM supplies {where} ORDER BY {order} LIMIT %s"
+        params.append(int(limit) + 1)
+        if after is None and offset:
+            query += " OFFSET %s"
+            params.append(int(offset))
+
+        rows = self.db.fetch_all(query, params) or []
+        more = len(rows) > limit
+        rows = rows[:limit]
+        last = rows[-1] if rows else None
+        return {
+            "rows": rows,
+            "next_after": (last[sort], last["id"]) if more and last else None,
+            "next_offset": (int(offset or 0) + len(rows)) if more and after is None else None,
+        }
+
+    def get_snapshot(self):
+        """
+        SupplySnapshot of every supply (from the catalog when enabled).
+        The catalog's snapshot is shared until its next change: read-only.
+        """
+        catalog = self._catalog()
+        if catalog is not None:
+            return catalog.snapshot()
+        return SupplySnapshot(self.db.fetch_all(
+            "SELECT id, name, category, quantity, min_quantity, price FROM supplies ORDER BY id ASC"
+        ) or [])
+
+    def get_categories(self):
+        rows = self.db.fetch_all(
+            "SELECT DISTINCT category FROM supplies WHERE category IS NOT NULL ORDER BY category"
+        ) or []
+        return [row["category"] for row in rows]
+
     def get_supply_by_id(self, supply_id):
+        catalog = self._catalog()
+        if catalog is not None:
+            return catalog.get(int(supply_id))
         return self.db.fetch_one("SELECT * FROM supplies WHERE id=%s", (supply_id,))
 
+    def get_supply_by_sku(self, sku):
+        catalog = self._catalog()
+        if catalog is not None:
+            return catalog.find_sku(sku)
+        return self.db.fetch_one("SELECT * FROM supplies WHERE sku=%s", (sku,))
+
+    def get_supplies_by_category(self, category):
+        catalog = self._catalog()
+        if catalog is not None:
+            return catalog.in_category(category)
+        return self.db.fetch_all("SELECT * FROM supplies WHERE category=%s ORDER BY id ASC", (category,))
+
     def get_supply_by_name(self, name):
+        catalog = self._catalog()
+        if catalog is not None:
+            return catalog.find_name(name)
         return self.db.fetch_one(
             "SELECT * FROM supplies WHERE LOWER(name)=LOWER(%s)",
             (name,)
         )
 
     def add_supply(self, name, category, supplier, quantity, price, sku=None, min_quantity=5):
-        if not sku:
-            sku = f"{name[:3].upper()}-{int(quantity):04d}"
+        params = _insert_params(name, category, supplier, quantity, price, sku, min_quantity)
+        try:
+            with self.db.transaction():
+                self.db.execute(INSERT_SUPPLY, params)
+                row = self.db.fetch_one(
+                    "SELECT * FROM supplies WHERE sku=%s AND name=%s ORDER BY id DESC LIMIT 1",
+                    (params[0], params[1])
+                )
+                # Opening stock goes in the ledger, in the same commit, so
+                # stock history can replay it
+                if row and params[4]:
+                    self.db.log_transaction(row["id"], "IN", params[4], 0, params[4],
+                                            "Initial stock", timestamp=params[7], immediate=True)
+        except Exception as e:
+            print(f"[ERROR] Adding supply {name} failed: {e}")
+            return
+        # The new row is newer than the watermark, so a refresh picks it up
+        self._sync_catalog()
+        if row:
+            self.events.created.emit(dict(row))
 
+    def update_supply(self, supply_id, quantity, price, min_quantity=None):
         now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        quantity = int(quantity)
 
-        self.db.execute("""
-            INSERT INTO supplies (sku, name, category, supplier, quantity, min_quantity, price, last_updated)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-        """, (sku, name, category, supplier, int(quantity), int(min_quantity), float(price), now))
+        try:
+            with self.db.transaction():
+                before = self.db.fetch_one(
+                    "SELECT quantity FROM supplies WHERE id=%s FOR UPDATE", (supply_id,)
+                )
+                if min_quantity is not None:
+                    self.db.execute("""
+                        UPDATE supplies
+                        SET quantity=%s, price=%s, min_quantity=%s, last_updated=%s, version=version+1
+                        WHERE id=%s
+                    """, (quantity, float(price), int(min_quantity), now, supply_id))
+                else:
+                    self.db.execute("""
+                        UPDATE supplies
+                        SET quantity=%s, price=%s, last_updated=%s, version=version+1
+                        WHERE id=%s
+                    """, (quantity, float(price), now, supply_id))
+                # A changed count is a stock movement like any other
+                prev = int(before["quantity"] or 0) if before else quantity
+                if quantity != prev:
+                    self.db.log_transaction(
+                        supply_id, "IN" if quantity > prev else "OUT", abs(quantity - prev),
+                        prev, quantity, "Edited", timestamp=now, immediate=True
+                    )
+        except Exception as e:
+            print(f"[ERROR] Update of supply {supply_id} failed: {e}")
+            return
+        self._sync_catalog()
+        row = self.get_supply_by_id(supply_id)
+        if row:
+            self.events.updated.emit(dict(row))
 
-    def update_supply(self, supply_id, quantity, price, min_quantity=None):
+    # -----------------------------------------------------
+    # SUMMARY
+    # -----------------------------------------------------
+    def get_inventory_summary(self, month=None):
+        """
+        Every inventory KPI from one aggregate query:
+        total_items, total_value, low_stock, categories and item_count.
+        month ('YYYY-MM') limits it to supplies last updated in that month.
+        """
+        where, params = "", ()
+        if month:
+            in_month, params = month_window("last_updated", month)
+            where = f"WHERE {in_month}"
+
+        row = self.db.fetch_one(f"""
+            SELECT
+                COALESCE(SUM(quantity), 0) AS total_items,
+                COALESCE(SUM(quantity * price), 0) AS total_value,
+                COALESCE(SUM(CASE WHEN quantity <= min_quantity THEN 1 ELSE 0 END), 0) AS low_stock,
+                COUNT(DISTINCT category) AS categories,
+                COUNT(*) AS item_count
+            FROM supplies
+            {where}
+        """, params) or {}
+
+        return {
+            "total_items": int(row.get("total_items") or 0),
+            "total_value": float(row.get("total_value") or 0),
+            "low_stock": int(row.get("low_stock") or 0),
+            "categories": int(row.get("categories") or 0),
+            "item_count": int(row.get("item_count") or 0),
+        }
+
+    # -----------------------------------------------------
+    # STOCK ADJUSTMENTS
+    # -----------------------------------------------------
+    def adjust_quantity(self, supply_id, delta, reason="", expected_version=None,
+                        price=None, min_quantity=None):
+        """
+        Add delta (negative takes stock out) to a supply's quantity.
+        The new value is computed by one conditional UPDATE, so concurrent
+        adjustments never overwrite each other. It only applies when the row
+        exists, stock stays >= 0 and, if expected_version is given, nobody
+        changed the row since it was read. The ledger entry is written in
+        the same transaction.
+        Returns the updated supply, or None when nothing was applied.
+        """
+        delta = int(delta)
         now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
+        sets = ["quantity = quantity + %s", "version = version + 1", "last_updated = %s"]
+        params = [delta, now]
+        if price is not None:
+            sets.append("price = %s")
+            params.append(float(price))
         if min_quantity is not None:
-            self.db.execute("""
-                UPDATE supplies
-                SET quantity=%s, price=%s, min_quantity=%s, last_updated=%s
-                WHERE id=%s
-            """, (int(quantity), float(price), int(min_quantity), now, supply_id))
-        else:
-            self.db.execute("""
+            sets.append("min_quantity = %s")
+            params.append(int(min_quantity))
+        where = "id = %s AND quantity + %s >= 0"
+        params += [supply_id, delta]
+        if expected_version is not None:
+            where += " AND version = %s"
+            params.append(int(expected_version))
+
+        try:
+            with self.db.transaction():
+                changed = self.db.execute_count(
+                    f"UPDATE supplies SET {', '.join(sets)} WHERE {where}", params
+                )
+                if changed != 1:
+                    print(f"[WARNING] Stock adjustment of {delta} for supply {supply_id} not applied "
+                          "(missing item, insufficient stock or changed by someone else).")
+                    return None
+                row = self.db.fetch_one("SELECT * FROM supplies WHERE id=%s", (supply_id,))
+                if delta:
+                    new = int(row["quantity"])
+                    self.db.log_transaction(
+                        supply_id, "IN" if delta > 0 else "OUT", abs(delta), new - delta, new,
+                        reason, timestamp=now, immediate=True
+                    )
+        except Exception as e:
+            print(f"[ERROR] Stock adjustment failed: {e}")
+            return None
+
+        if self.catalog is not None and row:
+            self.catalog.put(row)
+        if row:
+            self.events.updated.emit(dict(row))
+        return row
+
+    def delete_supply(self, supply_id):
+        # The tombstone lets get_supplies_since() report the deletion; the
+        # stock still on hand leaves through the ledger
+        now = _now()
+        try:
+            with self.db.transaction():
+                before = self._quantities([supply_id])
+                self.db.execute(TOMBSTONE.format(ids="%s"), (now, supply_id))
+                deleted = self.db.execute_count("DELETE FROM supplies WHERE id=%s", (supply_id,))
+                self._log_removals(before, now)
+        except Exception as e:
+            print(f"[ERROR] Delete of supply {supply_id} failed: {e}")
+            return
+        if self.catalog is not None:
+            self.catalog.remove(int(supply_id))
+        if deleted:
+            self.events.deleted.emit(int(supply_id))
+
+    def _sync_catalog(self):
+        if self.catalog is not None and self.catalog.loaded:
+            self.refresh_catalog()
+
+    # -----------------------------------------------------
+    # BULK SUPPLIES
+    # Each call runs in one transaction with one multi-row statement per
+    # chunk_size rows. A chunk the DB rejects is retried row by row, so one
+    # bad row is reported instead of failing the batch. All return
+    # {"succeeded": n, "failed": [{"index": i, "error": "..."}]}, where
+    # index is the row's position in the input.
+    # -----------------------------------------------------
+    def add_supplies(self, items, chunk_size=500):
+        """items → dicts with add_supply's arguments (name, category, supplier, quantity, price, ...)."""
+        now = _now()
+        result = {"succeeded": 0, "failed": []}
+        rows = []
+        for index, item in enumerate(items):
+            try:
+                rows.append((index, _insert_params(
+                    item.get("name"), item.get("category"), item.get("supplier"),
+                    item.get("quantity", 0), item.get("price", 0),
+                    item.get("sku"), item.get("min_quantity", 5), now
+                )))
+            except (TypeError, ValueError, AttributeError) as e:
+                result["failed"].append({"index": index, "error": f"invalid row: {e}"})
+
+        def insert_chunk(chunk):
+            inserted = [params for _, params in chunk]
+            since = self._max_supply_id()
+            self.db.execute_many(INSERT_SUPPLY, inserted)
+            self._log_opening_stock(since, inserted, now)
+
+        def insert_row(params):
+            since = self._max_supply_id()
+            self.db.execute(INSERT_SUPPLY, params)
+            self._log_opening_stock(since, [params], now)
+            return True
+
+        self._run_bulk("add", rows, chunk_size, insert_chunk, insert_row, result)
+        self._sync_catalog()
+        self._emit_reset(result)
+        return result
+
+    def update_supplies(self, updates, chunk_size=500):
+        """updates → dicts with id, quantity, price and optionally min_quantity."""
+        now = _now()
+        result = {"succeeded": 0, "failed": []}
+        rows = []
+        for index, item in enumerate(updates):
+            try:
+                min_quantity = item.get("min_quantity")
+                rows.append((index, (
+                    int(item["id"]), int(item["quantity"]), float(item["price"]),
+                    int(min_quantity) if min_quantity is not None else None,
+                )))
+            except (KeyError, TypeError, ValueError, AttributeError) as e:
+                result["failed"].append({"index": index, "error": f"invalid row: {e}"})
+
+        def update_chunk(chunk):
+            values = [params for _, params in chunk]
+            before = self._quantities([v[0] for v in values])
+            quantity_case = " ".join("WHEN %s THEN %s" for _ in values)
+            price_case = " ".join("WHEN %s THEN %s" for _ in values)
+            min_case = " ".join("WHEN %s THEN COALESCE(%s, min_quantity)" for _ in values)
+            ids = ", ".join("%s" for _ in values)
+            params = (
+                [p for v in values for p in (v[0], v[1])]
+                + [p for v in values for p in (v[0], v[2])]
+                + [p for v in values for p in (v[0], v[3])]
+                + [now] + [v[0] for v in values]
+            )
+            self.db.execute(f"""
+                UPDATE supplies SET
+                    quantity = CASE id {quantity_case} ELSE quantity END,
+                    price = CASE id {price_case} ELSE price END,
+                    min_quantity = CASE id {min_case} ELSE min_quantity END,
+                    last_updated = %s,
+                    version = version + 1
+                WHERE id IN ({ids})
+            """, params)
+            self._log_edits(before, values, now)
+
+        def update_row(params):
+            supply_id, quantity, price, min_quantity = params
+            before = self._quantities([supply_id])
+            if self.db.execute_count("""
                 UPDATE supplies
-                SET quantity=%s, price=%s, last_updated=%s
+                SET quantity=%s, price=%s, min_quantity=COALESCE(%s, min_quantity),
+                    last_updated=%s, version=version+1
                 WHERE id=%s
-            """, (int(quantity), float(price), now, supply_id))
+            """, (quantity, price, min_quantity, now, supply_id)) != 1:
+                return False
+            self._log_edits(before, [params], now)
+            return True
 
-    def delete_supply(self, supply_id):
-        self.db.execute("DELETE FROM supplies WHERE id=%s", (supply_id,))
+        self._run_bulk("update", rows, chunk_size, update_chunk, update_row, result, id_of=lambda p: p[0])
+        self._sync_catalog()
+        self._emit_reset(result)
+        return result
+
+    def delete_supplies(self, supply_ids, chunk_size=500):
+        result = {"succeeded": 0, "failed": []}
+        rows = []
+        for index, supply_id in enumerate(supply_ids):
+            try:
+                rows.append((index, int(supply_id)))
+            except (TypeError, ValueError) as e:
+                result["failed"].append({"index": index, "error": f"invalid id: {e}"})
+
+        now = _now()
+
+        def delete_chunk(chunk):
+            ids = [supply_id for _, supply_id in chunk]
+            marks = ", ".join("%s" for _ in ids)
+            before = self._quantities(ids)
+            self.db.execute(TOMBSTONE.format(ids=marks), [now] + ids)
+            self.db.execute(f"DELETE FROM supplies WHERE id IN ({marks})", ids)
+            self._log_removals(before, now)
+
+        def delete_row(supply_id):
+            before = self._quantities([supply_id])
+            self.db.execute(TOMBSTONE.format(ids="%s"), (now, supply_id))
+            if self.db.execute_count("DELETE FROM supplies WHERE id=%s", (supply_id,)) != 1:
+                return False
+            self._log_removals(before, now)
+            return True
+
+        done = self._run_bulk("delete", rows, chunk_size, delete_chunk, delete_row, result,
+                              id_of=lambda supply_id: supply_id)
+        if self.catalog is not None:
+            for supply_id in done:
+                self.catalog.remove(supply_id)
+        self._emit_reset(result)
+        return result
+
+    def _emit_reset(self, result):
+        if result["succeeded"]:
+            self.events.reset.emit()
+
+    def _max_supply_id(self):
+        row = self.db.fetch_one("SELECT COALESCE(MAX(id), 0) AS id FROM supplies")
+        return int(row["id"]) if row else 0
+
+    def _quantities(self, ids):
+        rows = self.db.fetch_all(
+            f"SELECT id, quantity FROM supplies WHERE id IN ({', '.join('%s' for _ in ids)}) FOR UPDATE",
+            list(ids)
+        )
+        return {int(row["id"]): int(row["quantity"] or 0) for row in rows or []}
+
+    def _log_opening_stock(self, since_id, inserted, now):
+        """Ledger IN entries for the opening stock of the rows just inserted after since_id."""
+        keys = {(params[0], params[1]) for params in inserted}
+        rows = self.db.fetch_all(
+            "SELECT id, sku, name, quantity FROM supplies WHERE id > %s AND last_updated = %s ORDER BY id",
+            (since_id, now)
+        ) or []
+        self._log_movements([
+            make_entry(row["id"], "IN", row["quantity"], 0, row["quantity"], "Initial stock", now)
+            for row in rows
+            if (row["sku"], row["name"]) in keys and int(row["quantity"] or 0) > 0
+        ])
+
+    def _log_edits(self, before, updates, now):
+        """Ledger entries for the quantity changes of (id, quantity, ...) updates."""
+        entries, seen = [], set()
+        for supply_id, quantity, *_ in updates:
+            prev = before.get(supply_id)
+            # CASE id WHEN ... applies the first update of a repeated id
+            if supply_id in seen or prev is None or quantity == prev:
+                continue
+            seen.add(supply_id)
+            entries.append(make_entry(supply_id, "IN" if quantity > prev else "OUT",
+                                      abs(quantity - prev), prev, quantity, "Edited", now))
+        self._log_movements(entries)
+
+    def _log_removals(self, before, now):
+        """Ledger OUT entries for the stock deleted supplies still held."""
+        self._log_movements([
+            make_entry(supply_id, "OUT", quantity, quantity, 0, "Deleted", now)
+            for supply_id, quantity in sorted(before.items()) if quantity > 0
+        ])
+
+    def _log_movements(self, entries):
+        # Written now, inside the bulk transaction, so a rolled back chunk takes its entries along
+        if entries:
+            self.db.ledger.write(entries)
+
+    def _existing_ids(self, ids):
+        rows = self.db.fetch_all(
+            f"SELECT id FROM supplies WHERE id IN ({', '.join('%s' for _ in ids)})", list(ids)
+        )
+        return {int(row["id"]) for row in rows or []}
+
+    def _run_bulk(self, label, rows, chunk_size, run_chunk, run_row, result, id_of=None):
+        """
+        Shared driver for the bulk APIs: rows are (input index, params).
+        id_of, when given, maps params to a supply id that must already exist.
+        Returns the params of the rows that were applied.
+        """
+        applied = []
+        failed = []
+        try:
+            with self.db.transaction():
+                for start in range(0, len(rows), chunk_size):
+                    chunk = rows[start:start + chunk_size]
+                    if id_of is not None:
+                        existing = self._existing_ids({id_of(params) for _, params in chunk})
+                        for index, params in chunk:
+                            if id_of(params) not in existing:
+                                failed.append({"index": index, "error": f"supply {id_of(params)} not found"})
+                        chunk = [row for row in chunk if id_of(row[1]) in existing]
+                    if not chunk:
+                        continue
+
+                    self.db.execute("SAVEPOINT bulk_chunk")
+                    try:
+                        run_chunk(chunk)
+                        applied.extend(params for _, params in chunk)
+                        continue
+                    except Exception:
+                        self.db.execute("ROLLBACK TO SAVEPOINT bulk_chunk")
+
+                    for index, params in chunk:
+                        self.db.execute("SAVEPOINT bulk_row")
+                        try:
+                            if run_row(params):
+                                applied.append(params)
+                            else:
+                                failed.append({"index": index, "error": "no row changed"})
+                        except Exception as e:
+                            self.db.execute("ROLLBACK TO SAVEPOINT bulk_row")
+                            failed.append({"index": index, "error": str(e)})
+        except Exception as e:
+            print(f"[ERROR] Bulk {label} failed, nothing was saved: {e}")
+            result["failed"].extend({"index": index, "error": str(e)} for index, _ in rows)
+            result["failed"].sort(key=lambda f: f["index"])
+            return []
+
+        result["succeeded"] += len(applied)
+        result["failed"].extend(failed)
+        result["failed"].sort(key=lambda f: f["index"])
+        if result["failed"]:
+            print(f"[WARNING] Bulk {label}: {len(applied)} row(s) saved, {len(result['failed'])} failed.")
+        return applied
 
     # -----------------------------------------------------
     # TRANSACTION LOGS
@@ -74,8 +963,8 @@ class SupplyManager:
     def log_transaction(self, supply_id, action, qty, prev, new, note=""):
         return self.db.log_transaction(supply_id, action, qty, prev, new, note)
 
-    def get_logs(self):
-        return self.db.get_logs()
+    def get_logs(self, item_id=None, after_id=None, limit=100):
+        return self.db.get_logs(item_id=item_id, after_id=after_id, limit=limit)
 
     # -----------------------------------------------------
     # MONTHLY REPORTS
@@ -83,7 +972,47 @@ class SupplyManager:
     def generate_monthly_report(self, month_year):
         return self.db.generate_monthly_report(month_year)
 
-    def get_monthly_reports(self):
-        return self.db.get_monthly_reports()
+    def get_monthly_reports(self, start_month=None, end_month=None):
+        return self.db.get_monthly_reports(start_month, end_month)
+
+    def get_inventory_at(self, month_year):
+        """
+        Supplies as they stood at the end of month_year: each row's quantity
+        is the replayed month-end stock (see StockHistory), and items that
+        did not exist yet are left out. Items deleted later come from their
+        tombstone, so editing or deleting today never changes a past month.
+        """
+        stock = self.db.month_end_stock(month_year)
+        _, end = month_bounds(month_year)
+        live = self.get_supplies() or []
+        live_ids = {int(row["id"]) for row in live}
+        deleted = self.db.fetch_all("""
+            SELECT supply_id AS id, sku, name, category, supplier, min_quantity, price, created_at
+            FROM supply_tombstones
+            WHERE deleted_at >= %s AND name IS NOT NULL
+        """, (end,)) or []
+
+        rows = []
+        for row in list(live) + [r for r in deleted if int(r["id"]) not in live_ids]:
+            if int(row["id"]) in stock:
+                row = dict(row)
+                row["quantity"] = stock[int(row["id"])]
+                rows.append(row)
+        return sorted(rows, key=lambda r: int(r["id"]))
+
+    def get_monthly_trend(self, end_month, months=12):
+        return self.db.get_monthly_trend(end_month, months)
+
+    def export_csv(self, kind, target, start=None, end=None):
+        return self.db.export_csv(kind, target, start, end)
+
+    def export_columnar(self, directory, tables=None, through_month=None, fmt=None):
+        return self.db.export_columnar(directory, tables, through_month, fmt)
+
+    def get_daily_movements(self, month_year, item_id=None, category=None):
+        return self.db.get_daily_movements(month_year, item_id, category)
+
+    def get_day_movements(self, date):
+        return self.db.get_day_movements(date)
     
     
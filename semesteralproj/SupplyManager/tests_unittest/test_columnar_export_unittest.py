@@ -0,0 +1,90 @@
+import sys
+import sqlite3
+import pathlib
+import tempfile
+import unittest
+
+# Ensure SupplyManager package path is available when running unittest directly
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+SUPPLY_DIR = ROOT / 'SupplyManager'
+if str(SUPPLY_DIR) not in sys.path:
+    sys.path.insert(0, str(SUPPLY_DIR))
+
+from database.Db_manager import DatabaseManager
+from database import columnar_export
+from database.columnar_export import exported_months, partition_dir
+
+np = columnar_export.np
+
+
+class TestColumnarExport(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = DatabaseManager({'backend': 'sqlite', 'database': ':memory:'})
+        self.db.create_tables()
+        self.db.log_transaction(1, 'IN', 10, 0, 10, 'delivery', timestamp='2025-01-03 09:00:00')
+        self.db.log_transaction(1, 'OUT', 2, timestamp='2025-01-31 23:59:59')
+        self.db.log_transaction(2, 'IN', 4, 0, 4, timestamp='2025-03-01 00:00:00')
+
+    def tearDown(self):
+        self.db.close()
+        self.tmp.cleanup()
+
+    @unittest.skipUnless(np is not None, 'numpy not installed')
+    def test_npz_partitions_by_month(self):
+        written = self.db.export_columnar(self.tmp.name, through_month='2025-03', fmt='npz')
+        self.assertEqual(written['transactions'], ['2025-01', '2025-03'])
+        self.assertEqual(written['monthly_reports'], ['2025-01', '2025-03'])
+        self.assertEqual(written['stock_reconciliation'], [])
+
+        with np.load(partition_dir(self.tmp.name, 'transactions', '2025-01') / 'part.npz') as part:
+            self.assertEqual(part['qty'].tolist(), [10, 2])
+            self.assertEqual(part['type'].tolist(), ['IN', 'OUT'])
+            self.assertEqual(str(part['timestamp'][0]), '2025-01-03T09:00:00')
+            self.assertTrue(np.isnan(part['prev_qty'][1]))
+
+    def test_later_runs_only_append_new_months(self):
+        first = self.db.export_columnar(self.tmp.name, tables=['transactions'], through_month='2025-01', fmt='csv')
+        self.assertEqual(first, {'transactions': ['2025-01']})
+
+        self.db.log_transaction(1, 'IN', 1, timestamp='2025-01-15 00:00:00')  # already exported month
+        again = self.db.export_columnar(self.tmp.name, tables=['transactions'], through_month='2025-03', fmt='csv')
+        self.assertEqual(again, {'transactions': ['2025-03']})
+        self.assertEqual(exported_months(self.tmp.name, 'transactions'), ['2025-01', '2025-03'])
+
+        lines = (partition_dir(self.tmp.name, 'transactions', '2025-01') / 'part.csv').read_text().splitlines()
+        self.assertEqual(len(lines), 3)  # header + the two rows of the first run
+
+    def test_failed_month_stops_the_run(self):
+        stream = self.db.iter_query
+
+        def failing_march(query, params=None, *args, **kwargs):
+            if params and str(params[0]).startswith('2025-03'):
+                raise sqlite3.OperationalError('disk I/O error')
+            return stream(query, params, *args, **kwargs)
+
+        self.db.iter_query = failing_march
+        self.assertIsNone(self.db.export_columnar(self.tmp.name, tables=['transactions'],
+                                                  through_month='2025-03', fmt='csv'))
+        self.assertEqual(exported_months(self.tmp.name, 'transactions'), ['2025-01'])
+
+        self.db.iter_query = stream
+        again = self.db.export_columnar(self.tmp.name, tables=['transactions'], through_month='2025-03', fmt='csv')
+        self.assertEqual(again, {'transactions': ['2025-03']})
+
+    def test_failed_first_month_read_stops_the_run(self):
+        def failing_min(query, *args, **kwargs):
+            raise sqlite3.OperationalError('disk I/O error')
+
+        self.db.fetch_one = failing_min
+        self.assertIsNone(self.db.export_columnar(self.tmp.name, tables=['transactions'],
+                                                  through_month='2025-03', fmt='csv'))
+        self.assertEqual(exported_months(self.tmp.name, 'transactions'), [])
+
+    def test_missing_backend_is_reported(self):
+        if columnar_export.pq is None:
+            self.assertIsNone(self.db.export_columnar(self.tmp.name, fmt='parquet'))
+
+
+if __name__ == '__main__':
+    unittest.main()
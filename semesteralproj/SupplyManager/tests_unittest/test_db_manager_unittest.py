@@ -38,6 +38,7 @@ class TestDatabaseManager(unittest.TestCase):
                 self.conn = None
                 self.cursor = None
                 self.connected = True
+                self.ledger = dbmod.Ledger(self)
 
             def fetch_query(self, q, p=None):
                 return []
@@ -49,5 +50,291 @@ class TestDatabaseManager(unittest.TestCase):
         self.assertTrue(dm.generate_monthly_report('2025-01'))
 
 
+    def test_pooled_mode_borrows_and_returns_connections(self):
+        class FakeCursor:
+            rowcount = 1
+
+            def __init__(self):
+                self.closed = False
+
+            def execute(self, q, p=()):
+                self.last = (q, p)
+
+            def fetchall(self):
+                return [{'id': 1}]
+
+            def fetchone(self):
+                return {'id': 1}
+
+            def close(self):
+                self.closed = True
+
+        class FakeConn:
+            def __init__(self):
+                self.returned = 0
+
+            def cursor(self, **kwargs):
+                return FakeCursor()
+
+            def commit(self):
+                pass
+
+            def close(self):
+                self.returned += 1
+
+        class FakePool:
+            def __init__(self, pool_name=None, pool_size=None, **kwargs):
+                self.size = pool_size
+                self.kwargs = kwargs
+                self.conns = [FakeConn() for _ in range(pool_size)]
+
+            def get_connection(self):
+                return self.conns[0]
+
+        orig_pool = dbmod.pooling.MySQLConnectionPool
+        dbmod.pooling.MySQLConnectionPool = FakePool
+        try:
+            dm = dbmod.DatabaseManager({'database': 'x', 'pool_size': 3})
+            self.assertTrue(dm.connected)
+            self.assertEqual(dm.pool.size, 3)
+            self.assertIs(dm.pool.kwargs['pool_reset_session'], False)
+            self.assertEqual(dm.fetch_query('SELECT 1'), [{'id': 1}])
+            self.assertEqual(dm.fetch_one('SELECT 1'), {'id': 1})
+            self.assertTrue(dm.execute_query('UPDATE x SET y=1'))
+            self.assertEqual(dm.pool.conns[0].returned, 3)
+        finally:
+            dbmod.pooling.MySQLConnectionPool = orig_pool
+
+    def _pool_db(self, get_connection, timeout):
+        class FakePool:
+            pass
+
+        class FakeDB(dbmod.DatabaseManager):
+            def __init__(self):
+                self.config = {'pool_timeout': timeout}
+                self.pool = FakePool()
+                self.pool.get_connection = get_connection
+
+        return FakeDB()
+
+    def test_exhausted_pool_waits_for_a_connection(self):
+        attempts = []
+
+        def get_connection():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise dbmod.mysql.connector.errors.PoolError('Failed getting connection; pool exhausted')
+            return 'conn'
+
+        self.assertEqual(self._pool_db(get_connection, 5)._borrow(), 'conn')
+        self.assertEqual(len(attempts), 3)
+
+    def test_exhausted_pool_times_out(self):
+        def get_connection():
+            raise dbmod.mysql.connector.errors.PoolError('Failed getting connection; pool exhausted')
+
+        with self.assertRaises(dbmod.mysql.connector.errors.PoolError):
+            self._pool_db(get_connection, 0.05)._borrow()
+
+    def test_generate_monthly_report_is_set_based(self):
+        class FakeDB(dbmod.DatabaseManager):
+            def __init__(self):
+                self.config = {}
+                self.connected = True
+                self.queries = []
+                self.ledger = dbmod.Ledger(self)
+
+            def fetch_query(self, q, p=None):
+                raise AssertionError('report should not round-trip rows')
+
+            def execute_query(self, q, p=None):
+                self.queries.append((q, p))
+                return True
+
+        dm = FakeDB()
+        self.assertTrue(dm.generate_monthly_report('2025-01'))
+        # One statement per rollup table, however many items moved
+        self.assertEqual(len(dm.queries), 2)
+        q, params = dm.queries[0]
+        self.assertIn('INSERT INTO monthly_reports', q)
+        self.assertIn('GROUP BY item_id', q)
+        self.assertIn('timestamp >= %s AND timestamp < %s', q)
+        self.assertEqual(params, ('2025-01', '2025-01-01 00:00:00', '2025-02-01 00:00:00'))
+        q, params = dm.queries[1]
+        self.assertIn('INSERT INTO daily_item_movements', q)
+        self.assertEqual(params, ('2025-01', '2025-01-01 00:00:00', '2025-02-01 00:00:00'))
+
+    def test_execute_many_chunks_and_commits_once(self):
+        class FakeCursor:
+            def __init__(self):
+                self.batches = []
+
+            def executemany(self, q, rows):
+                self.batches.append(list(rows))
+
+        class FakeConn:
+            def __init__(self):
+                self.commits = 0
+
+            def start_transaction(self):
+                pass
+
+            def commit(self):
+                self.commits += 1
+
+            def rollback(self):
+                pass
+
+        class FakeDB(dbmod.DatabaseManager):
+            def __init__(self):
+                self.config = {}
+                self.pool = None
+                self.connected = True
+                self.conn = FakeConn()
+                self.cursor = FakeCursor()
+                self._lock = dbmod.threading.RLock()
+                self._local = dbmod.threading.local()
+                self.query_stats = dbmod.QueryStats()
+                self.query_cache = None
+
+        dm = FakeDB()
+        rows = ((i, i * 2) for i in range(5))
+        self.assertTrue(dm.execute_many('INSERT INTO t (a, b) VALUES (%s, %s)', rows, chunk_size=2))
+        self.assertEqual([len(b) for b in dm.cursor.batches], [2, 2, 1])
+        self.assertEqual(dm.conn.commits, 1)
+
+    def test_iter_query_streams_in_chunks(self):
+        class FakeCursor:
+            def __init__(self, rows):
+                self.rows = rows
+                self.fetch_sizes = []
+                self.closed = False
+
+            def execute(self, q, p=()):
+                pass
+
+            def fetchmany(self, size):
+                self.fetch_sizes.append(size)
+                chunk, self.rows = self.rows[:size], self.rows[size:]
+                return chunk
+
+            def close(self):
+                self.closed = True
+
+        class FakeConn:
+            def __init__(self):
+                self.cur = FakeCursor([{'id': i} for i in range(5)])
+                self.closed = False
+
+            def cursor(self, **kwargs):
+                self.cursor_kwargs = kwargs
+                return self.cur
+
+            def close(self):
+                self.closed = True
+
+        conn = FakeConn()
+        orig_connect = dbmod.mysql.connector.connect
+        dbmod.mysql.connector.connect = lambda **kwargs: conn
+        try:
+            class FakeDB(dbmod.DatabaseManager):
+                def __init__(self):
+                    self.config = {}
+                    self.backend = dbmod.get_backend(self.config)
+                    self.pool = None
+                    self.conn = object()
+                    self.connected = True
+
+            dm = FakeDB()
+            stream = dm.iter_query('SELECT * FROM transactions', chunk_size=2)
+            self.assertEqual(conn.cur.fetch_sizes, [])  # nothing fetched until iterated
+            self.assertEqual([r['id'] for r in stream], [0, 1, 2, 3, 4])
+            self.assertEqual(conn.cur.fetch_sizes, [2, 2, 2, 2])
+            self.assertNotIn('buffered', conn.cursor_kwargs)
+            self.assertTrue(conn.cur.closed)
+            self.assertTrue(conn.closed)
+        finally:
+            dbmod.mysql.connector.connect = orig_connect
+
+    def _transaction_db(self):
+        class FakeCursor:
+            rowcount = 1
+
+            def __init__(self):
+                self.executed = []
+
+            def execute(self, q, p=()):
+                if 'FAIL' in q:
+                    raise dbmod.mysql.connector.Error('boom')
+                self.executed.append(q)
+
+            def fetchone(self):
+                return {'id': 1}
+
+        class FakeConn:
+            def __init__(self):
+                self.log = []
+
+            def start_transaction(self):
+                self.log.append('begin')
+
+            def commit(self):
+                self.log.append('commit')
+
+            def rollback(self):
+                self.log.append('rollback')
+
+        class FakeDB(dbmod.DatabaseManager):
+            def __init__(self):
+                self.config = {}
+                self.pool = None
+                self.connected = True
+                self.conn = FakeConn()
+                self.cursor = FakeCursor()
+                self._lock = dbmod.threading.RLock()
+                self._local = dbmod.threading.local()
+                self.query_stats = dbmod.QueryStats()
+                self.query_cache = None
+
+        return FakeDB()
+
+    def test_transaction_commits_once(self):
+        dm = self._transaction_db()
+        with dm.transaction():
+            dm.execute_query('UPDATE supplies SET quantity = quantity - 1')
+            self.assertEqual(dm.fetch_one('SELECT 1'), {'id': 1})
+            with dm.transaction():  # nested block joins the outer one
+                dm.execute_query('DELETE FROM stock_requests')
+        self.assertEqual(dm.conn.log, ['begin', 'commit'])
+        self.assertEqual(len(dm.cursor.executed), 3)
+        self.assertFalse(dm._in_transaction())
+
+    def test_transaction_rolls_back_on_error(self):
+        dm = self._transaction_db()
+        with self.assertRaises(dbmod.mysql.connector.Error):
+            with dm.transaction():
+                dm.execute_query('UPDATE supplies SET quantity = 1')
+                dm.execute_query('FAIL')
+        self.assertEqual(dm.conn.log, ['begin', 'rollback'])
+        # Outside a transaction errors are still reported, not raised
+        self.assertFalse(dm.execute_query('FAIL'))
+
+    def test_stats_group_by_fingerprint(self):
+        dm = self._transaction_db()
+        dm.query_stats.slow_query_ms = 0  # log everything as slow
+        dm.fetch_one('SELECT * FROM supplies WHERE id=%s', (1,))
+        dm.fetch_one('SELECT * FROM supplies WHERE id=%s', (2,))
+        dm.execute_query("UPDATE supplies SET name='x' WHERE id=7")
+        stats = {s['query']: s for s in dm.stats()}
+        select = stats['SELECT * FROM supplies WHERE id=?']
+        self.assertEqual(select['calls'], 2)
+        self.assertEqual(select['rows'], 2)
+        self.assertEqual(select['slow'], 2)
+        self.assertIn('UPDATE supplies SET name=? WHERE id=?', stats)
+        self.assertLessEqual(select['p50_ms'], select['max_ms'])
+        dm.stats(reset=True)
+        self.assertEqual(dm.stats(), [])
+
+
 if __name__ == '__main__':
     unittest.main()
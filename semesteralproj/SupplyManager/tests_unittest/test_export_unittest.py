@@ -0,0 +1,96 @@
+import io
+import csv
+import sys
+import pathlib
+import tempfile
+import unittest
+
+# Ensure SupplyManager package path is available when running unittest directly
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+SUPPLY_DIR = ROOT / 'SupplyManager'
+if str(SUPPLY_DIR) not in sys.path:
+    sys.path.insert(0, str(SUPPLY_DIR))
+
+from database.Db_manager import DatabaseManager
+from database.export import month_range, write_csv
+
+
+class TestCsvExport(unittest.TestCase):
+    def setUp(self):
+        self.db = DatabaseManager({'backend': 'sqlite', 'database': ':memory:'})
+        self.db.create_tables()
+        self.db.execute_query(
+            "INSERT INTO supplies (name, sku, category, quantity, price) VALUES "
+            "('Pens', 'PEN-1', 'Office', 8, 1.5), ('Mops', 'MOP-1', 'Cleaning', 2, 9.0)"
+        )
+        self.db.log_transaction(1, 'IN', 10, 0, 10, 'delivery', timestamp='2025-01-03 09:00:00')
+        self.db.log_transaction(1, 'OUT', 2, 10, 8, timestamp='2025-01-31 23:59:59')
+        self.db.log_transaction(2, 'IN', 2, 0, 2, timestamp='2025-02-01 00:00:00')
+
+    def tearDown(self):
+        self.db.close()
+
+    def _export(self, kind, start=None, end=None):
+        out = io.StringIO()
+        count = self.db.export_csv(kind, out, start, end, chunk_size=1)
+        return count, list(csv.DictReader(io.StringIO(out.getvalue())))
+
+    def test_ledger_range(self):
+        count, rows = self._export('ledger', *month_range('ledger', '2025-01'))
+        self.assertEqual(count, 2)
+        self.assertEqual([(r['item_id'], r['type'], r['qty'], r['note']) for r in rows],
+                         [('1', 'IN', '10', 'delivery'), ('1', 'OUT', '2', '')])
+
+    def test_report_tables_and_inventory(self):
+        count, rows = self._export('monthly_reports', *month_range('monthly_reports', '2025-01'))
+        self.assertEqual(count, 1)
+        self.assertEqual((rows[0]['name'], rows[0]['total_in'], rows[0]['total_out']), ('Pens', '10', '2'))
+
+        count, rows = self._export('daily_movements', '2025-01', '2025-02')
+        self.assertEqual([(r['month_year'], r['day'], r['name']) for r in rows],
+                         [('2025-01', '3', 'Pens'), ('2025-01', '31', 'Pens'), ('2025-02', '1', 'Mops')])
+
+        count, rows = self._export('inventory')
+        self.assertEqual([r['sku'] for r in rows], ['PEN-1', 'MOP-1'])
+
+    def test_empty_export_still_has_header(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = pathlib.Path(tmp) / 'ledger.csv'
+            self.assertEqual(self.db.export_csv('ledger', str(path), '2030-01-01', '2030-02-01'), 0)
+            self.assertTrue(path.read_text(encoding='utf-8').startswith('id,timestamp,item_id'))
+        self.assertIsNone(self.db.export_csv('nope', io.StringIO()))
+
+    def test_failed_read_leaves_no_file(self):
+        self.db.execute_query("DROP TABLE daily_item_movements")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = pathlib.Path(tmp) / 'daily.csv'
+            self.assertIsNone(self.db.export_csv('daily_movements', str(path)))
+            self.assertEqual(list(pathlib.Path(tmp).iterdir()), [])
+
+    def test_interrupted_stream_keeps_the_old_file(self):
+        def rows():
+            yield {'a': 1}
+            raise OSError('connection lost')
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = pathlib.Path(tmp) / 'out.csv'
+            path.write_text('old', encoding='utf-8')
+            with self.assertRaises(OSError):
+                write_csv(rows(), ['a'], str(path))
+            self.assertEqual([p.name for p in pathlib.Path(tmp).iterdir()], ['out.csv'])
+            self.assertEqual(path.read_text(encoding='utf-8'), 'old')
+
+    def test_rows_are_written_as_they_arrive(self):
+        out = io.StringIO()
+
+        def rows():
+            yield {'a': 1}
+            # The first row is already out before the next one is produced
+            self.assertEqual(out.getvalue().splitlines(), ['a', '1'])
+            yield {'a': 2}
+
+        self.assertEqual(write_csv(rows(), ['a'], out), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
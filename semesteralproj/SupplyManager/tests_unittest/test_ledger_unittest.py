@@ -0,0 +1,158 @@
+import sys
+import time
+import threading
+import pathlib
+import unittest
+
+# Ensure SupplyManager package path is available when running unittest directly
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+SUPPLY_DIR = ROOT / 'SupplyManager'
+if str(SUPPLY_DIR) not in sys.path:
+    sys.path.insert(0, str(SUPPLY_DIR))
+
+from database.Db_manager import DatabaseManager
+from database.ledger import movement_type
+
+
+class TestLedger(unittest.TestCase):
+    def setUp(self):
+        self.db = DatabaseManager({
+            'backend': 'sqlite', 'database': ':memory:',
+            'ledger_flush_rows': 3, 'ledger_flush_ms': 50,
+        })
+        self.db.create_tables()
+
+    def tearDown(self):
+        self.db.close()
+
+    def _count(self):
+        return self.db.fetch_one("SELECT COUNT(*) AS n FROM transactions")['n']
+
+    def test_movement_type(self):
+        self.assertEqual(movement_type('out', 5), 'OUT')
+        self.assertEqual(movement_type('restock', 5, prev=2, new=7), 'IN')
+        self.assertEqual(movement_type('correction', -3), 'OUT')
+
+    def test_appends_are_batched(self):
+        self.db.ledger.flush_ms = 60000  # only the row limit may flush here
+        self.db.log_transaction(1, 'IN', 5, 0, 5, 'first delivery')
+        self.db.log_transaction(1, 'OUT', 2, 5, 3)
+        self.assertEqual(self._count(), 0)
+        self.db.log_transaction(2, 'IN', 1, 0, 1)
+        self.assertEqual(self._count(), 3)
+        self.assertEqual(self.db.ledger.pending(), 0)
+
+    def _wait_for_rows(self, n):
+        # pending() drops to 0 before the batch is committed, so poll the table
+        deadline = time.monotonic() + 2
+        while self._count() < n and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return self._count()
+
+    def test_timed_flush(self):
+        self.db.log_transaction(1, 'IN', 5, 0, 5)
+        self.assertEqual(self._wait_for_rows(1), 1)
+
+    def test_failed_flush_is_retried_by_the_timer(self):
+        ledger = self.db.ledger
+        write = ledger.write
+        failures = []
+
+        def flaky_write(entries):
+            if not failures:
+                failures.append(entries)
+                raise RuntimeError('database unavailable')
+            write(entries)
+
+        ledger.write = flaky_write
+        self.db.log_transaction(1, 'IN', 5, 0, 5)
+        self.assertEqual(self._wait_for_rows(1), 1)
+        self.assertEqual(len(failures), 1)
+
+    def test_flush_inside_a_transaction_does_not_deadlock(self):
+        self.db.log_transaction(1, 'IN', 5, 0, 5)
+
+        def reader():
+            with self.db.transaction():
+                time.sleep(0.2)  # the flush timer fires meanwhile
+                self.db.get_daily_movements('2025-01')
+
+        worker = threading.Thread(target=reader, daemon=True)
+        worker.start()
+        worker.join(timeout=5)
+        self.assertFalse(worker.is_alive())
+        self.assertEqual(self._wait_for_rows(1), 1)
+
+    def test_rolled_back_transaction_keeps_buffered_rows(self):
+        self.db.ledger.flush_ms = 60000
+        self.db.log_transaction(1, 'IN', 5, 0, 5)
+        with self.assertRaises(RuntimeError):
+            with self.db.transaction():
+                self.db.flush_ledger()
+                raise RuntimeError('rolled back')
+        self.assertEqual(self.db.ledger.pending(), 1)
+        self.assertTrue(self.db.flush_ledger())
+        self.assertEqual(self._count(), 1)
+
+    def test_keyset_pages(self):
+        for n in range(7):
+            self.db.log_transaction(1 if n % 2 else 2, 'IN', n + 1, n, n + 1, f'note {n}')
+        first = self.db.get_logs(limit=4)
+        second = self.db.get_logs(after_id=first[-1]['id'], limit=4)
+        self.assertEqual(len(first) + len(second), 7)
+        self.assertLess(first[-1]['id'], second[0]['id'])
+        item_rows = self.db.get_logs(item_id=1)
+        self.assertEqual([r['qty'] for r in item_rows], [2, 4, 6])
+        self.assertEqual((item_rows[0]['prev_qty'], item_rows[0]['new_qty'], item_rows[0]['note']),
+                         (1, 2, 'note 1'))
+
+
+    def test_ledger_writes_maintain_monthly_rollups(self):
+        self.db.log_transaction(1, 'IN', 5, timestamp='2025-01-03 10:00:00')
+        self.db.log_transaction(1, 'OUT', 2, timestamp='2025-01-20 10:00:00')
+        self.db.log_transaction(1, 'IN', 4, timestamp='2025-02-01 00:00:00')
+        self.db.log_transaction(2, 'IN', 7, timestamp='2025-01-31 23:59:59', immediate=True)
+        january = {r['item_id']: (r['total_in'], r['total_out']) for r in self.db.get_month_report('2025-01')}
+        self.assertEqual(january, {1: (5, 2), 2: (7, 0)})
+        self.assertEqual(len(self.db.get_monthly_reports('2025-02', '2025-02')), 1)
+
+        # A rebuild from the raw ledger agrees with the incremental counters
+        self.assertTrue(self.db.generate_monthly_report('2025-01'))
+        rebuilt = {r['item_id']: (r['total_in'], r['total_out']) for r in self.db.get_month_report('2025-01')}
+        self.assertEqual(rebuilt, january)
+
+    def test_ledger_writes_maintain_daily_rollups(self):
+        self.db.execute_query(
+            "INSERT INTO supplies (name, category, quantity) VALUES ('Pens', 'Office', 0), ('Mops', 'Cleaning', 0)"
+        )
+        self.db.log_transaction(1, 'IN', 10, timestamp='2025-01-03 09:00:00')
+        self.db.log_transaction(1, 'OUT', 4, timestamp='2025-01-03 17:00:00')
+        self.db.log_transaction(2, 'IN', 6, timestamp='2025-01-03 12:00:00')
+        self.db.log_transaction(2, 'OUT', 1, timestamp='2025-01-31 12:00:00')
+        self.db.log_transaction(1, 'IN', 9, timestamp='2025-02-01 08:00:00')
+
+        points = self.db.get_daily_movements('2025-01')
+        self.assertEqual([(r['day'], r['qty_in'], r['qty_out'], r['net_qty']) for r in points],
+                         [(3, 16, 4, 12), (31, 0, 1, -1)])
+        office = self.db.get_daily_movements('2025-01', category='Office')
+        self.assertEqual([(r['day'], r['net_qty']) for r in office], [(3, 6)])
+        self.assertEqual([r['net_qty'] for r in self.db.get_daily_movements('2025-01', item_id=2)], [6, -1])
+
+        movers = self.db.get_day_movements('2025-01-03')
+        self.assertEqual([(r['name'], r['net_qty']) for r in movers], [('Pens', 6), ('Mops', 6)])
+
+        # A rebuild from the raw ledger agrees with the incremental counters
+        self.assertTrue(self.db.generate_monthly_report('2025-01'))
+        self.assertEqual(self.db.get_daily_movements('2025-01'), points)
+
+    def test_immediate_entry_rolls_back_with_transaction(self):
+        with self.assertRaises(RuntimeError):
+            with self.db.transaction():
+                self.db.log_transaction(1, 'IN', 5, immediate=True)
+                raise RuntimeError('abort')
+        self.assertEqual(self._count(), 0)
+        self.assertEqual(self.db.get_monthly_reports(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import sys
+import pathlib
+import unittest
+from contextlib import contextmanager
+
+# Ensure SupplyManager package path is available when running unittest directly
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+SUPPLY_DIR = ROOT / 'SupplyManager'
+if str(SUPPLY_DIR) not in sys.path:
+    sys.path.insert(0, str(SUPPLY_DIR))
+
+from database import migrations
+from database.Db_manager import DatabaseManager
+
+
+class RecordingDB:
+    def __init__(self, version=0, fail_on=None):
+        self.version = version
+        self.fail_on = fail_on
+        self.statements = []
+
+    def fetch_one(self, q, p=None):
+        return {'version': self.version}
+
+    def execute_query(self, q, p=None):
+        self.statements.append((q, p))
+        if self.fail_on and self.fail_on in q:
+            return False
+        if q.startswith('INSERT INTO schema_version'):
+            self.version = p[0]
+        return True
+
+    @contextmanager
+    def transaction(self):
+        yield self
+
+
+class TestMigrations(unittest.TestCase):
+    def test_fresh_database_runs_every_migration(self):
+        db = RecordingDB()
+        self.assertTrue(migrations.migrate(db))
+        self.assertEqual(db.version, migrations.LATEST_VERSION)
+        sql = ' '.join(q for q, _ in db.statements)
+        for table in ('supplies', 'transactions', 'monthly_reports',
+                      'stock_reconciliation', 'stock_requests', 'users'):
+            self.assertIn(f'CREATE TABLE IF NOT EXISTS {table}', sql)
+        self.assertIn('ON transactions (item_id, timestamp)', sql)
+        self.assertIn('UNIQUE INDEX uq_monthly_reports_month_item', sql)
+        self.assertIn('UNIQUE INDEX uq_reconciliation_month_item', sql)
+
+    def test_current_schema_skips_ddl(self):
+        db = RecordingDB(version=migrations.LATEST_VERSION)
+        self.assertTrue(migrations.migrate(db))
+        self.assertEqual(len(db.statements), 1)
+        self.assertIn('schema_version', db.statements[0][0])
+
+    def test_only_newer_migrations_run(self):
+        db = RecordingDB(version=1)
+        self.assertTrue(migrations.migrate(db))
+        sql = ' '.join(q for q, _ in db.statements)
+        self.assertNotIn('CREATE TABLE IF NOT EXISTS supplies', sql)
+        self.assertIn('idx_users_username', sql)
+
+    def test_failure_stops_and_keeps_version(self):
+        db = RecordingDB(fail_on='uq_monthly_reports_month_item')
+        self.assertFalse(migrations.migrate(db))
+        self.assertEqual(db.version, 3)
+
+    def test_unrecorded_version_is_a_failure(self):
+        db = RecordingDB(fail_on='INSERT INTO schema_version')
+        self.assertFalse(migrations.migrate(db))
+        self.assertEqual(db.version, 0)
+        self.assertEqual(sum('INSERT INTO schema_version' in q for q, _ in db.statements), 1)
+
+    def test_failed_step_rolls_back_with_its_version(self):
+        db = DatabaseManager({'backend': 'sqlite', 'database': ':memory:'})
+        db.execute_query(migrations.CREATE_VERSION_TABLE)
+        original = migrations.MIGRATIONS
+        migrations.MIGRATIONS = original[:1] + [
+            (2, "two statements", ["CREATE TABLE half (id INT)", "INSERT INTO nowhere VALUES (1)"]),
+        ]
+        try:
+            self.assertFalse(migrations.migrate(db))
+        finally:
+            migrations.MIGRATIONS = original
+        self.assertEqual(migrations.schema_version(db), 1)
+        self.assertEqual(db.fetch_all("SELECT name FROM sqlite_master WHERE name = 'half'"), [])
+        db.close()
+
+    def test_versions_are_strictly_increasing(self):
+        versions = [v for v, _, _ in migrations.MIGRATIONS]
+        self.assertEqual(versions, sorted(set(versions)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import sys
+import pathlib
+import unittest
+
+# Ensure SupplyManager package path is available when running unittest directly
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+SUPPLY_DIR = ROOT / 'SupplyManager'
+if str(SUPPLY_DIR) not in sys.path:
+    sys.path.insert(0, str(SUPPLY_DIR))
+
+from database.month_window import month_bounds, month_window, shift_month
+
+
+class TestMonthWindow(unittest.TestCase):
+    def test_bounds_are_half_open(self):
+        self.assertEqual(month_bounds('2025-01'), ('2025-01-01 00:00:00', '2025-02-01 00:00:00'))
+
+    def test_bounds_roll_over_year(self):
+        self.assertEqual(month_bounds('2024-12'), ('2024-12-01 00:00:00', '2025-01-01 00:00:00'))
+
+    def test_bounds_leap_february(self):
+        self.assertEqual(month_bounds('2024-02')[1], '2024-03-01 00:00:00')
+
+    def test_shift_month(self):
+        self.assertEqual(shift_month('2025-01', -1), '2024-12')
+        self.assertEqual(shift_month('2025-01', 11), '2025-12')
+        self.assertEqual(shift_month('2025-01', 12), '2026-01')
+        self.assertEqual(shift_month('2025-03', -14), '2024-01')
+
+    def test_window_predicate_is_parameterized(self):
+        sql, params = month_window('last_updated', '2025-06')
+        self.assertEqual(sql, 'last_updated >= %s AND last_updated < %s')
+        self.assertEqual(params, ('2025-06-01 00:00:00', '2025-07-01 00:00:00'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import sys
+import pathlib
+import unittest
+
+# Ensure SupplyManager package path is available when running unittest directly
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+SUPPLY_DIR = ROOT / 'SupplyManager'
+if str(SUPPLY_DIR) not in sys.path:
+    sys.path.insert(0, str(SUPPLY_DIR))
+
+from database.Db_manager import DatabaseManager
+from database.query_cache import QueryCache, is_cacheable, tables_in
+
+
+class TestQueryCache(unittest.TestCase):
+    def test_tables_in(self):
+        self.assertEqual(tables_in("SELECT * FROM supplies s JOIN transactions t ON t.item_id = s.id"),
+                         {'supplies', 'transactions'})
+        self.assertEqual(tables_in("UPDATE supplies SET quantity = 1"), {'supplies'})
+        self.assertEqual(tables_in("insert into `monthly_reports` (a) VALUES (1)"), {'monthly_reports'})
+
+    def test_is_cacheable(self):
+        self.assertTrue(is_cacheable("  select * from supplies"))
+        self.assertFalse(is_cacheable("SELECT NOW()"))
+        self.assertFalse(is_cacheable("DELETE FROM supplies"))
+
+    def test_lru_eviction(self):
+        cache = QueryCache(max_entries=2)
+        for n in range(3):
+            _, snapshot = cache.get(cache.key("SELECT %s", (n,)))
+            cache.put(cache.key("SELECT %s", (n,)), [n], {'t'}, snapshot)
+        self.assertFalse(cache.get(cache.key("SELECT %s", (0,)))[0])
+        self.assertEqual(cache.get(cache.key("SELECT  %s", (2,))), (True, [2]))
+
+    def test_write_during_read_is_not_stored(self):
+        cache = QueryCache()
+        key = cache.key("SELECT * FROM supplies", None)
+        _, snapshot = cache.get(key)
+        cache.invalidate({'supplies'})
+        cache.put(key, [{'id': 1}], {'supplies'}, snapshot)
+        self.assertFalse(cache.get(key)[0])
+
+    def test_entries_expire(self):
+        cache = QueryCache(ttl=0)
+        key = cache.key("SELECT * FROM supplies", None)
+        _, snapshot = cache.get(key)
+        cache.put(key, [{'id': 1}], {'supplies'}, snapshot)
+        self.assertFalse(cache.get(key)[0])
+
+    def test_table_allow_list(self):
+        cache = QueryCache(tables=['supplies'])
+        self.assertTrue(cache.allows({'supplies'}))
+        self.assertFalse(cache.allows({'supplies', 'users'}))
+        self.assertTrue(QueryCache().allows({'users'}))
+
+
+class TestDatabaseManagerCache(unittest.TestCase):
+    def setUp(self):
+        self.db = DatabaseManager({'backend': 'sqlite', 'database': ':memory:', 'query_cache_size': 16})
+        self.db.create_tables()
+        self.db.execute_query("INSERT INTO supplies (name, quantity) VALUES (%s, %s)", ('Pen', 3))
+
+    def tearDown(self):
+        self.db.close()
+
+    def _calls(self, query):
+        return sum(s['calls'] for s in self.db.stats() if s['query'] == query)
+
+    def test_repeated_read_hits_cache(self):
+        q = "SELECT * FROM supplies"
+        first = self.db.fetch_query(q)
+        first[0]['name'] = 'changed by caller'
+        second = self.db.fetch_query(q)
+        self.assertEqual(second[0]['name'], 'Pen')
+        self.assertEqual(self._calls(q), 1)
+
+    def test_write_invalidates_dependent_reads(self):
+        q = "SELECT quantity FROM supplies WHERE id = ?"
+        self.assertEqual(self.db.fetch_one("SELECT quantity FROM supplies WHERE id = %s", (1,))['quantity'], 3)
+        self.db.execute_query("UPDATE supplies SET quantity = 9 WHERE id = %s", (1,))
+        self.assertEqual(self.db.fetch_one("SELECT quantity FROM supplies WHERE id = %s", (1,))['quantity'], 9)
+        self.assertEqual(self._calls(q), 2)
+
+    def test_other_clients_writes_show_up_after_ttl(self):
+        import os
+        import tempfile
+        import time
+        fd, path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        config = {'backend': 'sqlite', 'database': path, 'query_cache_size': 16, 'query_cache_ttl': 0.05}
+        a, b = DatabaseManager(dict(config)), DatabaseManager(dict(config))
+        try:
+            a.create_tables()
+            q = "SELECT username FROM users"
+            a.execute_query("INSERT INTO users (username, password) VALUES ('ana', 'x')")
+            self.assertEqual(len(a.fetch_query(q)), 1)
+            b.execute_query("INSERT INTO users (username, password) VALUES ('ben', 'x')")
+            time.sleep(0.1)
+            self.assertEqual(len(a.fetch_query(q)), 2)
+        finally:
+            a.close()
+            b.close()
+            os.remove(path)
+
+    def test_uncached_tables_always_read_through(self):
+        db = DatabaseManager({'backend': 'sqlite', 'database': ':memory:',
+                              'query_cache_size': 16, 'query_cache_tables': ['supplies']})
+        try:
+            db.create_tables()
+            db.fetch_query("SELECT * FROM users")
+            db.fetch_query("SELECT * FROM users")
+            self.assertEqual(sum(s['calls'] for s in db.stats() if s['query'] == "SELECT * FROM users"), 2)
+        finally:
+            db.close()
+
+    def test_transaction_bypasses_cache(self):
+        with self.db.transaction():
+            self.db.execute_query("UPDATE supplies SET quantity = 4 WHERE id = %s", (1,))
+            self.assertEqual(self.db.fetch_one("SELECT quantity FROM supplies")['quantity'], 4)
+        self.assertEqual(self.db.fetch_one("SELECT quantity FROM supplies")['quantity'], 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
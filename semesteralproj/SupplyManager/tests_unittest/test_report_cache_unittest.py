@@ -0,0 +1,112 @@
+import sys
+import pathlib
+import tempfile
+import threading
+import unittest
+
+# Ensure SupplyManager package path is available when running unittest directly
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+SUPPLY_DIR = ROOT / 'SupplyManager'
+if str(SUPPLY_DIR) not in sys.path:
+    sys.path.insert(0, str(SUPPLY_DIR))
+
+from modules.report_cache import ReportCache
+
+
+class TestReportCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.loads = []
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _cache(self):
+        def load(month_year):
+            self.loads.append(month_year)
+            return {"month": month_year, "total": len(self.loads)}
+        return ReportCache(load, self.tmp.name, today=lambda: '2025-03')
+
+    def test_closed_months_are_kept_on_disk(self):
+        first = self._cache()
+        self.assertEqual(first.get('2025-01'), {"month": '2025-01', "total": 1})
+        self.assertEqual(first.get('2025-01')["total"], 1)
+
+        # A new cache (next app start) reads the file instead of loading
+        second = self._cache()
+        self.assertEqual(second.get('2025-01')["total"], 1)
+        self.assertEqual(self.loads, ['2025-01'])
+
+    def test_open_month_is_memory_only_until_invalidated(self):
+        cache = self._cache()
+        cache.get('2025-03')
+        cache.get('2025-03')
+        self.assertEqual(self.loads, ['2025-03'])
+        self.assertEqual(list(pathlib.Path(self.tmp.name).iterdir()), [])
+
+        cache.invalidate()
+        self.assertEqual(cache.get('2025-03')["total"], 2)
+
+    def test_failed_load_is_not_cached(self):
+        def load(month_year):
+            self.loads.append(month_year)
+            if len(self.loads) == 1:
+                raise RuntimeError('database unavailable')
+            return {"month": month_year}
+
+        cache = ReportCache(load, self.tmp.name, today=lambda: '2025-03')
+        with self.assertRaises(RuntimeError):
+            cache.get('2025-01')
+        self.assertFalse(cache.cached('2025-01'))
+        self.assertEqual(list(pathlib.Path(self.tmp.name).iterdir()), [])
+        self.assertEqual(cache.get('2025-01'), {"month": '2025-01'})
+
+    def test_prefetch_loads_in_background(self):
+        cache = self._cache()
+        cache.get('2025-02')
+        worker = cache.prefetch(['2025-01', '2025-02', '2025-04'])  # cached and future months skipped
+        worker.join(timeout=5)
+        self.assertTrue(cache.cached('2025-01'))
+        self.assertFalse(cache.cached('2025-04'))
+        self.assertEqual(self.loads, ['2025-02', '2025-01'])
+        self.assertIsNone(cache.prefetch(['2025-01']))
+
+    def test_load_that_overlaps_invalidate_is_not_kept(self):
+        def load(month_year):
+            self.loads.append(month_year)
+            if len(self.loads) == 1:
+                cache.invalidate()  # a write lands while the month is being read
+            return {"total": len(self.loads)}
+
+        cache = ReportCache(load, self.tmp.name, today=lambda: '2025-03')
+        self.assertEqual(cache.get('2025-03'), {"total": 1})
+        self.assertFalse(cache.cached('2025-03'))
+        self.assertEqual(cache.get('2025-03'), {"total": 2})
+        self.assertTrue(cache.cached('2025-03'))
+
+    def test_get_waits_for_the_load_in_flight(self):
+        started, release = threading.Event(), threading.Event()
+
+        def load(month_year):
+            self.loads.append(month_year)
+            started.set()
+            release.wait(5)
+            return {"month": month_year}
+
+        cache = ReportCache(load, None, today=lambda: '2025-03')
+        worker = cache.prefetch(['2025-01'])
+        self.assertTrue(started.wait(5))
+        results = []
+        reader = threading.Thread(target=lambda: results.append(cache.get('2025-01')))
+        reader.start()
+        reader.join(timeout=0.2)  # still waiting: the prefetch has not finished
+        self.assertEqual(results, [])
+        release.set()
+        reader.join(timeout=5)
+        worker.join(timeout=5)
+        self.assertEqual(results, [{"month": '2025-01'}])
+        self.assertEqual(self.loads, ['2025-01'])
+
+
+if __name__ == '__main__':
+    unittest.main()
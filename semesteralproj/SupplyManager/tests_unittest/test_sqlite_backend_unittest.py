@@ -0,0 +1,109 @@
+import sys
+import pathlib
+import unittest
+
+# Ensure SupplyManager package path is available when running unittest directly
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+SUPPLY_DIR = ROOT / 'SupplyManager'
+if str(SUPPLY_DIR) not in sys.path:
+    sys.path.insert(0, str(SUPPLY_DIR))
+
+from database.Db_manager import DatabaseManager
+from database.backends import translate_sqlite
+from database.migrations import LATEST_VERSION, schema_version
+
+
+def sqlite_db():
+    db = DatabaseManager({'backend': 'sqlite', 'database': ':memory:'})
+    db.create_tables()
+    return db
+
+
+class TestSQLiteDialect(unittest.TestCase):
+    def test_placeholders_outside_literals(self):
+        sql = translate_sqlite("SELECT DATE_FORMAT(t, '%Y-%m-%d %H:%i:%s') FROM x WHERE a=%s AND b=%s")
+        self.assertEqual(sql, "SELECT DATE_FORMAT(t, '%Y-%m-%d %H:%i:%s') FROM x WHERE a=? AND b=?")
+
+    def test_ddl_rules(self):
+        sql = translate_sqlite("id INT AUTO_INCREMENT PRIMARY KEY, type ENUM('IN','OUT')")
+        self.assertEqual(sql, "id INTEGER PRIMARY KEY AUTOINCREMENT, type TEXT")
+
+    def test_upsert(self):
+        sql = translate_sqlite(
+            "INSERT INTO t (a, b) VALUES (%s, %s) ON DUPLICATE KEY UPDATE b = VALUES(b)")
+        self.assertEqual(sql, "INSERT INTO t (a, b) VALUES (?, ?) ON CONFLICT DO UPDATE SET b = excluded.b")
+
+
+class TestSQLiteBackend(unittest.TestCase):
+    def setUp(self):
+        self.db = sqlite_db()
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_migrations_apply_and_are_skipped_when_current(self):
+        self.assertEqual(schema_version(self.db), LATEST_VERSION)
+        self.assertTrue(self.db.create_tables())
+        self.assertEqual(self.db.fetch_query('SELECT * FROM users'), [])
+
+    def test_crud_and_date_functions(self):
+        self.assertTrue(self.db.execute_query(
+            "INSERT INTO supplies (name, quantity, price, last_updated) VALUES (%s, %s, %s, NOW())",
+            ('Pencil', 10, 2.5)))
+        row = self.db.fetch_one(
+            "SELECT name, quantity, DATE_FORMAT(last_updated, '%Y') AS y FROM supplies WHERE name=%s",
+            ('Pencil',))
+        self.assertEqual(row['name'], 'Pencil')
+        self.assertEqual(len(row['y']), 4)
+        self.assertFalse(self.db.execute_query('SELECT * FROM missing_table'))
+
+    def test_monthly_report_upsert(self):
+        self.db.execute_many(
+            "INSERT INTO transactions (item_id, type, qty, timestamp) VALUES (%s, %s, %s, %s)",
+            [(1, 'IN', 5, '2025-01-03 10:00:00'), (1, 'OUT', 2, '2025-01-20 10:00:00'),
+             (2, 'IN', 7, '2025-01-31 23:59:59'), (2, 'IN', 9, '2025-02-01 00:00:00')])
+        self.assertTrue(self.db.generate_monthly_report('2025-01'))
+        self.assertTrue(self.db.generate_monthly_report('2025-01'))
+        rows = {r['item_id']: r for r in self.db.get_month_report('2025-01')}
+        self.assertEqual(len(rows), 2)
+        self.assertEqual((rows[1]['total_in'], rows[1]['total_out']), (5, 2))
+        self.assertEqual(rows[2]['total_in'], 7)
+
+    def test_transaction_rollback(self):
+        with self.assertRaises(Exception):
+            with self.db.transaction():
+                self.db.execute_query("INSERT INTO supplies (name) VALUES (%s)", ('Eraser',))
+                self.db.execute_query("INSERT INTO nowhere VALUES (1)")
+        self.assertEqual(self.db.fetch_query("SELECT * FROM supplies"), [])
+
+    def test_iter_query(self):
+        self.db.execute_many("INSERT INTO supplies (name) VALUES (%s)", [(f'Item {i}',) for i in range(25)])
+        names = [r['name'] for r in self.db.iter_query("SELECT name FROM supplies ORDER BY id", chunk_size=10)]
+        self.assertEqual(len(names), 25)
+        self.assertEqual(names[0], 'Item 0')
+
+    def test_iter_query_errors(self):
+        self.assertEqual(list(self.db.iter_query("SELECT * FROM nowhere")), [])
+        with self.assertRaises(Exception):
+            list(self.db.iter_query("SELECT * FROM nowhere", raise_errors=True))
+
+    def test_fetch_errors(self):
+        self.assertEqual(self.db.fetch_query("SELECT * FROM nowhere"), [])
+        self.assertIsNone(self.db.fetch_one("SELECT * FROM nowhere"))
+        with self.assertRaises(Exception):
+            self.db.fetch_query("SELECT * FROM nowhere", raise_errors=True)
+        with self.assertRaises(Exception):
+            self.db.fetch_one("SELECT * FROM nowhere", raise_errors=True)
+
+    def test_raising_errors_block(self):
+        with self.db.raising_errors():
+            # No transaction is opened for it
+            self.assertFalse(self.db._in_transaction())
+            with self.assertRaises(Exception):
+                self.db.fetch_all("SELECT * FROM nowhere")
+            self.assertEqual(self.db.fetch_query("SELECT * FROM nowhere", raise_errors=False), [])
+        self.assertEqual(self.db.fetch_query("SELECT * FROM nowhere"), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import sys
+import pathlib
+import unittest
+from datetime import datetime
+
+# Ensure SupplyManager package path is available when running unittest directly
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+SUPPLY_DIR = ROOT / 'SupplyManager'
+if str(SUPPLY_DIR) not in sys.path:
+    sys.path.insert(0, str(SUPPLY_DIR))
+
+from database.Db_manager import DatabaseManager
+from modules.supply_manager import SupplyManager
+
+
+class TestStockHistory(unittest.TestCase):
+    def setUp(self):
+        self.db = DatabaseManager({'backend': 'sqlite', 'database': ':memory:'})
+        self.db.create_tables()
+        self.db.execute_query(
+            "INSERT INTO supplies (name, category, quantity, price, created_at) VALUES "
+            "('Pens', 'Office', 10, 1.5, '2024-12-15 08:00:00'), "
+            "('Mops', 'Cleaning', 4, 9.0, '2025-02-01 00:00:00')"
+        )
+        for item_id, kind, qty, timestamp in [
+            (1, 'IN', 10, '2024-12-15 08:00:00'),
+            (1, 'OUT', 3, '2025-01-10 12:00:00'),
+            (2, 'IN', 4, '2025-02-01 00:00:00'),
+            (1, 'IN', 5, '2025-02-05 12:00:00'),
+            (1, 'OUT', 2, '2025-03-02 12:00:00'),
+        ]:
+            self.db.log_transaction(item_id, kind, qty, timestamp=timestamp)
+        self.db.flush_ledger()
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_first_run_captures_last_closed_month(self):
+        self.assertTrue(self.db.history.ensure_snapshots(now=datetime(2025, 3, 10)))
+        rows = self.db.fetch_query("SELECT month_year, item_id, quantity FROM stock_snapshots ORDER BY item_id")
+        self.assertEqual([(r['month_year'], r['item_id'], r['quantity']) for r in rows],
+                         [('2025-02', 1, 12), ('2025-02', 2, 4)])
+
+    def test_replays_forward_and_backward_from_snapshots(self):
+        self.db.history.ensure_snapshots(now=datetime(2025, 3, 10))
+        # Before the oldest snapshot: replayed backward, Mops not created yet
+        self.assertEqual(self.db.stock_at('2025-01-20 00:00:00'), {1: 7})
+        self.assertEqual(self.db.month_end_stock('2024-12'), {1: 10})
+        # After it: replayed forward
+        self.assertEqual(self.db.stock_at(datetime(2025, 3, 5)), {1: 10, 2: 4})
+
+    def test_later_edits_do_not_change_past_months(self):
+        sm = SupplyManager(self.db)
+        january = self.db.month_end_stock('2025-01')
+        sm.update_supply(1, 50, 1.5)
+        sm.adjust_quantity(2, -1, 'Used')
+        self.assertEqual(self.db.month_end_stock('2025-01'), january)
+        self.assertEqual(january, {1: 7})
+
+        # Deleted items stay in the months they existed in
+        sm.delete_supply(2)
+        self.assertEqual(self.db.month_end_stock('2025-02'), {1: 12, 2: 4})
+        self.assertEqual([(r['name'], r['quantity'], float(r['price'])) for r in sm.get_inventory_at('2025-02')],
+                         [('Pens', 12, 1.5), ('Mops', 4, 9.0)])
+
+    def test_deleting_logs_the_remaining_stock(self):
+        sm = SupplyManager(self.db)
+        sm.delete_supply(2)
+        self.assertEqual([(r['type'], r['qty'], r['prev_qty'], r['new_qty'], r['note'])
+                          for r in sm.get_logs(item_id=2)][-1], ('OUT', 4, 4, 0, 'Deleted'))
+        # Captured after the deletion, the snapshot still holds the item
+        self.assertTrue(self.db.history.ensure_snapshots(now=datetime(2025, 3, 10)))
+        self.assertEqual(self.db.month_end_stock('2025-02'), {1: 12, 2: 4})
+        self.assertNotIn(2, self.db.month_end_stock(datetime.now().strftime('%Y-%m')))
+
+    def test_bulk_delete_keeps_past_months(self):
+        sm = SupplyManager(self.db)
+        self.assertEqual(sm.delete_supplies([1, 2])['succeeded'], 2)
+        self.assertEqual(self.db.stock_at('2025-03-05 00:00:00'), {1: 10, 2: 4})
+        self.assertEqual([r['name'] for r in sm.get_inventory_at('2025-03')], ['Pens', 'Mops'])
+
+    def test_monthly_trend_is_the_window_ending_at_the_month(self):
+        trend = self.db.get_monthly_trend('2025-03', months=4)
+        self.assertEqual([(p['month_year'], p['total_items'], p['total_value']) for p in trend], [
+            ('2024-12', 10, 15.0),
+            ('2025-01', 7, 10.5),
+            ('2025-02', 16, 54.0),
+            ('2025-03', 14, 51.0),
+        ])
+        self.assertEqual(trend[0]['label'], 'Dec 2024')
+        self.assertEqual(len(self.db.get_monthly_trend('2025-03')), 12)
+
+    def test_trend_keeps_deleted_items_in_earlier_months(self):
+        SupplyManager(self.db).delete_supply(2)
+        # Walks back from today's (live) stock, which no longer has the item
+        trend = self.db.get_monthly_trend(datetime.now().strftime('%Y-%m'), months=36)
+        points = {p['month_year']: (p['total_items'], p['total_value']) for p in trend}
+        self.assertEqual((points['2025-02'], points['2025-03']), ((16, 54.0), (14, 51.0)))
+        self.assertEqual(trend[-1]['total_items'], 10)
+
+    def test_new_supplies_log_their_opening_stock(self):
+        sm = SupplyManager(self.db)
+        sm.add_supply('Tape', 'Office', 'Acme', 6, 2.0)
+        row = sm.get_supply_by_name('Tape')
+        logs = sm.get_logs(item_id=row['id'])
+        self.assertEqual([(r['type'], r['qty'], r['prev_qty'], r['new_qty']) for r in logs], [('IN', 6, 0, 6)])
+        self.assertEqual(self.db.stock_at('2099-01-01 00:00:00')[row['id']], 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
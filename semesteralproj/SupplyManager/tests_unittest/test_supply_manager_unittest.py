@@ -1,6 +1,8 @@
 import sys
 import pathlib
+import threading
 import unittest
+from contextlib import contextmanager
 
 # Ensure SupplyManager package path is available when running unittest directly
 ROOT = pathlib.Path(__file__).resolve().parent.parent
@@ -8,7 +10,9 @@ SUPPLY_DIR = ROOT / 'SupplyManager'
 if str(SUPPLY_DIR) not in sys.path:
     sys.path.insert(0, str(SUPPLY_DIR))
 
-from modules.supply_manager import SupplyManager
+import modules.supply_manager as supply_module
+from modules.supply_manager import SupplyManager, SupplyCatalog, Supply, SupplySnapshot
+from database.Db_manager import DatabaseManager
 
 
 class DummyDB:
@@ -27,6 +31,10 @@ class DummyDB:
         self.queries.append((q, p))
         return True
 
+    @contextmanager
+    def transaction(self):
+        yield self
+
 
 class SupplyManagerTests(unittest.TestCase):
     def test_to_dict_tuple_and_none(self):
@@ -49,5 +57,305 @@ class SupplyManagerTests(unittest.TestCase):
         self.assertEqual(int(params[4]), 3)
 
 
+class SupplyCatalogTests(unittest.TestCase):
+    def setUp(self):
+        self.db = DatabaseManager({'backend': 'sqlite', 'database': ':memory:'})
+        self.db.create_tables()
+        self.sm = SupplyManager(self.db, use_catalog=True, catalog_ttl=60)
+        self.sm.add_supply('Ball Pen', 'Office', 'Acme', 10, 1.5, sku='PEN-1')
+        self.sm.add_supply('Stapler', 'Office', 'Acme', 2, 9.0)
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_indexes(self):
+        self.assertEqual(self.sm.get_supply_by_name('  ball PEN ')['sku'], 'PEN-1')
+        self.assertEqual(self.sm.get_supply_by_sku('pen-1')['name'], 'Ball Pen')
+        self.assertEqual([r['name'] for r in self.sm.get_supplies_by_category('office')],
+                         ['Ball Pen', 'Stapler'])
+        self.assertIsNone(self.sm.get_supply_by_name('Eraser'))
+
+    def test_lookups_do_not_query(self):
+        self.sm.get_supplies()
+        self.db.stats(reset=True)
+        for _ in range(5):
+            self.sm.get_supply_by_id(1)
+            self.sm.get_supply_by_name('Stapler')
+        self.assertEqual(self.db.stats(), [])
+
+    def test_writes_keep_catalog_coherent(self):
+        self.sm.update_supply(2, 7, 9.5)
+        self.assertEqual(self.sm.get_supply_by_id(2)['quantity'], 7)
+        self.sm.delete_supply(1)
+        self.assertIsNone(self.sm.get_supply_by_name('Ball Pen'))
+        self.assertEqual(len(self.sm.get_supplies()), 1)
+
+    def test_refresh_sees_other_writers(self):
+        self.sm.get_supplies()
+        self.db.execute("DELETE FROM supplies WHERE id=%s", (2,))
+        self.db.execute("INSERT INTO supplies (name, last_updated) VALUES (%s, %s)",
+                        ('Eraser', '2999-01-01 00:00:00'))
+        self.sm.refresh_catalog()
+        self.assertEqual(sorted(r['name'] for r in self.sm.get_supplies()), ['Ball Pen', 'Eraser'])
+
+    def test_refresh_sees_writes_that_keep_last_updated(self):
+        db = DatabaseManager({'backend': 'sqlite', 'database': ':memory:', 'query_cache_size': 64})
+        db.create_tables()
+        sm = SupplyManager(db, use_catalog=True, catalog_ttl=60)
+        sm.add_supply('Ball Pen', 'Office', 'Acme', 10, 1.5)
+        sm.get_supplies()
+        db.execute("UPDATE supplies SET quantity = 4, version = version + 1 WHERE id = 1")
+        sm.refresh_catalog()
+        self.assertEqual(sm.get_supply_by_id(1)['quantity'], 4)
+        db.close()
+
+    def test_inventory_summary_is_one_query(self):
+        self.db.execute("UPDATE supplies SET last_updated=%s WHERE id=%s", ('2025-01-15 09:00:00', 2))
+        self.db.stats(reset=True)
+        summary = self.sm.get_inventory_summary()
+        self.assertEqual(len(self.db.stats()), 1)
+        self.assertEqual(summary, {'total_items': 12, 'total_value': 33.0, 'low_stock': 1,
+                                   'categories': 1, 'item_count': 2})
+        january = self.sm.get_inventory_summary('2025-01')
+        self.assertEqual((january['total_items'], january['low_stock']), (2, 1))
+        self.assertEqual(self.sm.get_inventory_summary('2024-12')['item_count'], 0)
+
+    def test_supplies_since_returns_changes_and_deletions(self):
+        full = self.sm.get_supplies_since()
+        self.assertEqual(len(full['changed']), 2)
+        self.db.execute("UPDATE supplies SET last_updated=%s", ('2025-01-01 00:00:00',))
+        self.db.execute("UPDATE supplies SET quantity=%s, last_updated=%s WHERE id=%s",
+                        (4, '2025-03-01 00:00:00', 2))
+        self.sm.delete_supply(1)
+        delta = self.sm.get_supplies_since('2025-02-01 00:00:00')
+        self.assertEqual([r['id'] for r in delta['changed']], [2])
+        self.assertEqual(delta['deleted'], [1])
+        self.assertGreater(delta['watermark'], '2025-03-01 00:00:00')
+        later = self.sm.get_supplies_since(delta['watermark'])
+        self.assertEqual((later['changed'], later['deleted']), ([], [1]))
+
+    def test_rename_moves_name_index(self):
+        catalog = SupplyCatalog()
+        catalog.load([{'id': 1, 'name': 'Pen', 'sku': 'A', 'category': 'X'}])
+        catalog.put({'id': 1, 'name': 'Marker', 'sku': 'A', 'category': 'X'})
+        self.assertIsNone(catalog.find_name('pen'))
+        self.assertEqual(catalog.find_name('marker')['id'], 1)
+
+    def test_snapshot_is_reused_until_a_write(self):
+        snapshot = self.sm.get_snapshot()
+        self.assertIsInstance(self.sm.catalog.by_id[1], Supply)
+        self.assertIs(self.sm.get_snapshot(), snapshot)
+        self.assertEqual(snapshot.total_items(), 12)
+        self.sm.update_supply(2, 7, 9.5)
+        self.assertIsNot(self.sm.get_snapshot(), snapshot)
+        self.assertEqual(self.sm.get_snapshot().total_items(), 17)
+        # Lookups still hand out plain, detached dicts with every column
+        row = self.sm.get_supply_by_id(1)
+        row['quantity'] = 0
+        self.assertEqual(self.sm.get_supply_by_id(1)['quantity'], 10)
+        self.assertIn('threshold', row)
+
+
+class AdjustQuantityTests(unittest.TestCase):
+    def setUp(self):
+        self.db = DatabaseManager({'backend': 'sqlite', 'database': ':memory:'})
+        self.db.create_tables()
+        self.sm = SupplyManager(self.db)
+        self.sm.add_supply('Ball Pen', 'Office', 'Acme', 10, 1.5)
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_adjust_updates_and_logs(self):
+        row = self.sm.adjust_quantity(1, -4, 'Issued to lab')
+        self.assertEqual((row['quantity'], row['version']), (6, 1))
+        self.db.flush_ledger()
+        logs = self.db.fetch_all("SELECT * FROM transactions WHERE item_id=%s ORDER BY id", (1,))
+        self.assertEqual([(log['type'], log['qty'], log['note']) for log in logs],
+                         [('IN', 10, 'Initial stock'), ('OUT', 4, 'Issued to lab')])
+
+    def test_rejects_negative_stock_and_stale_version(self):
+        self.assertIsNone(self.sm.adjust_quantity(1, -11))
+        self.assertIsNotNone(self.sm.adjust_quantity(1, 1, expected_version=0))
+        self.assertIsNone(self.sm.adjust_quantity(1, 1, expected_version=0))
+        self.assertEqual(self.sm.get_supply_by_id(1)['quantity'], 11)
+        self.db.flush_ledger()
+        # The opening stock and the one applied adjustment
+        self.assertEqual(self.db.fetch_one("SELECT COUNT(*) AS n FROM transactions")['n'], 2)
+
+    def test_concurrent_adjustments_are_not_lost(self):
+        def worker():
+            for _ in range(25):
+                self.sm.adjust_quantity(1, 1)
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(self.sm.get_supply_by_id(1)['quantity'], 110)
+
+
+class BulkSupplyTests(unittest.TestCase):
+    def setUp(self):
+        self.db = DatabaseManager({'backend': 'sqlite', 'database': ':memory:'})
+        self.db.create_tables()
+        self.sm = SupplyManager(self.db, use_catalog=True, catalog_ttl=60)
+
+    def tearDown(self):
+        self.db.close()
+
+    def _items(self, n):
+        return [{'name': f'Item {i}', 'category': 'Bulk', 'supplier': 'Acme', 'quantity': i, 'price': 1.0}
+                for i in range(n)]
+
+    def test_add_supplies_in_chunks(self):
+        items = self._items(25)
+        items[3] = {'name': '', 'quantity': 1, 'price': 1}
+        items[7]['quantity'] = 'many'
+        result = self.sm.add_supplies(items, chunk_size=10)
+        self.assertEqual(result['succeeded'], 23)
+        self.assertEqual([f['index'] for f in result['failed']], [3, 7])
+        self.assertEqual(len(self.sm.get_supplies()), 23)
+
+    def test_rejected_row_does_not_fail_its_chunk(self):
+        self.db.execute("""
+            CREATE TRIGGER reject_bad BEFORE INSERT ON supplies WHEN NEW.name = 'Bad'
+            BEGIN SELECT RAISE(ABORT, 'rejected'); END
+        """)
+        items = self._items(4)
+        items[2]['name'] = 'Bad'
+        result = self.sm.add_supplies(items)
+        self.assertEqual(result['succeeded'], 3)
+        self.assertEqual(result['failed'][0]['index'], 2)
+        self.assertEqual(self.db.fetch_one("SELECT COUNT(*) AS n FROM supplies")['n'], 3)
+
+    def test_query_supplies_pages_and_filters(self):
+        self.sm.add_supplies(self._items(25))
+        self.sm.add_supplies([{'name': 'Marker', 'category': 'Art', 'supplier': 'Zed', 'quantity': 1,
+                               'price': 2, 'min_quantity': 5}])
+        seen, after = [], None
+        while True:
+            page = self.sm.query_supplies(sort='quantity', descending=True, after=after, limit=10)
+            seen += [r['id'] for r in page['rows']]
+            after = page['next_after']
+            if after is None:
+                break
+        self.assertEqual(len(seen), 26)
+        self.assertEqual(len(set(seen)), 26)
+        self.assertEqual(seen[0], 25)
+
+        page = self.sm.query_supplies(offset=20, limit=10)
+        self.assertEqual((len(page['rows']), page['next_offset']), (6, None))
+        self.assertEqual([r['name'] for r in self.sm.query_supplies(text='zed')['rows']], ['Marker'])
+        self.assertEqual([r['name'] for r in self.sm.query_supplies(text=' mark')['rows']], ['Marker'])
+        self.assertEqual(self.sm.query_supplies(text='arker')['rows'], [])  # prefix, not substring
+        self.assertEqual(len(self.sm.query_supplies(text='Item 1')['rows']), 11)
+        self.assertEqual(self.sm.query_supplies(text='Item_1')['rows'], [])  # _ is not a wildcard
+        self.assertEqual(self.sm.query_supplies(text='%')['rows'], [])
+        self.assertEqual(len(self.sm.query_supplies(category='Bulk', low_stock_only=True)['rows']), 6)
+        self.assertEqual(self.sm.get_categories(), ['Art', 'Bulk'])
+        with self.assertRaises(ValueError):
+            self.sm.query_supplies(sort='price; DROP TABLE supplies')
+
+    def test_update_and_delete_supplies(self):
+        self.sm.add_supplies(self._items(5))
+        result = self.sm.update_supplies([
+            {'id': 1, 'quantity': 50, 'price': 2.5},
+            {'id': 2, 'quantity': 60, 'price': 3.0, 'min_quantity': 1},
+            {'id': 99, 'quantity': 1, 'price': 1.0},
+        ])
+        self.assertEqual(result['succeeded'], 2)
+        self.assertEqual(result['failed'][0]['index'], 2)
+        self.assertEqual(self.sm.get_supply_by_id(1)['quantity'], 50)
+        self.assertEqual(self.sm.get_supply_by_id(2)['min_quantity'], 1)
+        self.assertEqual(self.sm.get_supply_by_id(1)['min_quantity'], 5)
+        self.assertEqual(self.sm.get_supply_by_id(3)['quantity'], 2)
+
+        result = self.sm.delete_supplies([4, 5, 42])
+        self.assertEqual(result['succeeded'], 2)
+        self.assertEqual(result['failed'][0]['index'], 2)
+        self.assertEqual(sorted(r['id'] for r in self.sm.get_supplies()), [1, 2, 3])
+
+    def test_bulk_writes_are_in_the_ledger(self):
+        self.sm.add_supplies(self._items(3))
+        self.sm.update_supplies([{'id': 3, 'quantity': 1, 'price': 1.0}, {'id': 2, 'quantity': 1, 'price': 2.0}])
+        self.assertEqual([(r['item_id'], r['type'], r['qty'], r['prev_qty'], r['new_qty'], r['note'])
+                          for r in self.sm.get_logs()], [
+            (2, 'IN', 1, 0, 1, 'Initial stock'),
+            (3, 'IN', 2, 0, 2, 'Initial stock'),
+            (3, 'OUT', 1, 2, 1, 'Edited'),
+        ])
+        self.assertEqual(self.db.stock_at('2099-01-01 00:00:00'), {1: 0, 2: 1, 3: 1})
+
+    def test_past_months_ignore_later_bulk_edits(self):
+        self.sm.add_supplies([{'name': 'Pens', 'quantity': 10, 'price': 1.0}])
+        self.db.execute("UPDATE supplies SET created_at = %s", ('2025-01-10 09:00:00',))
+        self.db.execute("UPDATE transactions SET timestamp = %s", ('2025-01-10 09:00:00',))
+        self.sm.update_supplies([{'id': 1, 'quantity': 6, 'price': 1.0}])
+        self.assertEqual(self.db.month_end_stock('2025-01'), {1: 10})
+
+
+class SupplyEventsTests(unittest.TestCase):
+    def setUp(self):
+        self.db = DatabaseManager({'backend': 'sqlite', 'database': ':memory:'})
+        self.db.create_tables()
+        self.sm = SupplyManager(self.db)
+        self.seen = []
+        self.sm.events.created.connect(lambda row: self.seen.append(('created', row['name'])))
+        self.sm.events.updated.connect(lambda row: self.seen.append(('updated', row['quantity'])))
+        self.sm.events.deleted.connect(lambda supply_id: self.seen.append(('deleted', supply_id)))
+        self.sm.events.reset.connect(lambda: self.seen.append(('reset', None)))
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_writes_emit_events(self):
+        self.sm.add_supply('Pen', 'Office', 'Acme', 4, 1.0)
+        self.sm.update_supply(1, 6, 1.0)
+        self.sm.adjust_quantity(1, -1)
+        self.sm.delete_supply(1)
+        self.sm.delete_supply(1)
+        self.sm.add_supplies([{'name': 'Clip', 'quantity': 1, 'price': 1}])
+        self.assertEqual(self.seen, [('created', 'Pen'), ('updated', 6), ('updated', 5),
+                                     ('deleted', 1), ('reset', None)])
+
+
+class SupplySnapshotTests(unittest.TestCase):
+    ROWS = [
+        {'id': 1, 'name': 'Pen', 'category': 'Office', 'quantity': 10, 'min_quantity': 5, 'price': 1.5},
+        {'id': 2, 'name': 'Glue', 'category': 'Art', 'quantity': 2, 'min_quantity': 5, 'price': 3.0},
+        (3, 'SKU3', 'Clip', 'Office', 'Acme', 5, 5, 0.5, None),
+    ]
+
+    def test_supply_record(self):
+        supply = Supply.from_row(self.ROWS[2])
+        self.assertEqual((supply.name, supply.quantity, supply.value), ('Clip', 5, 2.5))
+        self.assertTrue(supply.low_stock)
+        self.assertEqual(supply.get('category'), 'Office')
+        self.assertFalse(hasattr(supply, '__dict__'))
+
+    def _check(self):
+        snapshot = SupplySnapshot(self.ROWS)
+        self.assertEqual(len(snapshot), 3)
+        self.assertEqual(snapshot.total_items(), 17)
+        self.assertAlmostEqual(snapshot.total_value(), 23.5)
+        self.assertEqual(list(snapshot.low_stock_mask()), [False, True, True])
+        self.assertEqual(snapshot.low_stock_count(), 2)
+        self.assertEqual(snapshot.category_sums(), {'Office': 15, 'Art': 2})
+        self.assertEqual(snapshot.category_sums('value'), {'Office': 17.5, 'Art': 6.0})
+        self.assertEqual(SupplySnapshot().total_value(), 0.0)
+
+    def test_aggregations(self):
+        self._check()
+
+    def test_aggregations_without_numpy(self):
+        original = supply_module.np
+        supply_module.np = None
+        try:
+            self._check()
+        finally:
+            supply_module.np = original
+
+
 if __name__ == '__main__':
     unittest.main()
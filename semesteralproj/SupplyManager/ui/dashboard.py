@@ -8,7 +8,7 @@ from PyQt6.QtWidgets import (
     QTableWidgetItem, QLabel, QPushButton, QTableWidget, QMessageBox,
     QLineEdit, QComboBox
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QColor, QCursor, QPainter
 from PyQt6.uic import loadUi
 
@@ -104,6 +104,80 @@ class Dashboard(QMainWindow):
         self.setup_inventory_table()
         self.refresh_dashboard()
         self.setup_searchbar()
+        self.connect_supply_events()
+
+    # ============================
+    # Live updates from SupplyManager.events
+    # ============================
+    def connect_supply_events(self):
+        """Patch single rows on change events instead of reloading everything"""
+        events = getattr(self.supply_manager, "events", None)
+        self._live_updates = events is not None
+        self._event_connections = []
+        if not self._live_updates:
+            return
+        for signal, slot in ((events.created, self._on_supply_created),
+                             (events.updated, self._on_supply_updated),
+                             (events.deleted, self._on_supply_deleted),
+                             (events.reset, self.refresh_dashboard)):
+            self._event_connections.append((signal, signal.connect(slot)))
+
+    def disconnect_supply_events(self):
+        """Stop listening; the events object outlives the pages of one login"""
+        for signal, connection in getattr(self, "_event_connections", []):
+            try:
+                signal.disconnect(connection)
+            except (TypeError, RuntimeError):
+                pass
+        self._event_connections = []
+        self._live_updates = False
+
+    def closeEvent(self, event):
+        self.disconnect_supply_events()
+        super().closeEvent(event)
+
+    def _after_write(self):
+        # Without change events the page has to reload itself
+        if not getattr(self, "_live_updates", False):
+            self.refresh_dashboard()
+
+    def _matches_filter(self, item):
+        search_text, category = self._current_filter()
+        if category and item.get("category") != category:
+            return False
+        if search_text:
+            # Same prefix match as query_supplies()
+            needle = search_text.lower()
+            return any(str(item.get(key) or "").lower().startswith(needle) for key in ("sku", "name", "supplier"))
+        return True
+
+    def _on_supply_created(self, item):
+        # Rows are ordered by id, so a new row belongs at the end once the last page is loaded
+        if (hasattr(self, "inventoryTable") and getattr(self, "_next_after", None) is None
+                and self._matches_filter(item)):
+            table = self.inventoryTable
+            row = table.rowCount()
+            table.insertRow(row)
+            self._fill_inventory_row(table, row, item)
+        self.update_summary_cards()
+        self._add_to_graph(item)
+
+    def _on_supply_updated(self, item):
+        row = getattr(self, "_row_of", {}).get(item["id"])
+        if row is not None:
+            self._fill_inventory_row(self.inventoryTable, row, item)
+        self.update_summary_cards()
+        self._patch_graph(item)
+
+    def _on_supply_deleted(self, supply_id):
+        row = getattr(self, "_row_of", {}).pop(supply_id, None)
+        if row is not None:
+            self.inventoryTable.removeRow(row)
+            for key, index in self._row_of.items():
+                if index > row:
+                    self._row_of[key] = index - 1
+        self.update_summary_cards()
+        self._remove_from_graph(supply_id)
 
 # ============================
     # Search Bar Setup and Filter
@@ -112,56 +186,30 @@ class Dashboard(QMainWindow):
         """Setup search bar and category filter"""
         if hasattr(self, "lineEdit"):
             self.lineEdit.setPlaceholderText("Search by name or SKU...")
-            self.lineEdit.textChanged.connect(self.filter_inventory)
+            # Query once typing pauses, not on every keystroke
+            self._search_timer = QTimer(self)
+            self._search_timer.setSingleShot(True)
+            self._search_timer.setInterval(250)
+            self._search_timer.timeout.connect(self.filter_inventory)
+            self.lineEdit.textChanged.connect(self._search_timer.start)
         
         if hasattr(self, "comboBox"):
             self.comboBox.clear()
             self.comboBox.addItem("All Categories")
-            self.categories = set()
-            supplies = self.supply_manager.get_supplies()
-            for item in supplies:
-                category = item.get("category", "Other")
-                if category not in self.categories:
-                    self.categories.add(category)
-                    self.comboBox.addItem(category)
+            self.comboBox.addItems(self.supply_manager.get_categories())
             self.comboBox.currentTextChanged.connect(self.filter_inventory)
-        
-        # Store all supplies for filtering
-        self.all_supplies = self.supply_manager.get_supplies()
 
 
     def filter_inventory(self):
-        """Filter table by search text and category"""
-        if not hasattr(self, "inventoryTable"):
-            return
+        """Re-query the table with the search text and category (filtered by the DB)"""
+        self.load_inventory_to_table()
 
-        search_text = self.lineEdit.text().lower().strip() if hasattr(self, "lineEdit") else ""
+    def _current_filter(self):
+        search_text = self.lineEdit.text().strip() if hasattr(self, "lineEdit") else ""
         selected_category = self.comboBox.currentText() if hasattr(self, "comboBox") else "All Categories"
-
-        table = self.inventoryTable
-        
-        for row, item in enumerate(self.all_supplies):
-            sku = item.get("sku", "").lower()
-            name = item.get("name", "").lower()
-            supplier = item.get("supplier", "").lower()
-            category = item.get("category", "Other")
-
-            # Check if matches search text
-            matches_search = (
-                search_text == "" or
-                search_text in sku or
-                search_text in name or
-                search_text in supplier
-            )
-
-            # Check if matches category
-            matches_category = (
-                selected_category == "All Categories" or
-                category == selected_category
-            )
-
-            # Show/hide row based on filters
-            table.setRowHidden(row, not (matches_search and matches_category))
+        if selected_category in ("", "All Categories"):
+            selected_category = None
+        return search_text or None, selected_category
 
 
     # ============================
@@ -223,14 +271,17 @@ class Dashboard(QMainWindow):
         # Check if product exists
         existing = self.supply_manager.get_supply_by_name(data["name"])
         if existing:
-            new_qty = existing["quantity"] + qty
-            self.supply_manager.update_supply(existing["id"], new_qty, price, min_qty)
+            adjusted = self.supply_manager.adjust_quantity(
+                existing["id"], qty, "Restock", price=price, min_quantity=min_qty
+            )
+            if adjusted is None and hasattr(self, "outputBox"):
+                self.outputBox.append("⚠️ Stock update failed, please try again.")
         else:
             self.supply_manager.add_supply(
                 data["name"], data["category"], data["supplier"], qty, price, sku, min_qty
             )
 
-        self.refresh_dashboard()
+        self._after_write()
 
 
     # ============================
@@ -258,29 +309,26 @@ class Dashboard(QMainWindow):
     # Summary Cards
     # ============================
     def update_summary_cards(self):
-        supplies = self.supply_manager.get_supplies()
-        if not supplies:
+        # All four cards come from one aggregate query
+        summary = self.supply_manager.get_inventory_summary()
+        if not summary["item_count"]:
             return
 
         # Total items
-        total_items = sum(item.get("quantity", 0) for item in supplies)
         if hasattr(self, "items"):
-            self.items.setText(str(total_items))
+            self.items.setText(str(summary["total_items"]))
 
         # Low stock
-        low_stock_count = sum(1 for item in supplies if item.get("quantity", 0) <= item.get("min_quantity", 5))
         if hasattr(self, "lowstock"):
-            self.lowstock.setText(str(low_stock_count))
+            self.lowstock.setText(str(summary["low_stock"]))
 
         # Total value
-        total_value = sum(item.get("quantity", 0) * item.get("price", 0.0) for item in supplies)
         if hasattr(self, "value"):
-            self.value.setText(f"${total_value:.2f}")
+            self.value.setText(f"${summary['total_value']:.2f}")
 
         # Distinct categories
-        distinct_categories = set(item.get("category", "Other") for item in supplies)
         if hasattr(self, "category"):
-            self.category.setText(str(len(distinct_categories)))
+            self.category.setText(str(summary["categories"]))
 
 
     # ============================
@@ -299,6 +347,8 @@ class Dashboard(QMainWindow):
         ])
         table.verticalHeader().setVisible(False)
         table.setShowGrid(False)
+        # Rows are loaded a page at a time; scrolling to the bottom fetches the next page
+        table.verticalScrollBar().valueChanged.connect(self._on_inventory_scrolled)
         table.setAlternatingRowColors(True)
         table.setWordWrap(False)
         table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
@@ -352,96 +402,120 @@ class Dashboard(QMainWindow):
     # ============================
     # Load table data
     # ============================
+    PAGE_SIZE = 100
+
     def load_inventory_to_table(self):
         if not hasattr(self, "inventoryTable"):
             return
 
-        table: QTableWidget = self.inventoryTable
-        supplies = self.supply_manager.get_supplies()
-        table.setRowCount(len(supplies))
-
-        for row, item in enumerate(supplies):
-            sku_item = QTableWidgetItem(item.get("sku", ""))
-            sku_item.setBackground(QColor(255, 255, 255))
-            sku_item.setForeground(QColor(0, 0, 0))
-            table.setItem(row, 0, sku_item)
-
-            name_item = QTableWidgetItem(item.get("name", ""))
-            name_item.setBackground(QColor(255, 255, 255))
-            name_item.setForeground(QColor(0, 0, 0))
-            table.setItem(row, 1, name_item)
-
-            cat = item.get("category", "Other")
-            pill = self.create_category_pill(cat)
-            table.setCellWidget(row, 2, pill)
-
-            qty_item = QTableWidgetItem(str(item.get("quantity", 0)))
-            qty_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            qty_item.setBackground(QColor(255, 255, 255))
-            qty_item.setForeground(QColor(0, 0, 0))
-            table.setItem(row, 3, qty_item)
-
-            min_qty_item = QTableWidgetItem(str(item.get("min_quantity", 5)))
-            min_qty_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            min_qty_item.setBackground(QColor(255, 255, 255))
-            min_qty_item.setForeground(QColor(0, 0, 0))
-            table.setItem(row, 4, min_qty_item)
-
-            status_item = QTableWidgetItem()
-            if item["quantity"] <= item.get("min_quantity", 5):
-                status_item.setText("🔴 Low Stock")
-                status_item.setBackground(QColor(255, 228, 196))
-                status_item.setForeground(QColor(168, 93, 0))
-            else:
-                status_item.setText("✅ In Stock")
-                status_item.setBackground(QColor(209, 247, 214))
-                status_item.setForeground(QColor(26, 127, 55))
-            status_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            table.setItem(row, 5, status_item)
-
-            price_item = QTableWidgetItem(f"${item['price']:.2f}")
-            price_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            price_item.setBackground(QColor(255, 255, 255))
-            price_item.setForeground(QColor(0, 0, 0))
-            table.setItem(row, 6, price_item)
-
-            supplier_item = QTableWidgetItem(item.get("supplier", ""))
-            supplier_item.setBackground(QColor(255, 255, 255))
-            supplier_item.setForeground(QColor(0, 0, 0))
-            table.setItem(row, 7, supplier_item)
-
-            last_updated = item.get("last_updated", "N/A")
-            if last_updated and last_updated != "N/A":
-                try:
-                    if isinstance(last_updated, datetime.datetime):
-                        last_updated = last_updated.strftime("%Y-%m-%d %H:%M:%S")
-                    elif isinstance(last_updated, datetime.date):
-                        last_updated = last_updated.strftime("%Y-%m-%d") + " 00:00:00"
-                    else:
-                        last_updated = str(last_updated)
-                except Exception:
-                    last_updated = str(last_updated)
-            updated_item = QTableWidgetItem(last_updated)
-            updated_item.setBackground(QColor(255, 255, 255))
-            updated_item.setForeground(QColor(0, 0, 0))
-            table.setItem(row, 8, updated_item)
+        self.inventoryTable.setRowCount(0)
+        self._next_after = None
+        self._row_of = {}  # supply id -> table row
+        self._load_inventory_page()
 
-            # Action buttons
-            edit_btn = QPushButton("✏️")
-            edit_btn.setFixedWidth(36)
-            edit_btn.clicked.connect(self._make_edit_handler(item["id"]))
+    def _load_inventory_page(self):
+        table: QTableWidget = self.inventoryTable
+        search_text, category = self._current_filter()
+        page = self.supply_manager.query_supplies(
+            text=search_text, category=category,
+            after=self._next_after, limit=self.PAGE_SIZE
+        )
+        self._next_after = page["next_after"]
 
-            delete_btn = QPushButton("🗑️")
-            delete_btn.setFixedWidth(36)
-            delete_btn.clicked.connect(self._make_delete_handler(item["id"]))
+        start = table.rowCount()
+        table.setRowCount(start + len(page["rows"]))
+        for offset, item in enumerate(page["rows"]):
+            self._fill_inventory_row(table, start + offset, item)
 
-            action_container = QWidget()
-            action_layout = QHBoxLayout(action_container)
-            action_layout.addWidget(edit_btn)
-            action_layout.addWidget(delete_btn)
-            action_layout.setContentsMargins(0, 0, 0, 0)
-            action_layout.setSpacing(6)
-            table.setCellWidget(row, 9, action_container)
+    def _on_inventory_scrolled(self, value):
+        if getattr(self, "_next_after", None) is None:
+            return
+        if value >= self.inventoryTable.verticalScrollBar().maximum():
+            self._load_inventory_page()
+
+    def _fill_inventory_row(self, table, row, item):
+        self._row_of[item["id"]] = row
+        sku_item = QTableWidgetItem(item.get("sku", ""))
+        sku_item.setBackground(QColor(255, 255, 255))
+        sku_item.setForeground(QColor(0, 0, 0))
+        table.setItem(row, 0, sku_item)
+
+        name_item = QTableWidgetItem(item.get("name", ""))
+        name_item.setBackground(QColor(255, 255, 255))
+        name_item.setForeground(QColor(0, 0, 0))
+        table.setItem(row, 1, name_item)
+
+        cat = item.get("category", "Other")
+        pill = self.create_category_pill(cat)
+        table.setCellWidget(row, 2, pill)
+
+        qty_item = QTableWidgetItem(str(item.get("quantity", 0)))
+        qty_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        qty_item.setBackground(QColor(255, 255, 255))
+        qty_item.setForeground(QColor(0, 0, 0))
+        table.setItem(row, 3, qty_item)
+
+        min_qty_item = QTableWidgetItem(str(item.get("min_quantity", 5)))
+        min_qty_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        min_qty_item.setBackground(QColor(255, 255, 255))
+        min_qty_item.setForeground(QColor(0, 0, 0))
+        table.setItem(row, 4, min_qty_item)
+
+        status_item = QTableWidgetItem()
+        if item["quantity"] <= item.get("min_quantity", 5):
+            status_item.setText("🔴 Low Stock")
+            status_item.setBackground(QColor(255, 228, 196))
+            status_item.setForeground(QColor(168, 93, 0))
+        else:
+            status_item.setText("✅ In Stock")
+            status_item.setBackground(QColor(209, 247, 214))
+            status_item.setForeground(QColor(26, 127, 55))
+        status_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        table.setItem(row, 5, status_item)
+
+        price_item = QTableWidgetItem(f"${item['price']:.2f}")
+        price_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        price_item.setBackground(QColor(255, 255, 255))
+        price_item.setForeground(QColor(0, 0, 0))
+        table.setItem(row, 6, price_item)
+
+        supplier_item = QTableWidgetItem(item.get("supplier", ""))
+        supplier_item.setBackground(QColor(255, 255, 255))
+        supplier_item.setForeground(QColor(0, 0, 0))
+        table.setItem(row, 7, supplier_item)
+
+        last_updated = item.get("last_updated", "N/A")
+        if last_updated and last_updated != "N/A":
+            try:
+                if isinstance(last_updated, datetime.datetime):
+                    last_updated = last_updated.strftime("%Y-%m-%d %H:%M:%S")
+                elif isinstance(last_updated, datetime.date):
+                    last_updated = last_updated.strftime("%Y-%m-%d") + " 00:00:00"
+                else:
+                    last_updated = str(last_updated)
+            except Exception:
+                last_updated = str(last_updated)
+        updated_item = QTableWidgetItem(last_updated)
+        updated_item.setBackground(QColor(255, 255, 255))
+        updated_item.setForeground(QColor(0, 0, 0))
+        table.setItem(row, 8, updated_item)
+
+        # Action buttons
+        edit_btn = QPushButton("✏️")
+        edit_btn.setFixedWidth(36)
+        edit_btn.clicked.connect(self._make_edit_handler(item["id"]))
+
+        delete_btn = QPushButton("🗑️")
+        delete_btn.setFixedWidth(36)
+        delete_btn.clicked.connect(self._make_delete_handler(item["id"]))
+
+        action_container = QWidget()
+        action_layout = QHBoxLayout(action_container)
+        action_layout.addWidget(edit_btn)
+        action_layout.addWidget(delete_btn)
+        action_layout.setContentsMargins(0, 0, 0, 0)
+        action_layout.setSpacing(6)
+        table.setCellWidget(row, 9, action_container)
 
 
     # Button callback helpers
@@ -461,7 +535,7 @@ class Dashboard(QMainWindow):
         )
         if reply == QMessageBox.StandardButton.Yes:
             self.supply_manager.delete_supply(item_id)
-            self.refresh_dashboard()
+            self._after_write()
 
     # Edit item
     def edit_item(self, item_id):
@@ -478,19 +552,20 @@ class Dashboard(QMainWindow):
                 price = item.get("price", 0.0)
             min_qty = _parse_int(data.get("min_quantity", item.get("min_quantity", 5)), item.get("min_quantity", 5))
             self.supply_manager.update_supply(item_id, qty, price, min_qty)
-            self.refresh_dashboard()
+            self._after_write()
 
 
     # ============================
     # Charts (Bar + Pie)
     # ============================
     def update_graph(self):
-        supplies = self.supply_manager.get_supplies()
-        if not supplies:
+        snapshot = self.supply_manager.get_snapshot()
+        self._bar_set = None
+        if not len(snapshot):
             return
 
-        names = [item["name"] for item in supplies]
-        quantities = [item["quantity"] for item in supplies]
+        names = list(snapshot.names)
+        quantities = list(snapshot.quantity)
 
         # Bar chart
         bar_set = QBarSet("Stock Quantity")
@@ -515,6 +590,7 @@ class Dashboard(QMainWindow):
 
         axis_y = QValueAxis()
         axis_y.setRange(0, max(quantities) + 10)
+        self._bar_axis_y = axis_y
         axis_y.setTitleText("Quantity")
         chart.addAxis(axis_y, Qt.AlignmentFlag.AlignLeft)
         series.attachAxis(axis_y)
@@ -524,16 +600,26 @@ class Dashboard(QMainWindow):
         bar_view.setMinimumSize(500, 350)
 
         # Pie chart
-        category_totals = {}
-        for item in supplies:
-            category = item["category"]
-            category_totals[category] = category_totals.get(category, 0) + item["quantity"]
+        category_totals = snapshot.category_sums("quantity")
 
         pie_series = QPieSeries()
+        self._pie_series = pie_series
+        self._pie_slices = {}
         for cat, qty in category_totals.items():
             slice = QPieSlice(f"{cat} ({qty})", qty)
             slice.setLabelVisible(True)
             pie_series.append(slice)
+            self._pie_slices[cat] = slice
+
+        # What _patch_graph() and friends need to update one product in place
+        self._bar_set = bar_set
+        self._bar_axis_x = axis_x
+        self._bar_names = names
+        self._bar_quantities = quantities
+        self._chart_rows = {
+            supply_id: (names[i], snapshot.categories[snapshot.category_codes[i]], i)
+            for i, supply_id in enumerate(snapshot.ids)
+        }
 
         pie_chart = QChart()
         pie_chart.addSeries(pie_series)
@@ -554,6 +640,77 @@ class Dashboard(QMainWindow):
         self.graph_layout.addWidget(bar_view)
         self.pie_layout.addWidget(pie_view)
 
+    def _patch_graph(self, item):
+        """Move one product's bar and its category's pie slice; rebuild if the layout changes"""
+        known = getattr(self, "_chart_rows", {}).get(item["id"]) if getattr(self, "_bar_set", None) else None
+        if known is None:
+            self.update_graph()
+            return
+        name, category, index = known
+        if name != item.get("name") or category != item.get("category"):
+            self.update_graph()
+            return
+
+        qty = int(item.get("quantity", 0))
+        old_qty = self._bar_quantities[index]
+        self._bar_quantities[index] = qty
+        self._bar_set.replace(index, qty)
+        if qty + 10 > self._bar_axis_y.max():
+            self._bar_axis_y.setMax(qty + 10)
+        self._add_to_slice(category, qty - old_qty)
+
+    def _add_to_graph(self, item):
+        """Append a new product's bar (ids ascend, so it goes last) and grow its category's slice"""
+        name = str(item.get("name") or "")
+        if (not getattr(self, "_bar_set", None) or item["id"] in self._chart_rows
+                or name in self._bar_names):  # category axis labels must stay unique
+            self.update_graph()
+            return
+
+        qty = int(item.get("quantity", 0))
+        category = item.get("category")
+        self._chart_rows[item["id"]] = (name, category, len(self._bar_quantities))
+        self._bar_quantities.append(qty)
+        self._bar_names.append(name)
+        self._bar_set.append(qty)
+        self._bar_axis_x.append(name)
+        if qty + 10 > self._bar_axis_y.max():
+            self._bar_axis_y.setMax(qty + 10)
+        self._add_to_slice(category, qty)
+
+    def _remove_from_graph(self, supply_id):
+        """Drop a deleted product's bar and shrink (or drop) its category's slice"""
+        known = getattr(self, "_chart_rows", {}).get(supply_id) if getattr(self, "_bar_set", None) else None
+        if known is None:
+            return
+        name, category, index = known
+        if self._bar_names.count(name) > 1 or len(self._bar_quantities) == 1:
+            self.update_graph()
+            return
+
+        del self._chart_rows[supply_id]
+        for key, (other_name, other_category, other_index) in self._chart_rows.items():
+            if other_index > index:
+                self._chart_rows[key] = (other_name, other_category, other_index - 1)
+        qty = self._bar_quantities.pop(index)
+        self._bar_names.pop(index)
+        self._bar_set.remove(index)
+        self._bar_axis_x.remove(name)
+        self._add_to_slice(category, -qty)
+        if all(other_category != category for _, other_category, _ in self._chart_rows.values()):
+            self._pie_series.remove(self._pie_slices.pop(category))
+
+    def _add_to_slice(self, category, delta):
+        slice = self._pie_slices.get(category)
+        if slice is None:
+            slice = QPieSlice(f"{category} (0)", 0)
+            slice.setLabelVisible(True)
+            self._pie_series.append(slice)
+            self._pie_slices[category] = slice
+        total = int(slice.value()) + delta
+        slice.setValue(total)
+        slice.setLabel(f"{category} ({total})")
+
     def show_bar_tooltip(self, status, index, quantities, names):
         if status:
             QToolTip.showText(
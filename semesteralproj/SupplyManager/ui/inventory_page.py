@@ -69,6 +69,7 @@ class InventoryPage(QWidget):
         """)
         self.initUI()
         self.refresh_inventory()
+        self.connect_supply_events()
 
     def initUI(self):
         scroll = QScrollArea()
@@ -236,63 +237,119 @@ class InventoryPage(QWidget):
     def refresh_inventory(self):
         supplies = self.supply_manager.get_supplies() or []
         self.load_table(supplies)
-        self.update_cards(supplies)
+        self.update_cards()
+
+    # ---------------- Live Updates ----------------
+    def connect_supply_events(self):
+        # Patch the affected row and the cards instead of reloading the page
+        events = getattr(self.supply_manager, "events", None)
+        self._live_updates = events is not None
+        self._event_connections = []
+        if not self._live_updates:
+            return
+        for signal, slot in ((events.created, self._on_supply_created),
+                             (events.updated, self._on_supply_updated),
+                             (events.deleted, self._on_supply_deleted),
+                             (events.reset, self.refresh_inventory)):
+            self._event_connections.append((signal, signal.connect(slot)))
+
+    def disconnect_supply_events(self):
+        # The events object outlives the pages of one login
+        for signal, connection in getattr(self, "_event_connections", []):
+            try:
+                signal.disconnect(connection)
+            except (TypeError, RuntimeError):
+                pass
+        self._event_connections = []
+        self._live_updates = False
+
+    def closeEvent(self, event):
+        self.disconnect_supply_events()
+        super().closeEvent(event)
+
+    def _after_write(self):
+        if not getattr(self, "_live_updates", False):
+            self.refresh_inventory()
+
+    def _on_supply_created(self, item):
+        row = self.table.rowCount()
+        self.table.insertRow(row)
+        self._fill_row(row, item)
+        self.update_cards()
+
+    def _on_supply_updated(self, item):
+        row = self._row_of.get(item["id"])
+        if row is not None:
+            self._fill_row(row, item)
+        self.update_cards()
+
+    def _on_supply_deleted(self, supply_id):
+        row = self._row_of.pop(supply_id, None)
+        if row is not None:
+            self.table.removeRow(row)
+            for key, index in self._row_of.items():
+                if index > row:
+                    self._row_of[key] = index - 1
+        self.update_cards()
 
     # ---------------- Load Table ----------------
     def load_table(self, supplies):
         self.table.setRowCount(len(supplies))
+        self._row_of = {}  # supply id -> table row
         for row, item in enumerate(supplies):
-            # Fill table
-            for col_index, key in enumerate(["sku","name","category","quantity","min_quantity","","price","supplier","last_updated"]):
-                if col_index !=5:
-                    text = str(item.get(key,""))
-                    if key=="price":
-                        text = f"${float(text):.2f}"
-                    if key=="last_updated" and isinstance(item.get("last_updated"), (datetime.date, datetime.datetime)):
-                        text = item.get("last_updated").strftime("%Y-%m-%d %H:%M:%S")
-                    self.table.setItem(row, col_index, QTableWidgetItem(text))
-
-            # Status
-            status_item = QLabel()
-            qty = int(item.get("quantity",0))
-            min_qty = int(item.get("min_quantity",5))
-            if qty <= min_qty:
-                status_item.setText("🔴 Low Stock")
-                status_item.setStyleSheet("color: #C0392B; font-weight: bold;")
-            else:
-                status_item.setText("✅ In Stock")
-                status_item.setStyleSheet("color: #27AE60; font-weight: bold;")
-            status_item.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.table.setCellWidget(row,5,status_item)
-
-            # Actions
-            edit_btn = QPushButton("✏️")
-            delete_btn = QPushButton("🗑️")
-            edit_btn.setFixedWidth(36)
-            delete_btn.setFixedWidth(36)
-            edit_btn.clicked.connect(lambda _, i=item: self.edit_item(i))
-            delete_btn.clicked.connect(lambda _, i=item: self.delete_item(i))
-            container = QFrame()
-            hbox = QHBoxLayout(container)
-            hbox.addWidget(edit_btn)
-            hbox.addWidget(delete_btn)
-            hbox.setContentsMargins(0,0,0,0)
-            hbox.setSpacing(5)
-            self.table.setCellWidget(row,9,container)
-            # ensure row has increased height for readability
-            try:
-                self.table.setRowHeight(row, 48)
-            except Exception:
-                pass
+            self._fill_row(row, item)
+
+    def _fill_row(self, row, item):
+        self._row_of[item["id"]] = row
+        # Fill table
+        for col_index, key in enumerate(["sku","name","category","quantity","min_quantity","","price","supplier","last_updated"]):
+            if col_index !=5:
+                text = str(item.get(key,""))
+                if key=="price":
+                    text = f"${float(text):.2f}"
+                if key=="last_updated" and isinstance(item.get("last_updated"), (datetime.date, datetime.datetime)):
+                    text = item.get("last_updated").strftime("%Y-%m-%d %H:%M:%S")
+                self.table.setItem(row, col_index, QTableWidgetItem(text))
+
+        # Status
+        status_item = QLabel()
+        qty = int(item.get("quantity",0))
+        min_qty = int(item.get("min_quantity",5))
+        if qty <= min_qty:
+            status_item.setText("🔴 Low Stock")
+            status_item.setStyleSheet("color: #C0392B; font-weight: bold;")
+        else:
+            status_item.setText("✅ In Stock")
+            status_item.setStyleSheet("color: #27AE60; font-weight: bold;")
+        status_item.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.table.setCellWidget(row,5,status_item)
+
+        # Actions
+        edit_btn = QPushButton("✏️")
+        delete_btn = QPushButton("🗑️")
+        edit_btn.setFixedWidth(36)
+        delete_btn.setFixedWidth(36)
+        edit_btn.clicked.connect(lambda _, i=item: self.edit_item(i))
+        delete_btn.clicked.connect(lambda _, i=item: self.delete_item(i))
+        container = QFrame()
+        hbox = QHBoxLayout(container)
+        hbox.addWidget(edit_btn)
+        hbox.addWidget(delete_btn)
+        hbox.setContentsMargins(0,0,0,0)
+        hbox.setSpacing(5)
+        self.table.setCellWidget(row,9,container)
+        # ensure row has increased height for readability
+        try:
+            self.table.setRowHeight(row, 48)
+        except Exception:
+            pass
 
     # ---------------- Update Cards ----------------
-    def update_cards(self, supplies):
-        total_items = sum(int(item.get("quantity",0)) for item in supplies)
-        low_stock = sum(1 for item in supplies if int(item.get("quantity",0)) <= int(item.get("min_quantity",5)))
-        total_value = sum(int(item.get("quantity",0))*float(item.get("price",0.0)) for item in supplies)
-        self.total_items_card.value_label.setText(str(total_items))
-        self.low_stock_card.value_label.setText(str(low_stock))
-        self.total_value_card.value_label.setText(f"${total_value:.2f}")
+    def update_cards(self):
+        summary = self.supply_manager.get_inventory_summary()
+        self.total_items_card.value_label.setText(str(summary["total_items"]))
+        self.low_stock_card.value_label.setText(str(summary["low_stock"]))
+        self.total_value_card.value_label.setText(f"${summary['total_value']:.2f}")
 
     # ---------------- Add / Edit / Delete ----------------
     def add_item(self):
@@ -301,14 +358,18 @@ class InventoryPage(QWidget):
             data = dialog.get_data()
             existing = self.supply_manager.get_supply_by_name(data.get("name",""))
             if existing:
-                new_qty = existing["quantity"] + int(data.get("quantity",0))
-                self.supply_manager.update_supply(existing["id"], new_qty, float(data.get("price",0)), int(data.get("min_quantity",5)))
+                adjusted = self.supply_manager.adjust_quantity(
+                    existing["id"], int(data.get("quantity",0)), "Restock",
+                    price=float(data.get("price",0)), min_quantity=int(data.get("min_quantity",5))
+                )
+                if adjusted is None:
+                    QMessageBox.warning(self, "Stock Update", "Stock update failed, please try again.")
             else:
                 self.supply_manager.add_supply(
                     data.get("name",""), data.get("category",""), data.get("supplier",""),
                     int(data.get("quantity",0)), float(data.get("price",0)), data.get("sku",""), int(data.get("min_quantity",5))
                 )
-            self.refresh_inventory()
+            self._after_write()
 
     def edit_item(self,item):
         dialog = UpdateProductDialog(self,item)
@@ -319,7 +380,7 @@ class InventoryPage(QWidget):
                 float(data.get("price", item.get("price",0))),
                 int(data.get("min_quantity",item.get("min_quantity",5)))
             )
-            self.refresh_inventory()
+            self._after_write()
 
     def delete_item(self,item):
         reply = QMessageBox.question(
@@ -330,5 +391,5 @@ class InventoryPage(QWidget):
         )
         if reply == QMessageBox.StandardButton.Yes:
             self.supply_manager.delete_supply(item["id"])
-            self.refresh_inventory()
+            self._after_write()
     
@@ -20,6 +20,8 @@ class LandingPage(QWidget):
         self.supply_manager = supply_manager
         self.user_role = user_role
         self.user_id = user_id
+        # Each login builds a new window; free the old one and its pages on close
+        self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
 
         self.setWindowTitle("Inventory System")
         self.setStyleSheet("background-color: #F0F2F5;")
@@ -261,6 +263,15 @@ class LandingPage(QWidget):
         if hasattr(self, 'inventory_page') and hasattr(self.inventory_page, 'refresh_inventory'):
             self.inventory_page.refresh_inventory()
 
+    def closeEvent(self, event):
+        # Pages inside the stack get no closeEvent of their own. Unsubscribe
+        # them from the shared SupplyManager.events before they are deleted.
+        for page in (getattr(self, name, None) for name in
+                     ("dashboard_page", "inventory_page", "monthly_page")):
+            if page is not None and hasattr(page, "disconnect_supply_events"):
+                page.disconnect_supply_events()
+        super().closeEvent(event)
+
     # =====================================================
     # Logout + Splash Screen
     # =====================================================
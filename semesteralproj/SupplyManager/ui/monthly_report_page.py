@@ -1,16 +1,26 @@
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QFrame,
-    QTableWidget, QTableWidgetItem, QComboBox,
+    QTableWidget, QTableWidgetItem, QComboBox, QFileDialog, QMessageBox,
     QGraphicsOpacityEffect, QGraphicsDropShadowEffect, QScrollArea
 )
-from PyQt6.QtCore import Qt, QSize, QEasingCurve, QPropertyAnimation, QMargins, QPointF
+from PyQt6.QtCore import Qt, QSize, QEasingCurve, QPropertyAnimation, QMargins, QPointF, QTimer
 from PyQt6.QtGui import QFont, QPainter, QColor, QBrush, QPen
 from PyQt6.QtCharts import QChart, QChartView, QLineSeries, QPieSeries, QValueAxis, QBarCategoryAxis
 
+import os
 import calendar
 import datetime
 from typing import Optional, List, Dict, Any
 
+try:
+    from ..database.export import month_range
+    from ..database.month_window import shift_month
+    from ..modules.report_cache import ReportCache, current_month
+except ImportError:
+    from database.export import month_range
+    from database.month_window import shift_month
+    from modules.report_cache import ReportCache, current_month
+
 
 def apply_shadow(widget, blur=16, x_offset=0, y_offset=2, color=Qt.GlobalColor.lightGray):
     shadow = QGraphicsDropShadowEffect(widget)
@@ -195,6 +205,9 @@ class LowStockCard(QFrame):
 
 
 class MonthlySalesReportPage(QWidget):
+    # Bump when the shape of _load_report()'s result changes (old cache files are ignored)
+    REPORT_VERSION = 2
+
     def __init__(self, supply_manager=None, month_year: Optional[str] = None):
         super().__init__()
         self.supply = supply_manager  # Use self.supply consistently
@@ -204,10 +217,50 @@ class MonthlySalesReportPage(QWidget):
             self.month_year = datetime.date.today().strftime("%Y-%m")
         self.selected_date = None  # Holds current clicked date or None
 
+        # Report data per month; closed months are also kept on disk
+        config = getattr(getattr(supply_manager, "db", None), "config", None) or {}
+        self._reports = ReportCache(self._load_report, config.get("report_cache_dir"),
+                                    version=self.REPORT_VERSION)
+        self._report = None
+        # Bursts of writes cause one reload of the open month
+        self._reload_timer = QTimer(self)
+        self._reload_timer.setSingleShot(True)
+        self._reload_timer.setInterval(300)
+        self._reload_timer.timeout.connect(self.load_and_render)
+
         self.setWindowTitle("Monthly Inventory Report")
         self.init_ui()
+        self.connect_supply_events()
         self.load_and_render()
 
+    def connect_supply_events(self):
+        """Writes only change the open month's report: drop it and reload if it is shown"""
+        events = getattr(self.supply, "events", None)
+        self._event_connections = []
+        if events is None:
+            return
+        for signal in (events.created, events.updated, events.deleted, events.reset):
+            self._event_connections.append((signal, signal.connect(self._on_supply_changed)))
+
+    def disconnect_supply_events(self):
+        # The events object outlives the pages of one login
+        for signal, connection in getattr(self, "_event_connections", []):
+            try:
+                signal.disconnect(connection)
+            except (TypeError, RuntimeError):
+                pass
+        self._event_connections = []
+        self._reload_timer.stop()
+
+    def closeEvent(self, event):
+        self.disconnect_supply_events()
+        super().closeEvent(event)
+
+    def _on_supply_changed(self, *_):
+        self._reports.invalidate()
+        if self.month_year == current_month():
+            self._reload_timer.start()
+
     def init_ui(self):
         main_container = QVBoxLayout(self)
         main_container.setContentsMargins(0, 0, 0, 0)
@@ -297,6 +350,24 @@ class MonthlySalesReportPage(QWidget):
             QPushButton:pressed { background-color: #cc3d3d; }
         """)
         back_btn.clicked.connect(self.on_back_clicked)
+
+        # Export
+        export_btn = QPushButton("Export CSV")
+        export_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #2196F3;
+                color: white;
+                border: none;
+                border-radius: 6px;
+                padding: 8px 16px;
+                font-weight: bold;
+                font-size: 13px;
+            }
+            QPushButton:hover { background-color: #42A5F5; }
+            QPushButton:pressed { background-color: #1976D2; }
+        """)
+        export_btn.clicked.connect(self.on_export_clicked)
+        header.addWidget(export_btn)
         header.addWidget(back_btn)
         self.main_layout.addLayout(header)
 
@@ -427,72 +498,133 @@ class MonthlySalesReportPage(QWidget):
             print("[ERROR] Fetch failed (all):", e)
         return []
 
+    # The report readers below raise on failure: _load_report() results are
+    # cached, so an error must not turn into an empty month.
+    def _month_inventory(self, month_year):
+        if not self.supply or not hasattr(self.supply, "get_inventory_at"):
+            return []
+        return self.supply.get_inventory_at(month_year)
+
+    @staticmethod
+    def _value(r):
+        return int(r.get("quantity") or 0) * float(r.get("price") or 0)
+
+    def _summary(self, rows):
+        return {
+            "total_items": sum(int(r.get("quantity") or 0) for r in rows),
+            "total_value": sum(self._value(r) for r in rows),
+            "low_stock": sum(1 for r in rows if int(r.get("quantity") or 0) <= int(r.get("min_quantity") or 0)),
+            "categories": len({r.get("category") for r in rows}),
+            "item_count": len(rows),
+        }
+
+    def _monthly_trend(self, month_year):
+        # The 12 months ending at month_year, from the monthly rollups
+        if not self.supply or not hasattr(self.supply, "get_monthly_trend"):
+            return []
+        return self.supply.get_monthly_trend(month_year)
+
+    def _daily_movements(self, month_year):
+        if not self.supply or not hasattr(self.supply, "get_daily_movements"):
+            return []
+        return self.supply.get_daily_movements(month_year)
+
+    def _day_movements(self, date_str):
+        if not self.supply or not hasattr(self.supply, "get_day_movements"):
+            return []
+        try:
+            return self.supply.get_day_movements(date_str)
+        except Exception as e:
+            print("[ERROR] Fetch failed (day movements):", e)
+        return []
+
+    def _load_report(self, month_year):
+        """
+        Everything the page shows for one month, as plain JSON-safe values.
+        Also runs on prefetch threads, so it must not touch any widget.
+        Raises when a read fails, so ReportCache keeps nothing for the month.
+        """
+        db = getattr(self.supply, "db", None)
+        if db is None or not hasattr(db, "raising_errors"):
+            return self._build_report(month_year)
+        with db.raising_errors():
+            return self._build_report(month_year)
+
+    def _build_report(self, month_year):
+        # Stock as it stood at the end of the month (snapshot + ledger replay)
+        inventory = [
+            {
+                "name": r.get("name"),
+                "sku": r.get("sku"),
+                "category": r.get("category"),
+                "quantity": int(r.get("quantity") or 0),
+                "min_quantity": int(r.get("min_quantity") or 0),
+                "price": float(r.get("price") or 0),
+            }
+            for r in self._month_inventory(month_year)
+        ]
+        trend = [
+            {"ym": r.get("month_year"), "label": r.get("label"), "total_value": float(r.get("total_value") or 0)}
+            for r in self._monthly_trend(month_year)
+        ]
+        daily = [
+            {"day": int(r.get("day")), "net_qty": int(r.get("net_qty") or 0)}
+            for r in self._daily_movements(month_year)
+        ]
+        return {"inventory": inventory, "trend": trend, "daily": daily}
+
     def load_and_render(self):
         self.subtitle.setText(self._friendly_month(self.month_year))
 
-        # Parse month_year to get start and end dates
-        year, month = self.month_year.split("-")
-        month_start = f"{year}-{month}-01"
-        # Get last day of month
-        next_month = datetime.datetime.strptime(f"{year}-{month}-01", "%Y-%m-%d") + datetime.timedelta(days=32)
-        month_end = next_month.replace(day=1) - datetime.timedelta(days=1)
-        month_end_str = month_end.strftime("%Y-%m-%d")
-
-        # KPI cards - filter by month
-        total_items = self._fetch_one(f"""
-            SELECT SUM(quantity) AS t FROM supplies 
-            WHERE last_updated BETWEEN '{month_start}' AND '{month_end_str} 23:59:59'
-        """) or {}
-        total_value = self._fetch_one(f"""
-            SELECT SUM(quantity * price) AS v FROM supplies 
-            WHERE last_updated BETWEEN '{month_start}' AND '{month_end_str} 23:59:59'
-        """) or {}
-        low_stock = self._fetch_one(f"""
-            SELECT COUNT(*) AS c FROM supplies 
-            WHERE quantity <= min_quantity 
-            AND last_updated BETWEEN '{month_start}' AND '{month_end_str} 23:59:59'
-        """) or {}
-        categories = self._fetch_one(f"""
-            SELECT COUNT(DISTINCT category) AS c FROM supplies 
-            WHERE last_updated BETWEEN '{month_start}' AND '{month_end_str} 23:59:59'
-        """) or {}
-        self.kpi_total_items.value_lbl.setText(str(total_items.get("t") or 0))
-        self.kpi_total_value.value_lbl.setText(f"${(total_value.get('v') or 0):,.2f}")
-        self.kpi_low_stock.value_lbl.setText(str(low_stock.get("c") or 0))
-        self.kpi_categories.value_lbl.setText(str(categories.get("c") or 0))
-
-        # Charts - render monthly total value trend (last 12 months)
-        self._render_monthly_trend(self._fetch_all(f"""
-            SELECT DATE_FORMAT(last_updated, '%Y-%m') AS ym,
-               DATE_FORMAT(last_updated, '%b %Y') AS label,
-               SUM(quantity * price) AS total_value
-            FROM supplies
-            GROUP BY DATE_FORMAT(last_updated, '%Y-%m')
-            ORDER BY DATE_FORMAT(last_updated, '%Y-%m') ASC
-            LIMIT 12
-        """))
-
-        self._render_pie_chart(self._fetch_all(f"""
-            SELECT category, SUM(quantity*price) AS total_value
-            FROM supplies 
-            WHERE last_updated BETWEEN '{month_start}' AND '{month_end_str} 23:59:59'
-            GROUP BY category
-        """))
-
-        self._render_top_items(self._fetch_all(f"""
-            SELECT name, quantity, (quantity*price) AS value
-            FROM supplies 
-            WHERE last_updated BETWEEN '{month_start}' AND '{month_end_str} 23:59:59'
-            ORDER BY value DESC LIMIT 5
-        """))
-
-        self._render_low_stock(self._fetch_all(f"""
-            SELECT name, sku, quantity, min_quantity
-            FROM supplies 
-            WHERE quantity <= min_quantity
-            AND last_updated BETWEEN '{month_start}' AND '{month_end_str} 23:59:59'
-            ORDER BY quantity ASC
-        """))
+        try:
+            self._report = self._reports.get(self.month_year)
+        except Exception as e:
+            # Not cached: the next visit (or write) tries again
+            print(f"[ERROR] Could not load the report for {self.month_year}: {e}")
+            self.subtitle.setText(f"{self._friendly_month(self.month_year)} (could not load)")
+            self._report = {"inventory": [], "trend": [], "daily": []}
+        inventory = self._report["inventory"]
+
+        # KPI cards
+        summary = self._summary(inventory)
+        self.kpi_total_items.value_lbl.setText(str(summary["total_items"]))
+        self.kpi_total_value.value_lbl.setText(f"${summary['total_value']:,.2f}")
+        self.kpi_low_stock.value_lbl.setText(str(summary["low_stock"]))
+        self.kpi_categories.value_lbl.setText(str(summary["categories"]))
+
+        # Charts - daily movement once a date is picked, else the 12-month value trend
+        if self.selected_date:
+            self._render_daily_movement()
+        else:
+            self._render_monthly_trend(self._report["trend"])
+
+        by_category: Dict[Any, float] = {}
+        for r in inventory:
+            by_category[r.get("category")] = by_category.get(r.get("category"), 0.0) + self._value(r)
+        self._render_pie_chart([{"category": c, "total_value": v} for c, v in by_category.items()])
+
+        top = sorted(inventory, key=self._value, reverse=True)[:5]
+        self._render_top_items([dict(r, value=self._value(r)) for r in top])
+
+        self._render_low_stock(sorted(
+            (r for r in inventory if int(r.get("quantity") or 0) <= int(r.get("min_quantity") or 0)),
+            key=lambda r: int(r.get("quantity") or 0)
+        ))
+
+        # Neighbouring months load in the background, so switching to them is instant
+        self._reports.prefetch([shift_month(self.month_year, -1), shift_month(self.month_year, 1)])
+
+    def _render_daily_movement(self):
+        """Net movement per day of the month; the picked day's top movers go in the title."""
+        self._render_line_chart(self._report["daily"])
+        if not self.selected_date:
+            return
+        movers = [
+            f"{r.get('name') or '#' + str(r.get('item_id'))} {int(r.get('net_qty') or 0):+d}"
+            for r in self._day_movements(self.selected_date)[:3]
+        ]
+        chart = self.line_chart_view.chart()
+        chart.setTitle(f"{self.selected_date}: {', '.join(movers) if movers else 'no movement'}")
 
     def _render_line_chart(self, data: List[Dict[str, Any]]):
         # Build a mapping day->value from returned data (prefer net_qty if available)
@@ -591,9 +723,9 @@ class MonthlySalesReportPage(QWidget):
     def _render_monthly_trend(self, rows: List[Dict[str, Any]]):
         """Render a monthly total-value trend (last 12 months) with simple animations and hover tooltips.
 
-        This version aligns the 12-month window to the currently selected `self.month_year`,
-        limits the SQL to that range, and scales large currency values to thousands (k) for
-        clearer axis labels.
+        This version aligns the 12-month window to the currently selected `self.month_year`
+        (rows come from SupplyManager.get_monthly_trend), and scales large currency values
+        to thousands (k) for clearer axis labels.
         """
         # Build list of 12 months ending at selected month_year (chronological)
         try:
@@ -915,7 +1047,36 @@ class MonthlySalesReportPage(QWidget):
     def on_back_clicked(self):
         self.close()
 
+    def on_export_clicked(self):
+        """Save the month's report tables, its ledger and the current inventory as CSV files."""
+        if not self.supply or not hasattr(self.supply, "export_csv"):
+            return
+        folder = QFileDialog.getExistingDirectory(self, "Export CSV to folder")
+        if not folder:
+            return
+        written = []
+        for kind in ("monthly_reports", "daily_movements", "ledger", "inventory"):
+            if kind == "inventory":
+                name = f"inventory_{datetime.date.today():%Y-%m-%d}.csv"
+            else:
+                name = f"{kind}_{self.month_year}.csv"
+            start, end = month_range(kind, self.month_year)
+            count = self.supply.export_csv(kind, os.path.join(folder, name), start, end)
+            if count is None:
+                QMessageBox.warning(self, "Export failed", f"Could not write {name}.")
+                return
+            written.append(f"{name}: {count} rows")
+        QMessageBox.information(self, "Export complete", "\n".join(written))
+
     def on_date_clicked(self, date_str):
         """Call this when calendar date is picked, with format YYYY-MM-DD."""
         self.selected_date = date_str
-        self.load_and_render()
\ No newline at end of file
+        if date_str[:7] != self.month_year:
+            self.month_year = date_str[:7]
+            self.month_combo.blockSignals(True)
+            self.month_combo.setCurrentText(self.month_year)
+            self.month_combo.blockSignals(False)
+            self.load_and_render()
+        else:
+            # Same month: only the movement chart changes
+            self._render_daily_movement()
\ No newline at end of file
@@ -295,21 +295,14 @@ class ReconciliationPage(QWidget):
         """Load supplies for current month"""
         self.table.setRowCount(0)
         
-        year, month = self.current_month.split("-")
-        month_start = f"{year}-{month}-01"
-        # Get last day of month
-        import datetime as dt
-        next_month = dt.datetime.strptime(f"{year}-{month}-01", "%Y-%m-%d") + dt.timedelta(days=32)
-        month_end = next_month.replace(day=1) - dt.timedelta(days=1)
-        month_end_str = month_end.strftime("%Y-%m-%d")
-
-        # Fetch supplies for this month
-        supplies = self._fetch_all(f"""
-            SELECT id, name, quantity, category, price
-            FROM supplies
-            WHERE last_updated BETWEEN '{month_start}' AND '{month_end_str} 23:59:59'
-            ORDER BY name ASC
-        """)
+        # System quantities as of the end of this month (snapshot + ledger replay)
+        supplies = []
+        if self.supply and hasattr(self.supply, "get_inventory_at"):
+            try:
+                supplies = sorted(self.supply.get_inventory_at(self.current_month),
+                                  key=lambda r: str(r.get("name") or ""))
+            except Exception as e:
+                print("[ERROR] Fetch failed (month inventory):", e)
 
         for i, supply in enumerate(supplies):
             item_id = supply.get("id")
@@ -447,72 +440,45 @@ class ReconciliationPage(QWidget):
 
         try:
             saved_count = 0
-            for row in range(self.table.rowCount()):
-                # Get item ID from spinbox
-                spinbox = self.table.cellWidget(row, 2)
-                if not spinbox or not hasattr(spinbox, 'item_id'):
-                    continue
-
-                item_id = spinbox.item_id
-                physical_qty = spinbox.value()
-                notes = self.table.item(row, 5).text() if self.table.item(row, 5) else ""
-                system_qty = spinbox.system_qty
-
-                # Delete existing reconciliation for this month/item
-                db.execute_query(
-                    f"DELETE FROM stock_reconciliation WHERE month_year = '{self.current_month}' AND item_id = {item_id}"
-                )
-
-                # Insert new reconciliation record
-                db.execute_query(
-                    f"""
-                    INSERT INTO stock_reconciliation 
-                    (month_year, item_id, recorded_qty, actual_qty, variance, reconciled_by, notes, created_at)
-                    VALUES ('{self.current_month}', {item_id}, {system_qty}, {physical_qty}, {physical_qty - system_qty}, 'admin', '{notes}', NOW())
-                    """
-                )
-
-                # Fetch transaction counts for this month to populate monthly_reports
-                year, month = self.current_month.split("-")
-                month_start = f"{year}-{month}-01"
-                import datetime as dt
-                next_month = dt.datetime.strptime(f"{year}-{month}-01", "%Y-%m-%d") + dt.timedelta(days=32)
-                month_end = next_month.replace(day=1) - dt.timedelta(days=1)
-                month_end_str = month_end.strftime("%Y-%m-%d")
-
-                transaction_data = self._fetch_one(f"""
-                    SELECT 
-                        COUNT(CASE WHEN type='IN' THEN 1 END) AS total_in,
-                        COUNT(CASE WHEN type='OUT' THEN 1 END) AS total_out
-                    FROM transactions
-                    WHERE item_id={item_id} AND created_at BETWEEN '{month_start}' AND '{month_end_str} 23:59:59'
-                """)
-                
-                total_in = transaction_data.get('total_in', 0) if transaction_data else 0
-                total_out = transaction_data.get('total_out', 0) if transaction_data else 0
-
-                # Check if monthly_reports record exists for this month/item
-                existing = self._fetch_one(f"""
-                    SELECT id FROM monthly_reports
-                    WHERE month_year = '{self.current_month}' AND item_id = {item_id}
-                """)
-
-                if existing:
-                    # Update existing record
-                    db.execute_query(f"""
-                        UPDATE monthly_reports
-                        SET total_in={total_in}, total_out={total_out}, current_stock={physical_qty}
-                        WHERE month_year='{self.current_month}' AND item_id={item_id}
-                    """)
-                else:
-                    # Insert new record
-                    db.execute_query(f"""
-                        INSERT INTO monthly_reports
-                        (month_year, item_id, total_in, total_out, current_stock)
-                        VALUES ('{self.current_month}', {item_id}, {total_in}, {total_out}, {physical_qty})
-                    """)
-
-                saved_count += 1
+            # All rows are saved in one transaction: one commit, and a failure
+            # leaves the month untouched instead of half reconciled.
+            with db.transaction():
+                for row in range(self.table.rowCount()):
+                    # Get item ID from spinbox
+                    spinbox = self.table.cellWidget(row, 2)
+                    if not spinbox or not hasattr(spinbox, 'item_id'):
+                        continue
+
+                    item_id = spinbox.item_id
+                    physical_qty = spinbox.value()
+                    notes = self.table.item(row, 5).text() if self.table.item(row, 5) else ""
+                    system_qty = spinbox.system_qty
+
+                    # Delete existing reconciliation for this month/item
+                    db.execute_query(
+                        "DELETE FROM stock_reconciliation WHERE month_year = %s AND item_id = %s",
+                        (self.current_month, item_id)
+                    )
+
+                    # Insert new reconciliation record
+                    db.execute_query(
+                        """
+                        INSERT INTO stock_reconciliation 
+                        (month_year, item_id, recorded_qty, actual_qty, variance, reconciled_by, notes, created_at)
+                        VALUES (%s, %s, %s, %s, %s, 'admin', %s, NOW())
+                        """,
+                        (self.current_month, item_id, system_qty, physical_qty, physical_qty - system_qty, notes)
+                    )
+
+                    # IN/OUT totals are kept current by the ledger; only the
+                    # counted stock comes from here
+                    db.execute_query("""
+                        INSERT INTO monthly_reports (month_year, item_id, current_stock)
+                        VALUES (%s, %s, %s)
+                        ON DUPLICATE KEY UPDATE current_stock = VALUES(current_stock)
+                    """, (self.current_month, item_id, physical_qty))
+
+                    saved_count += 1
 
             # Flash animation
             self._flash_table()
@@ -450,12 +450,14 @@ class StockRequestPage(QWidget):
                 item_id = req.get('item_id')
                 qty = int(req.get('quantity_requested') or 0)
 
-                # Update supplies quantity (subtract the requested quantity)
-                if item_id and qty > 0:
-                    db.execute_query("UPDATE supplies SET quantity = quantity - %s WHERE id = %s", (qty, item_id))
+                # Subtract the stock (with its ledger entry) and remove the request in one commit
+                with db.transaction():
+                    # Delete the request after approval
+                    db.execute_query("DELETE FROM stock_requests WHERE id = %s", (request_id,))
 
-                # Delete the request after approval
-                db.execute_query("DELETE FROM stock_requests WHERE id = %s", (request_id,))
+                    if item_id and qty > 0 and self.supply.adjust_quantity(
+                            item_id, -qty, f"Stock request #{request_id} approved") is None:
+                        raise RuntimeError("not enough stock for this request")
 
                 QMessageBox.information(self, "Success", "Request approved, inventory updated, and request removed!")
                 self.load_requests()
@@ -509,13 +511,14 @@ class StockRequestPage(QWidget):
                 item_id = req.get('item_id')
                 qty = int(req.get('quantity_requested') or 0)
 
-                # Update supplies quantity (subtract the requested quantity)
-                if item_id and qty > 0:
-                    update_q = "UPDATE supplies SET quantity = quantity - %s WHERE id = %s"
-                    db.execute_query(update_q, (qty, item_id))
+                # Subtract the stock (with its ledger entry) and mark the request received in one commit
+                with db.transaction():
+                    # Mark request as received
+                    db.execute_query("UPDATE stock_requests SET status='received', updated_at=NOW() WHERE id=%s", (request_id,))
 
-                # Mark request as received
-                db.execute_query("UPDATE stock_requests SET status='received', updated_at=NOW() WHERE id=%s", (request_id,))
+                    if item_id and qty > 0 and self.supply.adjust_quantity(
+                            item_id, -qty, f"Stock request #{request_id} received") is None:
+                        raise RuntimeError("not enough stock for this request")
 
                 QMessageBox.information(self, "Success", "Marked as received and inventory updated.")
                 self.load_requests()